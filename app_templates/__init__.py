@@ -2,9 +2,9 @@
 Шаблоны для генерации FastAPI проектов.
 """
 
-from .layered import LAYERED_TEMPLATES
-from .clean import CLEAN_TEMPLATES
-from .modular import MODULAR_TEMPLATES
+from .layered import LAYERED_BLOCKS, LAYERED_TEMPLATES, LAYERED_ASYNC_TEMPLATES
+from .clean import CLEAN_ASYNC_BLOCKS, CLEAN_BLOCKS, CLEAN_TEMPLATES, CLEAN_ASYNC_TEMPLATES
+from .modular import MODULAR_ASYNC_BLOCKS, MODULAR_BLOCKS, MODULAR_TEMPLATES, MODULAR_ASYNC_TEMPLATES
 
 # Объединяем все шаблоны
 TEMPLATES = {
@@ -13,4 +13,26 @@ TEMPLATES = {
     "modular": MODULAR_TEMPLATES
 }
 
-__all__ = ['TEMPLATES', 'LAYERED_TEMPLATES', 'CLEAN_TEMPLATES', 'MODULAR_TEMPLATES']
\ No newline at end of file
+# Асинхронный режим БД (--async-db, metadata.async): те же ключи шаблонов
+ASYNC_TEMPLATES = {
+    "layered": LAYERED_ASYNC_TEMPLATES,
+    "clean": CLEAN_ASYNC_TEMPLATES,
+    "modular": MODULAR_ASYNC_TEMPLATES
+}
+
+# Блоки файлов уровня проекта: строка на каждую сущность (подключение роутеров, зависимости)
+ENTITY_BLOCKS = {
+    "layered": LAYERED_BLOCKS,
+    "clean": CLEAN_BLOCKS,
+    "modular": MODULAR_BLOCKS
+}
+
+ASYNC_ENTITY_BLOCKS = {
+    "layered": LAYERED_BLOCKS,
+    "clean": CLEAN_ASYNC_BLOCKS,
+    "modular": MODULAR_ASYNC_BLOCKS
+}
+
+__all__ = ['TEMPLATES', 'ASYNC_TEMPLATES', 'ENTITY_BLOCKS', 'ASYNC_ENTITY_BLOCKS',
+           'LAYERED_TEMPLATES', 'CLEAN_TEMPLATES', 'MODULAR_TEMPLATES',
+           'LAYERED_ASYNC_TEMPLATES', 'CLEAN_ASYNC_TEMPLATES', 'MODULAR_ASYNC_TEMPLATES']
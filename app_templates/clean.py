@@ -2,22 +2,31 @@
 Шаблоны для Clean Architecture.
 """
 
+from .database import DATABASE_SETTINGS_FIELDS, ENGINE_SETUP, ENTITY_CACHE_MODULE, KEYSET_PAGINATION
+
 CLEAN_TEMPLATES = {
     "main": """\
-from fastapi import FastAPI
-from src.infrastructure.web.fastapi_app import create_app
-from src.infrastructure.database.database import get_db
-from src.infrastructure.database.{{ module_name }}_repository import SQLAlchemy{{ class_name }}Repository
-from src.application.use_cases.create_{{ module_name }} import Create{{ class_name }}UseCase
-from src.application.use_cases.get_{{ module_name }} import Get{{ class_name }}UseCase
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI
+from sqlalchemy.orm import Session
+from {{ web_app_module }} import create_app
+from {{ database_config_module }} import Base, engine, get_db
+{{ main_imports }}
 
-# Composition Root
-db = next(get_db())
-{{ module_name }}_repository = SQLAlchemy{{ class_name }}Repository(db)
-create_{{ module_name }}_use_case = Create{{ class_name }}UseCase({{ module_name }}_repository)
-get_{{ module_name }}_use_case = Get{{ class_name }}UseCase({{ module_name }}_repository)
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    # Создание таблиц БД - при старте приложения, а не при импорте модуля
+    Base.metadata.create_all(bind=engine)
+    yield
+    engine.dispose()
 
-app = create_app(create_{{ module_name }}_use_case, get_{{ module_name }}_use_case)
+# Composition Root: use case собираются на каждый запрос из сессии пула
+{{ use_case_providers }}
+
+app = create_app([
+{{ app_routes }}
+], lifespan=lifespan)
 
 if __name__ == "__main__":
     import uvicorn
@@ -47,8 +56,8 @@ class {{ class_name }}:
 
     "domain_repository": """\
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from src.domain.entities.{{ module_name }} import {{ class_name }}
+from typing import List, Optional, Tuple
+from {{ domain_entity_module }} import {{ class_name }}
 
 class {{ class_name }}Repository(ABC):
     @abstractmethod
@@ -60,7 +69,12 @@ class {{ class_name }}Repository(ABC):
         pass
     
     @abstractmethod
-    def get_all(self) -> List[{{ class_name }}]:
+    def get_all(self, skip: int = 0, limit: Optional[int] = None) -> List[{{ class_name }}]:
+        pass
+    
+    @abstractmethod
+    def get_page(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[{{ class_name }}], Optional[str]]:
+        \"\"\"Keyset-страница и непрозрачный курсор следующей (None - страница последняя).\"\"\"
         pass
     
     @abstractmethod
@@ -69,9 +83,9 @@ class {{ class_name }}Repository(ABC):
 """,
 
     "use_case": """\
-from typing import List, Optional
-from src.domain.entities.{{ module_name }} import {{ class_name }}
-from src.domain.repositories.{{ module_name }}_repository import {{ class_name }}Repository
+from typing import List, Optional, Tuple
+from {{ domain_entity_module }} import {{ class_name }}
+from {{ domain_repository_module }} import {{ class_name }}Repository
 
 class Create{{ class_name }}UseCase:
     def __init__(self, {{ module_name }}_repository: {{ class_name }}Repository):
@@ -88,16 +102,20 @@ class Get{{ class_name }}UseCase:
     def get_by_id(self, {{ module_name }}_id: int) -> Optional[{{ class_name }}]:
         return self.{{ module_name }}_repository.get_by_id({{ module_name }}_id)
     
-    def get_all(self) -> List[{{ class_name }}]:
-        return self.{{ module_name }}_repository.get_all()
+    def get_all(self, skip: int = 0, limit: Optional[int] = None) -> List[{{ class_name }}]:
+        return self.{{ module_name }}_repository.get_all(skip=skip, limit=limit)
+    
+    def get_page(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[{{ class_name }}], Optional[str]]:
+        return self.{{ module_name }}_repository.get_page(cursor=cursor, limit=limit)
 """,
 
     "infrastructure_repository": """\
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
-from src.domain.entities.{{ module_name }} import {{ class_name }}
-from src.domain.repositories.{{ module_name }}_repository import {{ class_name }}Repository
-from src.infrastructure.database.models import SQL{{ class_name }}
+from {{ domain_entity_module }} import {{ class_name }}
+from {{ domain_repository_module }} import {{ class_name }}Repository
+from {{ database_config_module }} import after_cursor, keyset_order, page_cursor
+from {{ infrastructure_model_module }} import SQL{{ class_name }}
 
 class SQLAlchemy{{ class_name }}Repository({{ class_name }}Repository):
     def __init__(self, db: Session):
@@ -128,16 +146,113 @@ class SQLAlchemy{{ class_name }}Repository({{ class_name }}Repository):
             )
         return None
     
-    def get_all(self) -> List[{{ class_name }}]:
-        db_{{ module_name }}s = self.db.query(SQL{{ class_name }}).all()
+    def get_all(self, skip: int = 0, limit: Optional[int] = None) -> List[{{ class_name }}]:
+        query = self.db.query(SQL{{ class_name }}).order_by(SQL{{ class_name }}.id).offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
         return [
             {{ class_name }}(
                 id=u.id,
                 created_at=u.created_at,
                 updated_at=u.updated_at
-            ) for u in db_{{ module_name }}s
+            ) for u in query.all()
         ]
     
+    def get_page(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[{{ class_name }}], Optional[str]]:
+        query = self.db.query(SQL{{ class_name }}).order_by(*keyset_order(SQL{{ class_name }}))
+        if cursor:
+            query = query.filter(after_cursor(SQL{{ class_name }}, cursor))
+        rows = query.limit(limit + 1).all()
+        return [
+            {{ class_name }}(
+                id=u.id,
+                created_at=u.created_at,
+                updated_at=u.updated_at
+            ) for u in rows[:limit]
+        ], page_cursor(rows, limit)
+    
+    def delete(self, {{ module_name }}_id: int) -> bool:
+        db_{{ module_name }} = self.db.query(SQL{{ class_name }}).filter(
+            SQL{{ class_name }}.id == {{ module_name }}_id
+        ).first()
+        if db_{{ module_name }}:
+            self.db.delete(db_{{ module_name }})
+            self.db.commit()
+            return True
+        return False
+""",
+
+    "cached_infrastructure_repository": """\
+from typing import List, Optional, Tuple
+from sqlalchemy.orm import Session
+from {{ domain_entity_module }} import {{ class_name }}
+from {{ domain_repository_module }} import {{ class_name }}Repository
+from {{ database_config_module }} import after_cursor, keyset_order, page_cursor
+from {{ entity_cache_module }} import EntityCache
+from {{ infrastructure_model_module }} import SQL{{ class_name }}
+
+# Read-through кэш get_by_id: cache сущности в схеме
+{{ module_name }}_cache = EntityCache("{{ table_name }}", ttl={{ cache_ttl }}, max_size={{ cache_max_size }})
+
+class SQLAlchemy{{ class_name }}Repository({{ class_name }}Repository):
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def save(self, {{ module_name }}: {{ class_name }}) -> {{ class_name }}:
+        db_{{ module_name }} = SQL{{ class_name }}(
+            **{{ module_name }}.__dict__
+        )
+        self.db.add(db_{{ module_name }})
+        self.db.commit()
+        self.db.refresh(db_{{ module_name }})
+        return {{ class_name }}(
+            id=db_{{ module_name }}.id,
+            created_at=db_{{ module_name }}.created_at,
+            updated_at=db_{{ module_name }}.updated_at
+        )
+    
+    def get_by_id(self, {{ module_name }}_id: int) -> Optional[{{ class_name }}]:
+        cached = {{ module_name }}_cache.get({{ module_name }}_id)
+        if cached is not None:
+            return {{ class_name }}(**cached)
+        db_{{ module_name }} = self.db.query(SQL{{ class_name }}).filter(
+            SQL{{ class_name }}.id == {{ module_name }}_id
+        ).first()
+        if db_{{ module_name }}:
+            {{ module_name }} = {{ class_name }}(
+                id=db_{{ module_name }}.id,
+                created_at=db_{{ module_name }}.created_at,
+                updated_at=db_{{ module_name }}.updated_at
+            )
+            {{ module_name }}_cache.set({{ module_name }}_id, dict({{ module_name }}.__dict__))
+            return {{ module_name }}
+        return None
+    
+    def get_all(self, skip: int = 0, limit: Optional[int] = None) -> List[{{ class_name }}]:
+        query = self.db.query(SQL{{ class_name }}).order_by(SQL{{ class_name }}.id).offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
+        return [
+            {{ class_name }}(
+                id=u.id,
+                created_at=u.created_at,
+                updated_at=u.updated_at
+            ) for u in query.all()
+        ]
+    
+    def get_page(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[{{ class_name }}], Optional[str]]:
+        query = self.db.query(SQL{{ class_name }}).order_by(*keyset_order(SQL{{ class_name }}))
+        if cursor:
+            query = query.filter(after_cursor(SQL{{ class_name }}, cursor))
+        rows = query.limit(limit + 1).all()
+        return [
+            {{ class_name }}(
+                id=u.id,
+                created_at=u.created_at,
+                updated_at=u.updated_at
+            ) for u in rows[:limit]
+        ], page_cursor(rows, limit)
+    
     def delete(self, {{ module_name }}_id: int) -> bool:
         db_{{ module_name }} = self.db.query(SQL{{ class_name }}).filter(
             SQL{{ class_name }}.id == {{ module_name }}_id
@@ -145,16 +260,20 @@ class SQLAlchemy{{ class_name }}Repository({{ class_name }}Repository):
         if db_{{ module_name }}:
             self.db.delete(db_{{ module_name }})
             self.db.commit()
+            {{ module_name }}_cache.delete({{ module_name }}_id)
             return True
         return False
 """,
 
     "infrastructure_model": """\
-from sqlalchemy import Column, Integer, DateTime
-from src.infrastructure.database.database import Base
+from datetime import datetime
+from sqlalchemy import Column, Integer, DateTime, Index
+from {{ database_config_module }} import Base
 
 class SQL{{ class_name }}(Base):
     __tablename__ = "{{ table_name }}"
+    # Keyset-пагинация идет по (created_at, id)
+    __table_args__ = (Index("ix_{{ table_name }}_created_at_id", "created_at", "id"),)
     
     id = Column(Integer, primary_key=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -167,7 +286,7 @@ class SQL{{ class_name }}(Base):
     "interface_schema": """\
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class {{ class_name }}Create(BaseModel):
     pass
@@ -179,53 +298,24 @@ class {{ class_name }}Response(BaseModel):
     
     class Config:
         from_attributes = True
+
+class {{ class_name }}PageResponse(BaseModel):
+    items: List[{{ class_name }}Response]
+    # Курсор следующей страницы (None - страница последняя)
+    next_cursor: Optional[str] = None
 """,
 
     "web_app": """\
-from fastapi import FastAPI, HTTPException
-from src.application.use_cases.create_{{ module_name }} import Create{{ class_name }}UseCase
-from src.application.use_cases.get_{{ module_name }} import Get{{ class_name }}UseCase
-from src.interface_adapters.schemas.{{ module_name }} import {{ class_name }}Create, {{ class_name }}Response
-
-def create_app(
-    create_{{ module_name }}_uc: Create{{ class_name }}UseCase,
-    get_{{ module_name }}_uc: Get{{ class_name }}UseCase
-) -> FastAPI:
-    app = FastAPI(title="{{ project_slug }}", version="1.0.0")
-    
-    @app.post("/{{ module_name }}s", response_model={{ class_name }}Response)
-    def create_{{ module_name }}({{ module_name }}_data: {{ class_name }}Create):
-        try:
-            {{ module_name }} = create_{{ module_name }}_uc.execute({{ module_name }}_data.dict())
-            return {{ class_name }}Response(
-                id={{ module_name }}.id,
-                created_at={{ module_name }}.created_at,
-                updated_at={{ module_name }}.updated_at
-            )
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail=str(e))
-    
-    @app.get("/{{ module_name }}s/{{{ module_name }}_id}", response_model={{ class_name }}Response)
-    def get_{{ module_name }}({{ module_name }}_id: int):
-        {{ module_name }} = get_{{ module_name }}_uc.get_by_id({{ module_name }}_id)
-        if not {{ module_name }}:
-            raise HTTPException(status_code=404, detail="{{ class_name }} not found")
-        return {{ class_name }}Response(
-            id={{ module_name }}.id,
-            created_at={{ module_name }}.created_at,
-            updated_at={{ module_name }}.updated_at
-        )
-    
-    @app.get("/{{ module_name }}s", response_model=list[{{ class_name }}Response])
-    def get_all_{{ module_name }}s():
-        {{ module_name }}s = get_{{ module_name }}_uc.get_all()
-        return [
-            {{ class_name }}Response(
-                id={{ module_name }}.id,
-                created_at={{ module_name }}.created_at,
-                updated_at={{ module_name }}.updated_at
-            ) for {{ module_name }} in {{ module_name }}s
-        ]
+from typing import Callable, List, Optional
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query
+{{ web_imports }}
+{{ route_builders }}
+
+def create_app(routers: List[APIRouter], lifespan=None) -> FastAPI:
+    \"\"\"Собирает приложение из роутеров сущностей (use case приходят через Depends).\"\"\"
+    app = FastAPI(title="{{ project_slug }}", version="1.0.0", lifespan=lifespan)
+    for router in routers:
+        app.include_router(router)
     
     @app.get("/")
     def read_root():
@@ -235,16 +325,32 @@ def create_app(
 """,
 
     "database_config": """\
-from sqlalchemy import create_engine
+import base64
+import json
+from datetime import datetime
+from typing import Literal
+from pydantic_settings import BaseSettings
+from sqlalchemy import create_engine, event, tuple_
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./{{ project_slug }}.db"
+class DatabaseSettings(BaseSettings):
+    DATABASE_URL: str = "sqlite:///./{{ project_slug }}.db"
+""" + DATABASE_SETTINGS_FIELDS + """\
+
+settings = DatabaseSettings()
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+
+""" + ENGINE_SETUP + KEYSET_PAGINATION + """\
 
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False} if "sqlite" in SQLALCHEMY_DATABASE_URL else {},
+    **engine_options(SQLALCHEMY_DATABASE_URL),
 )
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", set_sqlite_pragmas)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -254,5 +360,406 @@ def get_db():
         yield db
     finally:
         db.close()
-"""
+""",
+
+    # Модуль кэша сущностей: только для проектов с cache у какой-либо сущности
+    "entity_cache": ENTITY_CACHE_MODULE,
+}
+
+# Асинхронный режим БД (--async-db, metadata.async): AsyncSession, async-репозитории,
+# use case и роуты; use case, как и в синхронном режиме, собираются на каждый запрос
+CLEAN_ASYNC_TEMPLATES = {
+    **CLEAN_TEMPLATES,
+
+    "main": """\
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession
+from {{ web_app_module }} import create_app
+from {{ database_config_module }} import Base, engine, get_db
+{{ main_imports }}
+
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    # Создание таблиц БД
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield
+    await engine.dispose()
+
+# Composition Root: use case собираются на каждый запрос из сессии пула
+{{ use_case_providers }}
+
+app = create_app([
+{{ app_routes }}
+], lifespan=lifespan)
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=8000)
+""",
+
+    "domain_repository": """\
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+from {{ domain_entity_module }} import {{ class_name }}
+
+class {{ class_name }}Repository(ABC):
+    @abstractmethod
+    async def save(self, {{ module_name }}: {{ class_name }}) -> {{ class_name }}:
+        pass
+    
+    @abstractmethod
+    async def get_by_id(self, {{ module_name }}_id: int) -> Optional[{{ class_name }}]:
+        pass
+    
+    @abstractmethod
+    async def get_all(self, skip: int = 0, limit: Optional[int] = None) -> List[{{ class_name }}]:
+        pass
+    
+    @abstractmethod
+    async def get_page(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[{{ class_name }}], Optional[str]]:
+        \"\"\"Keyset-страница и непрозрачный курсор следующей (None - страница последняя).\"\"\"
+        pass
+    
+    @abstractmethod
+    async def delete(self, {{ module_name }}_id: int) -> bool:
+        pass
+""",
+
+    "use_case": """\
+from typing import List, Optional, Tuple
+from {{ domain_entity_module }} import {{ class_name }}
+from {{ domain_repository_module }} import {{ class_name }}Repository
+
+class Create{{ class_name }}UseCase:
+    def __init__(self, {{ module_name }}_repository: {{ class_name }}Repository):
+        self.{{ module_name }}_repository = {{ module_name }}_repository
+    
+    async def execute(self, {{ module_name }}_data: dict) -> {{ class_name }}:
+        {{ module_name }} = {{ class_name }}(**{{ module_name }}_data)
+        return await self.{{ module_name }}_repository.save({{ module_name }})
+
+class Get{{ class_name }}UseCase:
+    def __init__(self, {{ module_name }}_repository: {{ class_name }}Repository):
+        self.{{ module_name }}_repository = {{ module_name }}_repository
+    
+    async def get_by_id(self, {{ module_name }}_id: int) -> Optional[{{ class_name }}]:
+        return await self.{{ module_name }}_repository.get_by_id({{ module_name }}_id)
+    
+    async def get_all(self, skip: int = 0, limit: Optional[int] = None) -> List[{{ class_name }}]:
+        return await self.{{ module_name }}_repository.get_all(skip=skip, limit=limit)
+    
+    async def get_page(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[{{ class_name }}], Optional[str]]:
+        return await self.{{ module_name }}_repository.get_page(cursor=cursor, limit=limit)
+""",
+
+    "infrastructure_repository": """\
+from typing import List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from {{ domain_entity_module }} import {{ class_name }}
+from {{ domain_repository_module }} import {{ class_name }}Repository
+from {{ database_config_module }} import after_cursor, keyset_order, page_cursor
+from {{ infrastructure_model_module }} import SQL{{ class_name }}
+
+class SQLAlchemy{{ class_name }}Repository({{ class_name }}Repository):
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def save(self, {{ module_name }}: {{ class_name }}) -> {{ class_name }}:
+        db_{{ module_name }} = SQL{{ class_name }}(
+            **{{ module_name }}.__dict__
+        )
+        self.db.add(db_{{ module_name }})
+        await self.db.commit()
+        await self.db.refresh(db_{{ module_name }})
+        return {{ class_name }}(
+            id=db_{{ module_name }}.id,
+            created_at=db_{{ module_name }}.created_at,
+            updated_at=db_{{ module_name }}.updated_at
+        )
+    
+    async def get_by_id(self, {{ module_name }}_id: int) -> Optional[{{ class_name }}]:
+        db_{{ module_name }} = await self.db.get(SQL{{ class_name }}, {{ module_name }}_id)
+        if db_{{ module_name }}:
+            return {{ class_name }}(
+                id=db_{{ module_name }}.id,
+                created_at=db_{{ module_name }}.created_at,
+                updated_at=db_{{ module_name }}.updated_at
+            )
+        return None
+    
+    async def get_all(self, skip: int = 0, limit: Optional[int] = None) -> List[{{ class_name }}]:
+        statement = select(SQL{{ class_name }}).order_by(SQL{{ class_name }}.id).offset(skip)
+        if limit is not None:
+            statement = statement.limit(limit)
+        db_{{ module_name }}s = await self.db.scalars(statement)
+        return [
+            {{ class_name }}(
+                id=u.id,
+                created_at=u.created_at,
+                updated_at=u.updated_at
+            ) for u in db_{{ module_name }}s
+        ]
+    
+    async def get_page(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[{{ class_name }}], Optional[str]]:
+        statement = select(SQL{{ class_name }}).order_by(*keyset_order(SQL{{ class_name }})).limit(limit + 1)
+        if cursor:
+            statement = statement.where(after_cursor(SQL{{ class_name }}, cursor))
+        rows = list(await self.db.scalars(statement))
+        return [
+            {{ class_name }}(
+                id=u.id,
+                created_at=u.created_at,
+                updated_at=u.updated_at
+            ) for u in rows[:limit]
+        ], page_cursor(rows, limit)
+    
+    async def delete(self, {{ module_name }}_id: int) -> bool:
+        db_{{ module_name }} = await self.db.get(SQL{{ class_name }}, {{ module_name }}_id)
+        if db_{{ module_name }}:
+            await self.db.delete(db_{{ module_name }})
+            await self.db.commit()
+            return True
+        return False
+""",
+
+    "cached_infrastructure_repository": """\
+from typing import List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from {{ domain_entity_module }} import {{ class_name }}
+from {{ domain_repository_module }} import {{ class_name }}Repository
+from {{ database_config_module }} import after_cursor, keyset_order, page_cursor
+from {{ entity_cache_module }} import EntityCache
+from {{ infrastructure_model_module }} import SQL{{ class_name }}
+
+# Read-through кэш get_by_id: cache сущности в схеме
+{{ module_name }}_cache = EntityCache("{{ table_name }}", ttl={{ cache_ttl }}, max_size={{ cache_max_size }})
+
+class SQLAlchemy{{ class_name }}Repository({{ class_name }}Repository):
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def save(self, {{ module_name }}: {{ class_name }}) -> {{ class_name }}:
+        db_{{ module_name }} = SQL{{ class_name }}(
+            **{{ module_name }}.__dict__
+        )
+        self.db.add(db_{{ module_name }})
+        await self.db.commit()
+        await self.db.refresh(db_{{ module_name }})
+        return {{ class_name }}(
+            id=db_{{ module_name }}.id,
+            created_at=db_{{ module_name }}.created_at,
+            updated_at=db_{{ module_name }}.updated_at
+        )
+    
+    async def get_by_id(self, {{ module_name }}_id: int) -> Optional[{{ class_name }}]:
+        cached = {{ module_name }}_cache.get({{ module_name }}_id)
+        if cached is not None:
+            return {{ class_name }}(**cached)
+        db_{{ module_name }} = await self.db.get(SQL{{ class_name }}, {{ module_name }}_id)
+        if db_{{ module_name }}:
+            {{ module_name }} = {{ class_name }}(
+                id=db_{{ module_name }}.id,
+                created_at=db_{{ module_name }}.created_at,
+                updated_at=db_{{ module_name }}.updated_at
+            )
+            {{ module_name }}_cache.set({{ module_name }}_id, dict({{ module_name }}.__dict__))
+            return {{ module_name }}
+        return None
+    
+    async def get_all(self, skip: int = 0, limit: Optional[int] = None) -> List[{{ class_name }}]:
+        statement = select(SQL{{ class_name }}).order_by(SQL{{ class_name }}.id).offset(skip)
+        if limit is not None:
+            statement = statement.limit(limit)
+        db_{{ module_name }}s = await self.db.scalars(statement)
+        return [
+            {{ class_name }}(
+                id=u.id,
+                created_at=u.created_at,
+                updated_at=u.updated_at
+            ) for u in db_{{ module_name }}s
+        ]
+    
+    async def get_page(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[{{ class_name }}], Optional[str]]:
+        statement = select(SQL{{ class_name }}).order_by(*keyset_order(SQL{{ class_name }})).limit(limit + 1)
+        if cursor:
+            statement = statement.where(after_cursor(SQL{{ class_name }}, cursor))
+        rows = list(await self.db.scalars(statement))
+        return [
+            {{ class_name }}(
+                id=u.id,
+                created_at=u.created_at,
+                updated_at=u.updated_at
+            ) for u in rows[:limit]
+        ], page_cursor(rows, limit)
+    
+    async def delete(self, {{ module_name }}_id: int) -> bool:
+        db_{{ module_name }} = await self.db.get(SQL{{ class_name }}, {{ module_name }}_id)
+        if db_{{ module_name }}:
+            await self.db.delete(db_{{ module_name }})
+            await self.db.commit()
+            {{ module_name }}_cache.delete({{ module_name }}_id)
+            return True
+        return False
+""",
+
+    "web_app": """\
+from typing import Callable, List, Optional
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query
+{{ web_imports }}
+{{ route_builders }}
+
+def create_app(routers: List[APIRouter], lifespan=None) -> FastAPI:
+    \"\"\"Собирает приложение из роутеров сущностей (use case приходят через Depends).\"\"\"
+    app = FastAPI(title="{{ project_slug }}", version="1.0.0", lifespan=lifespan)
+    for router in routers:
+        app.include_router(router)
+    
+    @app.get("/")
+    async def read_root():
+        return {"message": "FastAPI with Clean Architecture"}
+    
+    return app
+""",
+
+    "database_config": """\
+import base64
+import json
+from datetime import datetime
+from typing import AsyncIterator, Literal
+from pydantic_settings import BaseSettings
+from sqlalchemy import event, tuple_
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+
+class DatabaseSettings(BaseSettings):
+    DATABASE_URL: str = "sqlite+aiosqlite:///./{{ project_slug }}.db"
+""" + DATABASE_SETTINGS_FIELDS + """\
+
+settings = DatabaseSettings()
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+
+""" + ENGINE_SETUP + KEYSET_PAGINATION + """\
+
+# Движок не подключается при создании: соединения открываются пулом по первому запросу
+engine = create_async_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL))
+# События соединений DBAPI регистрируются на синхронном движке под асинхронным
+if engine.dialect.name == "sqlite":
+    event.listen(engine.sync_engine, "connect", set_sqlite_pragmas)
+# expire_on_commit=False: после commit объекты читаются без неявного ленивого запроса
+AsyncSessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+Base = declarative_base()
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
+""",
+}
+
+
+# Блоки web_app и main: роутер и провайдеры use case на каждую сущность
+CLEAN_BLOCKS = {
+    "web_imports": """\
+from {{ use_case_module }} import Create{{ class_name }}UseCase, Get{{ class_name }}UseCase
+from {{ interface_schema_module }} import {{ class_name }}Create, {{ class_name }}PageResponse, {{ class_name }}Response""",
+
+    "route_builders": """
+def {{ module_name }}_routes(
+    create_uc: Callable[..., Create{{ class_name }}UseCase],
+    get_uc: Callable[..., Get{{ class_name }}UseCase]
+) -> APIRouter:
+    \"\"\"Роутер {{ table_name }}; аргументы - зависимости FastAPI, создающие use case на запрос.\"\"\"
+    router = APIRouter(prefix="/{{ table_name }}", tags=["{{ table_name }}"])
+    
+    @router.post("", response_model={{ class_name }}Response)
+    def create_{{ module_name }}(
+        {{ module_name }}_data: {{ class_name }}Create,
+        use_case: Create{{ class_name }}UseCase = Depends(create_uc)
+    ):
+        try:
+            {{ module_name }} = use_case.execute({{ module_name }}_data.model_dump())
+            return {{ class_name }}Response(
+                id={{ module_name }}.id,
+                created_at={{ module_name }}.created_at,
+                updated_at={{ module_name }}.updated_at
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    @router.get("/{{{ module_name }}_id}", response_model={{ class_name }}Response)
+    def get_{{ module_name }}(
+        {{ module_name }}_id: int,
+        use_case: Get{{ class_name }}UseCase = Depends(get_uc)
+    ):
+        {{ module_name }} = use_case.get_by_id({{ module_name }}_id)
+        if not {{ module_name }}:
+            raise HTTPException(status_code=404, detail="{{ class_name }} not found")
+        return {{ class_name }}Response(
+            id={{ module_name }}.id,
+            created_at={{ module_name }}.created_at,
+            updated_at={{ module_name }}.updated_at
+        )
+    
+    @router.get("", response_model={{ class_name }}PageResponse)
+    def get_all_{{ table_name }}(
+        cursor: Optional[str] = None,
+        skip: Optional[int] = Query(None, ge=0),
+        limit: int = Query(100, ge=1, le=1000),
+        use_case: Get{{ class_name }}UseCase = Depends(get_uc)
+    ):
+        \"\"\"Keyset-пагинация: cursor - next_cursor предыдущей страницы; skip - offset-пагинация.\"\"\"
+        next_cursor = None
+        if skip is not None:
+            {{ table_name }} = use_case.get_all(skip=skip, limit=limit)
+        else:
+            try:
+                {{ table_name }}, next_cursor = use_case.get_page(cursor=cursor, limit=limit)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+        return {{ class_name }}PageResponse(
+            items=[
+                {{ class_name }}Response(
+                    id={{ module_name }}.id,
+                    created_at={{ module_name }}.created_at,
+                    updated_at={{ module_name }}.updated_at
+                ) for {{ module_name }} in {{ table_name }}
+            ],
+            next_cursor=next_cursor
+        )
+    
+    return router""",
+
+    "main_imports": """\
+from {{ infrastructure_repository_module }} import SQLAlchemy{{ class_name }}Repository
+from {{ use_case_module }} import Create{{ class_name }}UseCase, Get{{ class_name }}UseCase
+from {{ web_app_module }} import {{ module_name }}_routes""",
+
+    "use_case_providers": """
+def provide_create_{{ module_name }}_use_case(db: Session = Depends(get_db)) -> Create{{ class_name }}UseCase:
+    return Create{{ class_name }}UseCase(SQLAlchemy{{ class_name }}Repository(db))
+
+def provide_get_{{ module_name }}_use_case(db: Session = Depends(get_db)) -> Get{{ class_name }}UseCase:
+    return Get{{ class_name }}UseCase(SQLAlchemy{{ class_name }}Repository(db))""",
+
+    "app_routes": """\
+    {{ module_name }}_routes(provide_create_{{ module_name }}_use_case, provide_get_{{ module_name }}_use_case),""",
+}
+
+# Асинхронные блоки: async-обработчики и провайдеры на AsyncSession
+CLEAN_ASYNC_BLOCKS = {
+    **CLEAN_BLOCKS,
+    "route_builders": CLEAN_BLOCKS["route_builders"]
+        .replace("    def ", "    async def ")
+        .replace("= use_case.", "= await use_case."),
+    "use_case_providers": """
+async def provide_create_{{ module_name }}_use_case(db: AsyncSession = Depends(get_db)) -> Create{{ class_name }}UseCase:
+    return Create{{ class_name }}UseCase(SQLAlchemy{{ class_name }}Repository(db))
+
+async def provide_get_{{ module_name }}_use_case(db: AsyncSession = Depends(get_db)) -> Get{{ class_name }}UseCase:
+    return Get{{ class_name }}UseCase(SQLAlchemy{{ class_name }}Repository(db))""",
 }
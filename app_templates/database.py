@@ -0,0 +1,253 @@
+"""
+Общие фрагменты шаблонов БД: настройки пула соединений и PRAGMA SQLite,
+keyset-пагинация и модуль read-through кэша сущностей.
+
+Значения по умолчанию подставляются из metadata.database схемы
+(плейсхолдеры db_* и sqlite_*), при запуске проекта их переопределяют
+переменные окружения.
+"""
+
+# Поля Settings сгенерированного проекта
+DATABASE_SETTINGS_FIELDS = """\
+    # Пул соединений
+    DB_POOL_SIZE: int = {{ db_pool_size }}
+    DB_MAX_OVERFLOW: int = {{ db_max_overflow }}
+    DB_POOL_TIMEOUT: int = {{ db_pool_timeout }}
+    DB_POOL_RECYCLE: int = {{ db_pool_recycle }}
+    DB_POOL_PRE_PING: bool = {{ db_pool_pre_ping }}
+    # PRAGMA каждого нового соединения SQLite
+    SQLITE_JOURNAL_MODE: Literal["DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"] = "{{ sqlite_journal_mode }}"
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "{{ sqlite_synchronous }}"
+    SQLITE_MMAP_SIZE: int = {{ sqlite_mmap_size }}
+    SQLITE_CACHE_SIZE: int = {{ sqlite_cache_size }}
+"""
+
+# Параметры create_engine/create_async_engine и слушатель connect для SQLite
+ENGINE_SETUP = '''\
+def engine_options(url: str) -> dict:
+    """Параметры пула из настроек; у SQLite в памяти пул из одного соединения - без очереди."""
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING, "pool_recycle": settings.DB_POOL_RECYCLE}
+    database_url = make_url(url)
+    in_memory = database_url.get_backend_name() == "sqlite" and (
+        database_url.database in (None, "", ":memory:") or database_url.query.get("mode") == "memory"
+    )
+    if not in_memory:
+        options.update(pool_size=settings.DB_POOL_SIZE, max_overflow=settings.DB_MAX_OVERFLOW,
+                       pool_timeout=settings.DB_POOL_TIMEOUT)
+    return options
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """WAL, synchronous, mmap и кэш страниц для каждого нового соединения SQLite."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE:d}")
+    cursor.execute(f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE:d}")
+    cursor.close()
+'''
+
+# Keyset-пагинация: курсор - (created_at, id) последней строки страницы
+KEYSET_PAGINATION = '''\
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Непрозрачный курсор следующей страницы."""
+    raw = json.dumps([created_at.isoformat(), id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Разбирает курсор encode_cursor; поврежденный курсор - ValueError."""
+    try:
+        created_at, id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(created_at), int(id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("invalid cursor") from e
+
+
+def keyset_order(model) -> tuple:
+    """Порядок keyset-страниц; индекс (created_at, id) модели покрывает и сортировку, и условие."""
+    return model.created_at, model.id
+
+
+def after_cursor(model, cursor: str):
+    """Строки после курсора: запрос не зависит от глубины страницы, в отличие от OFFSET."""
+    return tuple_(model.created_at, model.id) > tuple_(*decode_cursor(cursor))
+
+
+def page_cursor(rows: list, limit: int) -> str | None:
+    """Курсор следующей страницы по выборке из limit + 1 строк (None - страница последняя)."""
+    if len(rows) <= limit:
+        return None
+    last = rows[limit - 1]
+    return encode_cursor(last.created_at, last.id)
+'''
+
+# Модуль кэша сущностей (шаблон entity_cache): генерируется рядом с модулем БД,
+# только если cache объявлен у какой-либо сущности; значения - словари колонок строки
+ENTITY_CACHE_MODULE = '''\
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from pydantic_settings import BaseSettings
+from sqlalchemy import inspect
+
+
+class CacheSettings(BaseSettings):
+    # Удаленный кэш сущностей (redis://...); пусто - кэш в памяти процесса
+    CACHE_URL: str | None = None
+
+
+settings = CacheSettings()
+
+
+class CacheBackend(ABC):
+    """Хранилище кэша сущностей: ключ - строка, значение - словарь колонок."""
+
+    @abstractmethod
+    def get(self, key: str) -> dict | None: ...
+
+    @abstractmethod
+    def set(self, key: str, value: dict) -> None: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    def clear(self) -> None:
+        """Сбрасывает локальные записи; удаленные истекают по TTL."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """TTL + LRU в памяти процесса: при переполнении вытесняется давно не читавшаяся запись."""
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return dict(value)
+
+    def set(self, key: str, value: dict) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, dict(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RemoteCacheBackend(CacheBackend):
+    """Общий для процессов кэш через клиент с get/set(ex=)/delete: redis.Redis или замена в тестах."""
+
+    def __init__(self, client, namespace: str, ttl: float):
+        self.client = client
+        self.namespace = namespace
+        self.ttl = max(1, round(ttl))
+
+    def get(self, key: str) -> dict | None:
+        raw = self.client.get(f"{self.namespace}:{key}")
+        return None if raw is None else json.loads(raw, object_hook=_decode_cached)
+
+    def set(self, key: str, value: dict) -> None:
+        self.client.set(f"{self.namespace}:{key}", json.dumps(value, default=_encode_cached), ex=self.ttl)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(f"{self.namespace}:{key}")
+
+
+def _encode_cached(value):
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    raise TypeError(f"{type(value).__name__} is not cacheable")
+
+
+def _decode_cached(data: dict):
+    return datetime.fromisoformat(data["__datetime__"]) if "__datetime__" in data else data
+
+
+_entity_caches: list["EntityCache"] = []
+_cache_client = None
+
+
+class EntityCache:
+    """Кэш одной сущности; бэкенд выбирается при первом обращении."""
+
+    def __init__(self, namespace: str, ttl: float, max_size: int):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_size = max_size
+        self._backend: CacheBackend | None = None
+        _entity_caches.append(self)
+
+    @property
+    def backend(self) -> CacheBackend:
+        if self._backend is None:
+            client = cache_client()
+            self._backend = (RemoteCacheBackend(client, self.namespace, self.ttl) if client is not None
+                             else MemoryCacheBackend(self.ttl, self.max_size))
+        return self._backend
+
+    def get(self, key) -> dict | None:
+        return self.backend.get(str(key))
+
+    def set(self, key, value: dict) -> None:
+        self.backend.set(str(key), value)
+
+    def delete(self, key) -> None:
+        self.backend.delete(str(key))
+
+    def reset(self) -> None:
+        if self._backend is not None:
+            self._backend.clear()
+        self._backend = None
+
+
+def cache_client():
+    """Клиент удаленного кэша: use_cache_client или redis по CACHE_URL (None - кэш в памяти)."""
+    global _cache_client
+    if _cache_client is None and settings.CACHE_URL:
+        import redis  # нужен только удаленному кэшу
+
+        _cache_client = redis.Redis.from_url(settings.CACHE_URL)
+    return _cache_client
+
+
+def use_cache_client(client) -> None:
+    """Подключает удаленный кэш (клиент с get/set(ex=)/delete); None - снова по CACHE_URL."""
+    global _cache_client
+    _cache_client = client
+    reset_entity_caches()
+
+
+def reset_entity_caches() -> None:
+    """Сбрасывает кэши всех сущностей: например, после отката транзакции в тестах."""
+    for cache in _entity_caches:
+        cache.reset()
+
+
+def cached_row(row) -> dict:
+    """Колонки строки ORM - то, что хранит кэш."""
+    return {column.key: getattr(row, column.key) for column in inspect(row).mapper.column_attrs}
+'''
@@ -2,22 +2,31 @@
 Шаблоны для Layered Architecture.
 """
 
+from .database import DATABASE_SETTINGS_FIELDS, ENGINE_SETUP, ENTITY_CACHE_MODULE, KEYSET_PAGINATION
+
 LAYERED_TEMPLATES = {
     "main": """\
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from app.core.config import settings
-from app.api.v1.api import api_router
-from app.db.session import engine, Base
+from {{ config_module }} import settings
+from {{ api_router_module }} import api_router
+from {{ database_module }} import engine, Base
+
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    # Создание таблиц БД - при старте приложения, а не при импорте модуля
+    Base.metadata.create_all(bind=engine)
+    yield
+    engine.dispose()
 
 def create_application() -> FastAPI:
     application = FastAPI(
         title=settings.PROJECT_NAME,
-        openapi_url=f"{settings.API_V1_STR}/openapi.json"
+        openapi_url=f"{settings.API_V1_STR}/openapi.json",
+        lifespan=lifespan
     )
     
-    # Создание таблиц БД
-    Base.metadata.create_all(bind=engine)
-    
     # Подключение роутеров
     application.include_router(api_router, prefix=settings.API_V1_STR)
     
@@ -31,12 +40,14 @@ def read_root():
 """,
 
     "config": """\
+from typing import Literal
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "{{ project_slug }}"
     API_V1_STR: str = "/api/v1"
     DATABASE_URL: str = "sqlite:///./{{ project_slug }}.db"
+""" + DATABASE_SETTINGS_FIELDS + """\
     
     class Config:
         case_sensitive = True
@@ -45,14 +56,14 @@ settings = Settings()
 """,
 
     "model": """\
-from sqlalchemy import Column, Integer, String, DateTime
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from {{ database_module }} import Base
 from datetime import datetime
 
-Base = declarative_base()
-
 class {{ class_name }}(Base):
     __tablename__ = "{{ table_name }}"
+    # Keyset-пагинация идет по (created_at, id)
+    __table_args__ = (Index("ix_{{ table_name }}_created_at_id", "created_at", "id"),)
     
     id = Column(Integer, primary_key=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -65,7 +76,7 @@ class {{ class_name }}(Base):
     "schema": """\
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class {{ class_name }}Base(BaseModel):
     pass
@@ -83,12 +94,17 @@ class {{ class_name }}({{ class_name }}Base):
     
     class Config:
         from_attributes = True
+
+class {{ class_name }}Page(BaseModel):
+    items: List[{{ class_name }}]
+    # Курсор следующей страницы (None - страница последняя)
+    next_cursor: Optional[str] = None
 """,
 
     "service": """\
 from typing import List, Optional
-from app.repositories.{{ module_name }}_repository import {{ class_name }}Repository
-from app.schemas.{{ module_name }} import {{ class_name }}Create, {{ class_name }}Update
+from {{ repository_module }} import {{ class_name }}Repository
+from {{ schema_module }} import {{ class_name }}Create, {{ class_name }}Update
 
 class {{ class_name }}Service:
     def __init__(self, {{ module_name }}_repository: {{ class_name }}Repository):
@@ -100,6 +116,9 @@ class {{ class_name }}Service:
     def get_all_{{ module_name }}s(self, skip: int = 0, limit: int = 100):
         return self.{{ module_name }}_repository.get_all(skip=skip, limit=limit)
     
+    def get_{{ module_name }}s_page(self, cursor: Optional[str] = None, limit: int = 100):
+        return self.{{ module_name }}_repository.get_page(cursor=cursor, limit=limit)
+    
     def create_{{ module_name }}(self, {{ module_name }}_create: {{ class_name }}Create):
         return self.{{ module_name }}_repository.create({{ module_name }}_create)
     
@@ -111,10 +130,11 @@ class {{ class_name }}Service:
 """,
 
     "repository": """\
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
-from app.models.{{ module_name }} import {{ class_name }}
-from app.schemas.{{ module_name }} import {{ class_name }}Create, {{ class_name }}Update
+from {{ database_module }} import after_cursor, keyset_order, page_cursor
+from {{ model_module }} import {{ class_name }}
+from {{ schema_module }} import {{ class_name }}Create, {{ class_name }}Update
 
 class {{ class_name }}Repository:
     def __init__(self, db: Session):
@@ -124,7 +144,14 @@ class {{ class_name }}Repository:
         return self.db.query({{ class_name }}).filter({{ class_name }}.id == {{ module_name }}_id).first()
     
     def get_all(self, skip: int = 0, limit: int = 100) -> List[{{ class_name }}]:
-        return self.db.query({{ class_name }}).offset(skip).limit(limit).all()
+        return self.db.query({{ class_name }}).order_by({{ class_name }}.id).offset(skip).limit(limit).all()
+    
+    def get_page(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[{{ class_name }}], Optional[str]]:
+        query = self.db.query({{ class_name }}).order_by(*keyset_order({{ class_name }}))
+        if cursor:
+            query = query.filter(after_cursor({{ class_name }}, cursor))
+        rows = query.limit(limit + 1).all()
+        return rows[:limit], page_cursor(rows, limit)
     
     def create(self, {{ module_name }}_create: {{ class_name }}Create) -> {{ class_name }}:
         db_{{ module_name }} = {{ class_name }}(**{{ module_name }}_create.dict())
@@ -152,15 +179,81 @@ class {{ class_name }}Repository:
         return False
 """,
 
+    "cached_repository": """\
+from typing import List, Optional, Tuple
+from sqlalchemy.orm import Session
+from {{ database_module }} import after_cursor, keyset_order, page_cursor
+from {{ entity_cache_module }} import EntityCache, cached_row
+from {{ model_module }} import {{ class_name }}
+from {{ schema_module }} import {{ class_name }}Create, {{ class_name }}Update
+
+# Read-through кэш get_by_id: cache сущности в схеме
+{{ module_name }}_cache = EntityCache("{{ table_name }}", ttl={{ cache_ttl }}, max_size={{ cache_max_size }})
+
+class {{ class_name }}Repository:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_by_id(self, {{ module_name }}_id: int) -> Optional[{{ class_name }}]:
+        cached = {{ module_name }}_cache.get({{ module_name }}_id)
+        if cached is not None:
+            # Отсоединенная копия только для чтения: изменения идут через _load
+            return {{ class_name }}(**cached)
+        db_{{ module_name }} = self._load({{ module_name }}_id)
+        if db_{{ module_name }}:
+            {{ module_name }}_cache.set({{ module_name }}_id, cached_row(db_{{ module_name }}))
+        return db_{{ module_name }}
+    
+    def _load(self, {{ module_name }}_id: int) -> Optional[{{ class_name }}]:
+        return self.db.query({{ class_name }}).filter({{ class_name }}.id == {{ module_name }}_id).first()
+    
+    def get_all(self, skip: int = 0, limit: int = 100) -> List[{{ class_name }}]:
+        return self.db.query({{ class_name }}).order_by({{ class_name }}.id).offset(skip).limit(limit).all()
+    
+    def get_page(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[{{ class_name }}], Optional[str]]:
+        query = self.db.query({{ class_name }}).order_by(*keyset_order({{ class_name }}))
+        if cursor:
+            query = query.filter(after_cursor({{ class_name }}, cursor))
+        rows = query.limit(limit + 1).all()
+        return rows[:limit], page_cursor(rows, limit)
+    
+    def create(self, {{ module_name }}_create: {{ class_name }}Create) -> {{ class_name }}:
+        db_{{ module_name }} = {{ class_name }}(**{{ module_name }}_create.dict())
+        self.db.add(db_{{ module_name }})
+        self.db.commit()
+        self.db.refresh(db_{{ module_name }})
+        return db_{{ module_name }}
+    
+    def update(self, {{ module_name }}_id: int, {{ module_name }}_update: {{ class_name }}Update) -> Optional[{{ class_name }}]:
+        db_{{ module_name }} = self._load({{ module_name }}_id)
+        if db_{{ module_name }}:
+            update_data = {{ module_name }}_update.dict(exclude_unset=True)
+            for field, value in update_data.items():
+                setattr(db_{{ module_name }}, field, value)
+            self.db.commit()
+            self.db.refresh(db_{{ module_name }})
+            {{ module_name }}_cache.delete({{ module_name }}_id)
+        return db_{{ module_name }}
+    
+    def delete(self, {{ module_name }}_id: int) -> bool:
+        db_{{ module_name }} = self._load({{ module_name }}_id)
+        if db_{{ module_name }}:
+            self.db.delete(db_{{ module_name }})
+            self.db.commit()
+            {{ module_name }}_cache.delete({{ module_name }}_id)
+            return True
+        return False
+""",
+
     "router": """\
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Optional
 
-from app.schemas.{{ module_name }} import {{ class_name }}, {{ class_name }}Create, {{ class_name }}Update
-from app.services.{{ module_name }}_service import {{ class_name }}Service
-from app.repositories.{{ module_name }}_repository import {{ class_name }}Repository
-from app.db.session import get_db
+from {{ schema_module }} import {{ class_name }}, {{ class_name }}Create, {{ class_name }}Page, {{ class_name }}Update
+from {{ service_module }} import {{ class_name }}Service
+from {{ repository_module }} import {{ class_name }}Repository
+from {{ database_module }} import get_db
 
 router = APIRouter()
 
@@ -173,7 +266,7 @@ def create_{{ module_name }}(
     {{ module_name }}_service = {{ class_name }}Service({{ module_name }}_repo)
     return {{ module_name }}_service.create_{{ module_name }}({{ module_name }})
 
-@router.get("/{ {{ module_name }}_id}", response_model={{ class_name }})
+@router.get("/{{{ module_name }}_id}", response_model={{ class_name }})
 def read_{{ module_name }}(
     {{ module_name }}_id: int, 
     db: Session = Depends(get_db)
@@ -185,17 +278,25 @@ def read_{{ module_name }}(
         raise HTTPException(status_code=404, detail="{{ class_name }} not found")
     return db_{{ module_name }}
 
-@router.get("/", response_model=List[{{ class_name }}])
+@router.get("/", response_model={{ class_name }}Page)
 def read_{{ module_name }}s(
-    skip: int = 0, 
-    limit: int = 100, 
+    cursor: Optional[str] = None,
+    skip: Optional[int] = Query(None, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
     db: Session = Depends(get_db)
 ):
+    \"\"\"Keyset-пагинация: cursor - next_cursor предыдущей страницы; skip - offset-пагинация.\"\"\"
     {{ module_name }}_repo = {{ class_name }}Repository(db)
     {{ module_name }}_service = {{ class_name }}Service({{ module_name }}_repo)
-    return {{ module_name }}_service.get_all_{{ module_name }}s(skip=skip, limit=limit)
+    if skip is not None:
+        return {"items": {{ module_name }}_service.get_all_{{ module_name }}s(skip=skip, limit=limit)}
+    try:
+        items, next_cursor = {{ module_name }}_service.get_{{ module_name }}s_page(cursor=cursor, limit=limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"items": items, "next_cursor": next_cursor}
 
-@router.put("/{ {{ module_name }}_id}", response_model={{ class_name }})
+@router.put("/{{{ module_name }}_id}", response_model={{ class_name }})
 def update_{{ module_name }}(
     {{ module_name }}_id: int, 
     {{ module_name }}: {{ class_name }}Update, 
@@ -205,7 +306,7 @@ def update_{{ module_name }}(
     {{ module_name }}_service = {{ class_name }}Service({{ module_name }}_repo)
     return {{ module_name }}_service.update_{{ module_name }}({{ module_name }}_id, {{ module_name }})
 
-@router.delete("/{ {{ module_name }}_id}")
+@router.delete("/{{{ module_name }}_id}")
 def delete_{{ module_name }}(
     {{ module_name }}_id: int, 
     db: Session = Depends(get_db)
@@ -219,15 +320,24 @@ def delete_{{ module_name }}(
 """,
 
     "database": """\
-from sqlalchemy import create_engine
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import create_engine, event, tuple_
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from app.core.config import settings
+from {{ config_module }} import settings
+
+""" + ENGINE_SETUP + KEYSET_PAGINATION + """\
 
 engine = create_engine(
-    settings.DATABASE_URL, 
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
+    settings.DATABASE_URL,
+    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
+    **engine_options(settings.DATABASE_URL),
 )
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", set_sqlite_pragmas)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -239,11 +349,326 @@ def get_db():
         db.close()
 """,
 
+    # Модуль кэша сущностей: только для проектов с cache у какой-либо сущности
+    "entity_cache": ENTITY_CACHE_MODULE,
+
     "api_router": """\
 from fastapi import APIRouter
-from app.api.v1.endpoints import {{ module_name }}
+{{ router_imports }}
 
 api_router = APIRouter()
-api_router.include_router({{ module_name }}.router, prefix="/{{ module_name }}s", tags=["{{ module_name }}s"])
+{{ include_routers }}
 """
-}
\ No newline at end of file
+}
+
+# Строки на каждую сущность с роутером в общем роутере API
+LAYERED_BLOCKS = {
+    "router_imports": "from {{ router_module }} import router as {{ module_name }}_router",
+    "include_routers": 'api_router.include_router({{ module_name }}_router, prefix="/{{ module_name }}s", '
+                       'tags=["{{ module_name }}s"])',
+}
+
+# Асинхронный режим БД (--async-db, metadata.async): AsyncSession, async-репозитории,
+# сервисы и роуты; остальные шаблоны общие с синхронным режимом
+LAYERED_ASYNC_TEMPLATES = {
+    **LAYERED_TEMPLATES,
+
+    "main": """\
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from {{ config_module }} import settings
+from {{ api_router_module }} import api_router
+from {{ database_module }} import engine, Base
+
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    # Создание таблиц БД
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield
+    await engine.dispose()
+
+def create_application() -> FastAPI:
+    application = FastAPI(
+        title=settings.PROJECT_NAME,
+        openapi_url=f"{settings.API_V1_STR}/openapi.json",
+        lifespan=lifespan
+    )
+    
+    # Подключение роутеров
+    application.include_router(api_router, prefix=settings.API_V1_STR)
+    
+    return application
+
+app = create_application()
+
+@app.get("/")
+async def read_root():
+    return {"message": "Welcome to FastAPI with Layered Architecture!"}
+""",
+
+    "config": """\
+from typing import Literal
+from pydantic_settings import BaseSettings
+
+class Settings(BaseSettings):
+    PROJECT_NAME: str = "{{ project_slug }}"
+    API_V1_STR: str = "/api/v1"
+    DATABASE_URL: str = "sqlite+aiosqlite:///./{{ project_slug }}.db"
+""" + DATABASE_SETTINGS_FIELDS + """\
+    
+    class Config:
+        case_sensitive = True
+
+settings = Settings()
+""",
+
+    "service": """\
+from typing import List, Optional
+from {{ repository_module }} import {{ class_name }}Repository
+from {{ schema_module }} import {{ class_name }}Create, {{ class_name }}Update
+
+class {{ class_name }}Service:
+    def __init__(self, {{ module_name }}_repository: {{ class_name }}Repository):
+        self.{{ module_name }}_repository = {{ module_name }}_repository
+    
+    async def get_{{ module_name }}(self, {{ module_name }}_id: int):
+        return await self.{{ module_name }}_repository.get_by_id({{ module_name }}_id)
+    
+    async def get_all_{{ module_name }}s(self, skip: int = 0, limit: int = 100):
+        return await self.{{ module_name }}_repository.get_all(skip=skip, limit=limit)
+    
+    async def get_{{ module_name }}s_page(self, cursor: Optional[str] = None, limit: int = 100):
+        return await self.{{ module_name }}_repository.get_page(cursor=cursor, limit=limit)
+    
+    async def create_{{ module_name }}(self, {{ module_name }}_create: {{ class_name }}Create):
+        return await self.{{ module_name }}_repository.create({{ module_name }}_create)
+    
+    async def update_{{ module_name }}(self, {{ module_name }}_id: int, {{ module_name }}_update: {{ class_name }}Update):
+        return await self.{{ module_name }}_repository.update({{ module_name }}_id, {{ module_name }}_update)
+    
+    async def delete_{{ module_name }}(self, {{ module_name }}_id: int):
+        return await self.{{ module_name }}_repository.delete({{ module_name }}_id)
+""",
+
+    "repository": """\
+from typing import List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from {{ database_module }} import after_cursor, keyset_order, page_cursor
+from {{ model_module }} import {{ class_name }}
+from {{ schema_module }} import {{ class_name }}Create, {{ class_name }}Update
+
+class {{ class_name }}Repository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_by_id(self, {{ module_name }}_id: int) -> Optional[{{ class_name }}]:
+        return await self.db.get({{ class_name }}, {{ module_name }}_id)
+    
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[{{ class_name }}]:
+        result = await self.db.scalars(select({{ class_name }}).order_by({{ class_name }}.id).offset(skip).limit(limit))
+        return list(result)
+    
+    async def get_page(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[{{ class_name }}], Optional[str]]:
+        statement = select({{ class_name }}).order_by(*keyset_order({{ class_name }})).limit(limit + 1)
+        if cursor:
+            statement = statement.where(after_cursor({{ class_name }}, cursor))
+        rows = list(await self.db.scalars(statement))
+        return rows[:limit], page_cursor(rows, limit)
+    
+    async def create(self, {{ module_name }}_create: {{ class_name }}Create) -> {{ class_name }}:
+        db_{{ module_name }} = {{ class_name }}(**{{ module_name }}_create.model_dump())
+        self.db.add(db_{{ module_name }})
+        await self.db.commit()
+        await self.db.refresh(db_{{ module_name }})
+        return db_{{ module_name }}
+    
+    async def update(self, {{ module_name }}_id: int, {{ module_name }}_update: {{ class_name }}Update) -> Optional[{{ class_name }}]:
+        db_{{ module_name }} = await self.get_by_id({{ module_name }}_id)
+        if db_{{ module_name }}:
+            update_data = {{ module_name }}_update.model_dump(exclude_unset=True)
+            for field, value in update_data.items():
+                setattr(db_{{ module_name }}, field, value)
+            await self.db.commit()
+            await self.db.refresh(db_{{ module_name }})
+        return db_{{ module_name }}
+    
+    async def delete(self, {{ module_name }}_id: int) -> bool:
+        db_{{ module_name }} = await self.get_by_id({{ module_name }}_id)
+        if db_{{ module_name }}:
+            await self.db.delete(db_{{ module_name }})
+            await self.db.commit()
+            return True
+        return False
+""",
+
+    "cached_repository": """\
+from typing import List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from {{ database_module }} import after_cursor, keyset_order, page_cursor
+from {{ entity_cache_module }} import EntityCache, cached_row
+from {{ model_module }} import {{ class_name }}
+from {{ schema_module }} import {{ class_name }}Create, {{ class_name }}Update
+
+# Read-through кэш get_by_id: cache сущности в схеме
+{{ module_name }}_cache = EntityCache("{{ table_name }}", ttl={{ cache_ttl }}, max_size={{ cache_max_size }})
+
+class {{ class_name }}Repository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_by_id(self, {{ module_name }}_id: int) -> Optional[{{ class_name }}]:
+        cached = {{ module_name }}_cache.get({{ module_name }}_id)
+        if cached is not None:
+            # Отсоединенная копия только для чтения: изменения идут через _load
+            return {{ class_name }}(**cached)
+        db_{{ module_name }} = await self._load({{ module_name }}_id)
+        if db_{{ module_name }}:
+            {{ module_name }}_cache.set({{ module_name }}_id, cached_row(db_{{ module_name }}))
+        return db_{{ module_name }}
+    
+    async def _load(self, {{ module_name }}_id: int) -> Optional[{{ class_name }}]:
+        return await self.db.get({{ class_name }}, {{ module_name }}_id)
+    
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[{{ class_name }}]:
+        result = await self.db.scalars(select({{ class_name }}).order_by({{ class_name }}.id).offset(skip).limit(limit))
+        return list(result)
+    
+    async def get_page(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[{{ class_name }}], Optional[str]]:
+        statement = select({{ class_name }}).order_by(*keyset_order({{ class_name }})).limit(limit + 1)
+        if cursor:
+            statement = statement.where(after_cursor({{ class_name }}, cursor))
+        rows = list(await self.db.scalars(statement))
+        return rows[:limit], page_cursor(rows, limit)
+    
+    async def create(self, {{ module_name }}_create: {{ class_name }}Create) -> {{ class_name }}:
+        db_{{ module_name }} = {{ class_name }}(**{{ module_name }}_create.model_dump())
+        self.db.add(db_{{ module_name }})
+        await self.db.commit()
+        await self.db.refresh(db_{{ module_name }})
+        return db_{{ module_name }}
+    
+    async def update(self, {{ module_name }}_id: int, {{ module_name }}_update: {{ class_name }}Update) -> Optional[{{ class_name }}]:
+        db_{{ module_name }} = await self._load({{ module_name }}_id)
+        if db_{{ module_name }}:
+            update_data = {{ module_name }}_update.model_dump(exclude_unset=True)
+            for field, value in update_data.items():
+                setattr(db_{{ module_name }}, field, value)
+            await self.db.commit()
+            await self.db.refresh(db_{{ module_name }})
+            {{ module_name }}_cache.delete({{ module_name }}_id)
+        return db_{{ module_name }}
+    
+    async def delete(self, {{ module_name }}_id: int) -> bool:
+        db_{{ module_name }} = await self._load({{ module_name }}_id)
+        if db_{{ module_name }}:
+            await self.db.delete(db_{{ module_name }})
+            await self.db.commit()
+            {{ module_name }}_cache.delete({{ module_name }}_id)
+            return True
+        return False
+""",
+
+    "router": """\
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from {{ schema_module }} import {{ class_name }}, {{ class_name }}Create, {{ class_name }}Page, {{ class_name }}Update
+from {{ service_module }} import {{ class_name }}Service
+from {{ repository_module }} import {{ class_name }}Repository
+from {{ database_module }} import get_db
+
+router = APIRouter()
+
+@router.post("/", response_model={{ class_name }})
+async def create_{{ module_name }}(
+    {{ module_name }}: {{ class_name }}Create, 
+    db: AsyncSession = Depends(get_db)
+):
+    {{ module_name }}_repo = {{ class_name }}Repository(db)
+    {{ module_name }}_service = {{ class_name }}Service({{ module_name }}_repo)
+    return await {{ module_name }}_service.create_{{ module_name }}({{ module_name }})
+
+@router.get("/{{{ module_name }}_id}", response_model={{ class_name }})
+async def read_{{ module_name }}(
+    {{ module_name }}_id: int, 
+    db: AsyncSession = Depends(get_db)
+):
+    {{ module_name }}_repo = {{ class_name }}Repository(db)
+    {{ module_name }}_service = {{ class_name }}Service({{ module_name }}_repo)
+    db_{{ module_name }} = await {{ module_name }}_service.get_{{ module_name }}({{ module_name }}_id)
+    if db_{{ module_name }} is None:
+        raise HTTPException(status_code=404, detail="{{ class_name }} not found")
+    return db_{{ module_name }}
+
+@router.get("/", response_model={{ class_name }}Page)
+async def read_{{ module_name }}s(
+    cursor: Optional[str] = None,
+    skip: Optional[int] = Query(None, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db)
+):
+    \"\"\"Keyset-пагинация: cursor - next_cursor предыдущей страницы; skip - offset-пагинация.\"\"\"
+    {{ module_name }}_repo = {{ class_name }}Repository(db)
+    {{ module_name }}_service = {{ class_name }}Service({{ module_name }}_repo)
+    if skip is not None:
+        return {"items": await {{ module_name }}_service.get_all_{{ module_name }}s(skip=skip, limit=limit)}
+    try:
+        items, next_cursor = await {{ module_name }}_service.get_{{ module_name }}s_page(cursor=cursor, limit=limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.put("/{{{ module_name }}_id}", response_model={{ class_name }})
+async def update_{{ module_name }}(
+    {{ module_name }}_id: int, 
+    {{ module_name }}: {{ class_name }}Update, 
+    db: AsyncSession = Depends(get_db)
+):
+    {{ module_name }}_repo = {{ class_name }}Repository(db)
+    {{ module_name }}_service = {{ class_name }}Service({{ module_name }}_repo)
+    return await {{ module_name }}_service.update_{{ module_name }}({{ module_name }}_id, {{ module_name }})
+
+@router.delete("/{{{ module_name }}_id}")
+async def delete_{{ module_name }}(
+    {{ module_name }}_id: int, 
+    db: AsyncSession = Depends(get_db)
+):
+    {{ module_name }}_repo = {{ class_name }}Repository(db)
+    {{ module_name }}_service = {{ class_name }}Service({{ module_name }}_repo)
+    success = await {{ module_name }}_service.delete_{{ module_name }}({{ module_name }}_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="{{ class_name }} not found")
+    return {"message": "{{ class_name }} deleted successfully"}
+""",
+
+    "database": """\
+import base64
+import json
+from datetime import datetime
+from typing import AsyncIterator
+from sqlalchemy import event, tuple_
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+from {{ config_module }} import settings
+
+""" + ENGINE_SETUP + KEYSET_PAGINATION + """\
+
+engine = create_async_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+# События соединений DBAPI регистрируются на синхронном движке под асинхронным
+if engine.dialect.name == "sqlite":
+    event.listen(engine.sync_engine, "connect", set_sqlite_pragmas)
+# expire_on_commit=False: после commit объекты читаются без неявного ленивого запроса
+AsyncSessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+Base = declarative_base()
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
+""",
+}
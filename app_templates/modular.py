@@ -2,19 +2,27 @@
 Шаблоны для Modular Architecture.
 """
 
+from .database import DATABASE_SETTINGS_FIELDS, ENGINE_SETUP, ENTITY_CACHE_MODULE, KEYSET_PAGINATION
+
 MODULAR_TEMPLATES = {
     "main": """\
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from app.database import engine, Base
+from {{ database_module }} import engine, Base
+{{ router_imports }}
 
-# Создание таблиц
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    # Создание таблиц - при старте приложения, а не при импорте модуля
+    Base.metadata.create_all(bind=engine)
+    yield
+    engine.dispose()
 
-app = FastAPI(title="{{ project_slug }}")
+app = FastAPI(title="{{ project_slug }}", lifespan=lifespan)
 
-# Импортируйте и подключите роутеры здесь
-# from app.routers import {{ module_name }}
-# app.include_router({{ module_name }}.router, prefix="/{{ module_name }}s", tags=["{{ module_name }}s"])
+# Роутеры сущностей
+{{ include_routers }}
 
 @app.get("/")
 def read_root():
@@ -22,12 +30,14 @@ def read_root():
 """,
 
     "model": """\
-from sqlalchemy import Column, Integer, String, DateTime
-from app.database import Base
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from {{ database_module }} import Base
 from datetime import datetime
 
 class {{ class_name }}(Base):
     __tablename__ = "{{ table_name }}"
+    # Keyset-пагинация идет по (created_at, id)
+    __table_args__ = (Index("ix_{{ table_name }}_created_at_id", "created_at", "id"),)
     
     id = Column(Integer, primary_key=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -40,7 +50,7 @@ class {{ class_name }}(Base):
     "schema": """\
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class {{ class_name }}Base(BaseModel):
     pass
@@ -58,97 +68,104 @@ class {{ class_name }}({{ class_name }}Base):
     
     class Config:
         from_attributes = True
+
+class {{ class_name }}Page(BaseModel):
+    items: List[{{ class_name }}]
+    # Курсор следующей страницы (None - страница последняя)
+    next_cursor: Optional[str] = None
 """,
 
     "router": """\
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
 
-from app import models, schemas
-from app.database import get_db
+import {{ schema_module }} as schemas
+from {{ crud_module }} import {{ class_name }}CRUD
+from {{ dependencies_module }} import get_{{ module_name }}_crud
 
 router = APIRouter()
 
 @router.post("/", response_model=schemas.{{ class_name }})
 def create_{{ module_name }}(
     {{ module_name }}: schemas.{{ class_name }}Create, 
-    db: Session = Depends(get_db)
+    crud: {{ class_name }}CRUD = Depends(get_{{ module_name }}_crud)
 ):
-    db_{{ module_name }} = models.{{ class_name }}(**{{ module_name }}.dict())
-    db.add(db_{{ module_name }})
-    db.commit()
-    db.refresh(db_{{ module_name }})
-    return db_{{ module_name }}
+    return crud.create({{ module_name }})
 
-@router.get("/{ {{ module_name }}_id}", response_model=schemas.{{ class_name }})
+@router.get("/{{{ module_name }}_id}", response_model=schemas.{{ class_name }})
 def read_{{ module_name }}(
     {{ module_name }}_id: int, 
-    db: Session = Depends(get_db)
+    crud: {{ class_name }}CRUD = Depends(get_{{ module_name }}_crud)
 ):
-    {{ module_name }} = db.query(models.{{ class_name }}).filter(
-        models.{{ class_name }}.id == {{ module_name }}_id
-    ).first()
+    {{ module_name }} = crud.get({{ module_name }}_id)
     if {{ module_name }} is None:
         raise HTTPException(status_code=404, detail="{{ class_name }} not found")
     return {{ module_name }}
 
-@router.get("/", response_model=List[schemas.{{ class_name }}])
+@router.get("/", response_model=schemas.{{ class_name }}Page)
 def read_{{ module_name }}s(
-    skip: int = 0, 
-    limit: int = 100, 
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    skip: Optional[int] = Query(None, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    crud: {{ class_name }}CRUD = Depends(get_{{ module_name }}_crud)
 ):
-    {{ module_name }}s = db.query(models.{{ class_name }}).offset(skip).limit(limit).all()
-    return {{ module_name }}s
+    \"\"\"Keyset-пагинация: cursor - next_cursor предыдущей страницы; skip - offset-пагинация.\"\"\"
+    if skip is not None:
+        return {"items": crud.get_all(skip=skip, limit=limit)}
+    try:
+        items, next_cursor = crud.get_page(cursor=cursor, limit=limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"items": items, "next_cursor": next_cursor}
 
-@router.put("/{ {{ module_name }}_id}", response_model=schemas.{{ class_name }})
+@router.put("/{{{ module_name }}_id}", response_model=schemas.{{ class_name }})
 def update_{{ module_name }}(
     {{ module_name }}_id: int, 
     {{ module_name }}: schemas.{{ class_name }}Update, 
-    db: Session = Depends(get_db)
+    crud: {{ class_name }}CRUD = Depends(get_{{ module_name }}_crud)
 ):
-    db_{{ module_name }} = db.query(models.{{ class_name }}).filter(
-        models.{{ class_name }}.id == {{ module_name }}_id
-    ).first()
+    db_{{ module_name }} = crud.update({{ module_name }}_id, {{ module_name }})
     if db_{{ module_name }} is None:
         raise HTTPException(status_code=404, detail="{{ class_name }} not found")
-    
-    update_data = {{ module_name }}.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_{{ module_name }}, field, value)
-    
-    db.commit()
-    db.refresh(db_{{ module_name }})
     return db_{{ module_name }}
 
-@router.delete("/{ {{ module_name }}_id}")
+@router.delete("/{{{ module_name }}_id}")
 def delete_{{ module_name }}(
     {{ module_name }}_id: int, 
-    db: Session = Depends(get_db)
+    crud: {{ class_name }}CRUD = Depends(get_{{ module_name }}_crud)
 ):
-    db_{{ module_name }} = db.query(models.{{ class_name }}).filter(
-        models.{{ class_name }}.id == {{ module_name }}_id
-    ).first()
-    if db_{{ module_name }} is None:
+    if not crud.delete({{ module_name }}_id):
         raise HTTPException(status_code=404, detail="{{ class_name }} not found")
-    
-    db.delete(db_{{ module_name }})
-    db.commit()
     return {"message": "{{ class_name }} deleted successfully"}
 """,
 
     "database": """\
-from sqlalchemy import create_engine
+import base64
+import json
+from datetime import datetime
+from typing import Literal
+from pydantic_settings import BaseSettings
+from sqlalchemy import create_engine, event, tuple_
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./{{ project_slug }}.db"
+class DatabaseSettings(BaseSettings):
+    DATABASE_URL: str = "sqlite:///./{{ project_slug }}.db"
+""" + DATABASE_SETTINGS_FIELDS + """\
+
+settings = DatabaseSettings()
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+
+""" + ENGINE_SETUP + KEYSET_PAGINATION + """\
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}
+    connect_args={"check_same_thread": False} if "sqlite" in SQLALCHEMY_DATABASE_URL else {},
+    **engine_options(SQLALCHEMY_DATABASE_URL),
 )
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", set_sqlite_pragmas)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -160,10 +177,15 @@ def get_db():
         db.close()
 """,
 
+    # Модуль кэша сущностей: только для проектов с cache у какой-либо сущности
+    "entity_cache": ENTITY_CACHE_MODULE,
+
     "crud": """\
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from app import models, schemas
+from typing import List, Optional, Tuple
+import {{ model_module }} as models
+import {{ schema_module }} as schemas
+from {{ database_module }} import after_cursor, keyset_order, page_cursor
 
 class {{ class_name }}CRUD:
     def __init__(self, db: Session):
@@ -175,7 +197,14 @@ class {{ class_name }}CRUD:
         ).first()
     
     def get_all(self, skip: int = 0, limit: int = 100) -> List[models.{{ class_name }}]:
-        return self.db.query(models.{{ class_name }}).offset(skip).limit(limit).all()
+        return self.db.query(models.{{ class_name }}).order_by(models.{{ class_name }}.id).offset(skip).limit(limit).all()
+    
+    def get_page(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[models.{{ class_name }}], Optional[str]]:
+        query = self.db.query(models.{{ class_name }}).order_by(*keyset_order(models.{{ class_name }}))
+        if cursor:
+            query = query.filter(after_cursor(models.{{ class_name }}, cursor))
+        rows = query.limit(limit + 1).all()
+        return rows[:limit], page_cursor(rows, limit)
     
     def create(self, {{ module_name }}: schemas.{{ class_name }}Create) -> models.{{ class_name }}:
         db_{{ module_name }} = models.{{ class_name }}(**{{ module_name }}.dict())
@@ -203,11 +232,359 @@ class {{ class_name }}CRUD:
         return False
 """,
 
+    "cached_crud": """\
+from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+import {{ model_module }} as models
+import {{ schema_module }} as schemas
+from {{ database_module }} import after_cursor, keyset_order, page_cursor
+from {{ entity_cache_module }} import EntityCache, cached_row
+
+# Read-through кэш get: cache сущности в схеме
+{{ module_name }}_cache = EntityCache("{{ table_name }}", ttl={{ cache_ttl }}, max_size={{ cache_max_size }})
+
+class {{ class_name }}CRUD:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get(self, {{ module_name }}_id: int) -> Optional[models.{{ class_name }}]:
+        cached = {{ module_name }}_cache.get({{ module_name }}_id)
+        if cached is not None:
+            # Отсоединенная копия только для чтения: изменения идут через _load
+            return models.{{ class_name }}(**cached)
+        db_{{ module_name }} = self._load({{ module_name }}_id)
+        if db_{{ module_name }}:
+            {{ module_name }}_cache.set({{ module_name }}_id, cached_row(db_{{ module_name }}))
+        return db_{{ module_name }}
+    
+    def _load(self, {{ module_name }}_id: int) -> Optional[models.{{ class_name }}]:
+        return self.db.query(models.{{ class_name }}).filter(
+            models.{{ class_name }}.id == {{ module_name }}_id
+        ).first()
+    
+    def get_all(self, skip: int = 0, limit: int = 100) -> List[models.{{ class_name }}]:
+        return self.db.query(models.{{ class_name }}).order_by(models.{{ class_name }}.id).offset(skip).limit(limit).all()
+    
+    def get_page(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[models.{{ class_name }}], Optional[str]]:
+        query = self.db.query(models.{{ class_name }}).order_by(*keyset_order(models.{{ class_name }}))
+        if cursor:
+            query = query.filter(after_cursor(models.{{ class_name }}, cursor))
+        rows = query.limit(limit + 1).all()
+        return rows[:limit], page_cursor(rows, limit)
+    
+    def create(self, {{ module_name }}: schemas.{{ class_name }}Create) -> models.{{ class_name }}:
+        db_{{ module_name }} = models.{{ class_name }}(**{{ module_name }}.dict())
+        self.db.add(db_{{ module_name }})
+        self.db.commit()
+        self.db.refresh(db_{{ module_name }})
+        return db_{{ module_name }}
+    
+    def update(self, {{ module_name }}_id: int, {{ module_name }}: schemas.{{ class_name }}Update) -> Optional[models.{{ class_name }}]:
+        db_{{ module_name }} = self._load({{ module_name }}_id)
+        if db_{{ module_name }}:
+            update_data = {{ module_name }}.dict(exclude_unset=True)
+            for field, value in update_data.items():
+                setattr(db_{{ module_name }}, field, value)
+            self.db.commit()
+            self.db.refresh(db_{{ module_name }})
+            {{ module_name }}_cache.delete({{ module_name }}_id)
+        return db_{{ module_name }}
+    
+    def delete(self, {{ module_name }}_id: int) -> bool:
+        db_{{ module_name }} = self._load({{ module_name }}_id)
+        if db_{{ module_name }}:
+            self.db.delete(db_{{ module_name }})
+            self.db.commit()
+            {{ module_name }}_cache.delete({{ module_name }}_id)
+            return True
+        return False
+""",
+
     "dependencies": """\
-from app.database import get_db
-from app.crud.{{ module_name }} import {{ class_name }}CRUD
+from fastapi import Depends
+from {{ database_module }} import get_db
+{{ crud_imports }}
 
+{{ crud_providers }}"""
+}
+
+# Строки на каждую сущность: подключение роутеров в main и зависимости CRUD
+MODULAR_BLOCKS = {
+    "router_imports": "from {{ router_module }} import router as {{ module_name }}_router",
+    "include_routers": 'app.include_router({{ module_name }}_router, prefix="/{{ module_name }}s", '
+                       'tags=["{{ module_name }}s"])',
+    "crud_imports": "from {{ crud_module }} import {{ class_name }}CRUD",
+    "crud_providers": """\
 def get_{{ module_name }}_crud(db = Depends(get_db)):
     return {{ class_name }}CRUD(db)
-"""
+""",
+}
+
+# Асинхронный режим БД (--async-db, metadata.async): AsyncSession, async CRUD,
+# зависимости и роуты; остальные шаблоны общие с синхронным режимом
+MODULAR_ASYNC_TEMPLATES = {
+    **MODULAR_TEMPLATES,
+
+    "main": """\
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from {{ database_module }} import engine, Base
+{{ router_imports }}
+
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    # Создание таблиц
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield
+    await engine.dispose()
+
+app = FastAPI(title="{{ project_slug }}", lifespan=lifespan)
+
+# Роутеры сущностей
+{{ include_routers }}
+
+@app.get("/")
+async def read_root():
+    return {"message": "Welcome to FastAPI with Modular Architecture!"}
+""",
+
+    "router": """\
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+
+import {{ schema_module }} as schemas
+from {{ crud_module }} import {{ class_name }}CRUD
+from {{ dependencies_module }} import get_{{ module_name }}_crud
+
+router = APIRouter()
+
+@router.post("/", response_model=schemas.{{ class_name }})
+async def create_{{ module_name }}(
+    {{ module_name }}: schemas.{{ class_name }}Create, 
+    crud: {{ class_name }}CRUD = Depends(get_{{ module_name }}_crud)
+):
+    return await crud.create({{ module_name }})
+
+@router.get("/{{{ module_name }}_id}", response_model=schemas.{{ class_name }})
+async def read_{{ module_name }}(
+    {{ module_name }}_id: int, 
+    crud: {{ class_name }}CRUD = Depends(get_{{ module_name }}_crud)
+):
+    {{ module_name }} = await crud.get({{ module_name }}_id)
+    if {{ module_name }} is None:
+        raise HTTPException(status_code=404, detail="{{ class_name }} not found")
+    return {{ module_name }}
+
+@router.get("/", response_model=schemas.{{ class_name }}Page)
+async def read_{{ module_name }}s(
+    cursor: Optional[str] = None,
+    skip: Optional[int] = Query(None, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    crud: {{ class_name }}CRUD = Depends(get_{{ module_name }}_crud)
+):
+    \"\"\"Keyset-пагинация: cursor - next_cursor предыдущей страницы; skip - offset-пагинация.\"\"\"
+    if skip is not None:
+        return {"items": await crud.get_all(skip=skip, limit=limit)}
+    try:
+        items, next_cursor = await crud.get_page(cursor=cursor, limit=limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.put("/{{{ module_name }}_id}", response_model=schemas.{{ class_name }})
+async def update_{{ module_name }}(
+    {{ module_name }}_id: int, 
+    {{ module_name }}: schemas.{{ class_name }}Update, 
+    crud: {{ class_name }}CRUD = Depends(get_{{ module_name }}_crud)
+):
+    db_{{ module_name }} = await crud.update({{ module_name }}_id, {{ module_name }})
+    if db_{{ module_name }} is None:
+        raise HTTPException(status_code=404, detail="{{ class_name }} not found")
+    return db_{{ module_name }}
+
+@router.delete("/{{{ module_name }}_id}")
+async def delete_{{ module_name }}(
+    {{ module_name }}_id: int, 
+    crud: {{ class_name }}CRUD = Depends(get_{{ module_name }}_crud)
+):
+    if not await crud.delete({{ module_name }}_id):
+        raise HTTPException(status_code=404, detail="{{ class_name }} not found")
+    return {"message": "{{ class_name }} deleted successfully"}
+""",
+
+    "database": """\
+import base64
+import json
+from datetime import datetime
+from typing import AsyncIterator, Literal
+from pydantic_settings import BaseSettings
+from sqlalchemy import event, tuple_
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+
+class DatabaseSettings(BaseSettings):
+    DATABASE_URL: str = "sqlite+aiosqlite:///./{{ project_slug }}.db"
+""" + DATABASE_SETTINGS_FIELDS + """\
+
+settings = DatabaseSettings()
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+
+""" + ENGINE_SETUP + KEYSET_PAGINATION + """\
+
+engine = create_async_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL))
+# События соединений DBAPI регистрируются на синхронном движке под асинхронным
+if engine.dialect.name == "sqlite":
+    event.listen(engine.sync_engine, "connect", set_sqlite_pragmas)
+# expire_on_commit=False: после commit объекты читаются без неявного ленивого запроса
+AsyncSessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+Base = declarative_base()
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
+""",
+
+    "crud": """\
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
+import {{ model_module }} as models
+import {{ schema_module }} as schemas
+from {{ database_module }} import after_cursor, keyset_order, page_cursor
+
+class {{ class_name }}CRUD:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get(self, {{ module_name }}_id: int) -> Optional[models.{{ class_name }}]:
+        return await self.db.get(models.{{ class_name }}, {{ module_name }}_id)
+    
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[models.{{ class_name }}]:
+        result = await self.db.scalars(
+            select(models.{{ class_name }}).order_by(models.{{ class_name }}.id).offset(skip).limit(limit)
+        )
+        return list(result)
+    
+    async def get_page(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[models.{{ class_name }}], Optional[str]]:
+        statement = select(models.{{ class_name }}).order_by(*keyset_order(models.{{ class_name }})).limit(limit + 1)
+        if cursor:
+            statement = statement.where(after_cursor(models.{{ class_name }}, cursor))
+        rows = list(await self.db.scalars(statement))
+        return rows[:limit], page_cursor(rows, limit)
+    
+    async def create(self, {{ module_name }}: schemas.{{ class_name }}Create) -> models.{{ class_name }}:
+        db_{{ module_name }} = models.{{ class_name }}(**{{ module_name }}.model_dump())
+        self.db.add(db_{{ module_name }})
+        await self.db.commit()
+        await self.db.refresh(db_{{ module_name }})
+        return db_{{ module_name }}
+    
+    async def update(self, {{ module_name }}_id: int, {{ module_name }}: schemas.{{ class_name }}Update) -> Optional[models.{{ class_name }}]:
+        db_{{ module_name }} = await self.get({{ module_name }}_id)
+        if db_{{ module_name }}:
+            update_data = {{ module_name }}.model_dump(exclude_unset=True)
+            for field, value in update_data.items():
+                setattr(db_{{ module_name }}, field, value)
+            await self.db.commit()
+            await self.db.refresh(db_{{ module_name }})
+        return db_{{ module_name }}
+    
+    async def delete(self, {{ module_name }}_id: int) -> bool:
+        db_{{ module_name }} = await self.get({{ module_name }}_id)
+        if db_{{ module_name }}:
+            await self.db.delete(db_{{ module_name }})
+            await self.db.commit()
+            return True
+        return False
+""",
+
+    "cached_crud": """\
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
+import {{ model_module }} as models
+import {{ schema_module }} as schemas
+from {{ database_module }} import after_cursor, keyset_order, page_cursor
+from {{ entity_cache_module }} import EntityCache, cached_row
+
+# Read-through кэш get: cache сущности в схеме
+{{ module_name }}_cache = EntityCache("{{ table_name }}", ttl={{ cache_ttl }}, max_size={{ cache_max_size }})
+
+class {{ class_name }}CRUD:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get(self, {{ module_name }}_id: int) -> Optional[models.{{ class_name }}]:
+        cached = {{ module_name }}_cache.get({{ module_name }}_id)
+        if cached is not None:
+            # Отсоединенная копия только для чтения: изменения идут через _load
+            return models.{{ class_name }}(**cached)
+        db_{{ module_name }} = await self._load({{ module_name }}_id)
+        if db_{{ module_name }}:
+            {{ module_name }}_cache.set({{ module_name }}_id, cached_row(db_{{ module_name }}))
+        return db_{{ module_name }}
+    
+    async def _load(self, {{ module_name }}_id: int) -> Optional[models.{{ class_name }}]:
+        return await self.db.get(models.{{ class_name }}, {{ module_name }}_id)
+    
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[models.{{ class_name }}]:
+        result = await self.db.scalars(
+            select(models.{{ class_name }}).order_by(models.{{ class_name }}.id).offset(skip).limit(limit)
+        )
+        return list(result)
+    
+    async def get_page(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[models.{{ class_name }}], Optional[str]]:
+        statement = select(models.{{ class_name }}).order_by(*keyset_order(models.{{ class_name }})).limit(limit + 1)
+        if cursor:
+            statement = statement.where(after_cursor(models.{{ class_name }}, cursor))
+        rows = list(await self.db.scalars(statement))
+        return rows[:limit], page_cursor(rows, limit)
+    
+    async def create(self, {{ module_name }}: schemas.{{ class_name }}Create) -> models.{{ class_name }}:
+        db_{{ module_name }} = models.{{ class_name }}(**{{ module_name }}.model_dump())
+        self.db.add(db_{{ module_name }})
+        await self.db.commit()
+        await self.db.refresh(db_{{ module_name }})
+        return db_{{ module_name }}
+    
+    async def update(self, {{ module_name }}_id: int, {{ module_name }}: schemas.{{ class_name }}Update) -> Optional[models.{{ class_name }}]:
+        db_{{ module_name }} = await self._load({{ module_name }}_id)
+        if db_{{ module_name }}:
+            update_data = {{ module_name }}.model_dump(exclude_unset=True)
+            for field, value in update_data.items():
+                setattr(db_{{ module_name }}, field, value)
+            await self.db.commit()
+            await self.db.refresh(db_{{ module_name }})
+            {{ module_name }}_cache.delete({{ module_name }}_id)
+        return db_{{ module_name }}
+    
+    async def delete(self, {{ module_name }}_id: int) -> bool:
+        db_{{ module_name }} = await self._load({{ module_name }}_id)
+        if db_{{ module_name }}:
+            await self.db.delete(db_{{ module_name }})
+            await self.db.commit()
+            {{ module_name }}_cache.delete({{ module_name }}_id)
+            return True
+        return False
+""",
+
+    "dependencies": """\
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from {{ database_module }} import get_db
+{{ crud_imports }}
+
+# async def: зависимости выполняются в цикле событий, без пула потоков
+{{ crud_providers }}""",
+}
+
+MODULAR_ASYNC_BLOCKS = {
+    **MODULAR_BLOCKS,
+    "crud_providers": """\
+async def get_{{ module_name }}_crud(db: AsyncSession = Depends(get_db)):
+    return {{ class_name }}CRUD(db)
+""",
 }
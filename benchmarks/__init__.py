@@ -0,0 +1,3 @@
+"""
+Бенчмарки генератора FastAPI-проектов.
+"""
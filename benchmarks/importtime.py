@@ -0,0 +1,103 @@
+"""
+Проверка бюджета времени импорта CLI.
+
+Запускает `python -X importtime main.py --help` несколько раз, берет
+лучший результат и завершается с ошибкой, если суммарное время импорта
+превышает бюджет или загружен запрещенный модуль. Модули, которые
+интерпретатор загружает при старте (site, encodings), в бюджет не входят.
+Бюджет задается в pyproject.toml:
+
+    [tool.fastapi-generator.importtime]
+    budget-ms = 50
+    forbidden = ["yaml"]
+
+Запуск: python -m benchmarks.importtime [--budget-ms 50] [--runs 5] [-- args...]
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+import tomllib
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# import time: self [us] | cumulative | imported package
+IMPORTTIME_PATTERN = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)')
+
+
+def load_config() -> Dict:
+    with open(ROOT / 'pyproject.toml', 'rb') as f:
+        data = tomllib.load(f)
+    return data.get('tool', {}).get('fastapi-generator', {}).get('importtime', {})
+
+
+def measure(command: List[str], exclude: Set[str] = frozenset()) -> Tuple[int, Dict[str, int], Set[str]]:
+    """
+    Возвращает суммарное время импорта в мкс, накопленное время модулей
+    верхнего уровня и множество всех загруженных модулей (без exclude).
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', *command],
+        capture_output=True, text=True, cwd=ROOT,
+    )
+    modules: Dict[str, int] = {}
+    imported: Set[str] = set()
+    total = 0
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        if module in exclude:
+            continue
+        total += int(self_us)
+        imported.add(module)
+        # Модули без отступа - импорты верхнего уровня, их cumulative включает вложенные
+        if len(indent) == 1:
+            modules[module] = int(cumulative_us)
+    return total, modules, imported
+
+
+def main():
+    config = load_config()
+    parser = argparse.ArgumentParser(description="Проверка бюджета времени импорта CLI.")
+    parser.add_argument('--budget-ms', type=float, default=config.get('budget-ms', 50.0),
+                        help='Бюджет суммарного времени импорта, мс')
+    parser.add_argument('--runs', type=int, default=5, help='Количество запусков (берется лучший)')
+    parser.add_argument('--top', type=int, default=10, help='Сколько самых дорогих импортов показать')
+    parser.add_argument('cli_args', nargs='*', default=['--help'],
+                        help='Аргументы main.py (по умолчанию --help)')
+    args = parser.parse_args()
+    forbidden = config.get('forbidden', [])
+
+    startup = measure(['-c', 'pass'])[2]
+    command = [str(ROOT / 'main.py'), *args.cli_args]
+    best_total, best_modules, imported = min(
+        (measure(command, startup) for _ in range(args.runs)),
+        key=lambda measurement: measurement[0],
+    )
+
+    print(f"⏱️  main.py {' '.join(args.cli_args)}: импорт {best_total / 1000:.1f} мс "
+          f"(лучший из {args.runs}), бюджет {args.budget_ms:.1f} мс")
+    for module, cumulative in sorted(best_modules.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"   {cumulative / 1000:8.1f} мс  {module}")
+
+    failures = []
+    if best_total / 1000 > args.budget_ms:
+        failures.append(f"превышен бюджет: {best_total / 1000:.1f} мс > {args.budget_ms:.1f} мс")
+    for module in forbidden:
+        if module in imported:
+            failures.append(f"загружен запрещенный модуль: {module}")
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        raise SystemExit(1)
+    print("✅ Бюджет импорта соблюден")
+
+
+if __name__ == '__main__':
+    main()
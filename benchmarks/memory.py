@@ -0,0 +1,130 @@
+"""
+Память и скорость представления ProjectFile на очень больших схемах.
+
+Сравнивает исходный ProjectFile (обычный dataclass с __dict__, производные
+поля - свойства) с текущим (slots, frozen, производные строки тоже
+вычисляются при обращении). Замеряются байты на запись по tracemalloc
+(вместе со строками путей и имен классов) и время создания записей и
+обращений к производным полям, как их читают генераторы (контекст
+рендеринга, пути тестов, статистика).
+
+Запуск: python -m benchmarks.memory [--files 1000000] [--architecture layered] [--passes 3]
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List
+
+from fastapi_generator.core.models import ProjectFile
+from .synthetic import ARCHITECTURES, iter_schema_files
+
+# Типы файлов по слоям, как их определяют парсеры
+FILE_TYPES = ('model', 'schema', 'repository', 'service', 'router')
+
+
+@dataclass
+class BaselineProjectFile:
+    """Исходный ProjectFile: __dict__ на каждый объект, производные поля пересчитываются."""
+    path: str
+    class_name: str
+    file_type: str = "default"
+    template: str = "default"
+    content: str = ""
+
+    @property
+    def normalized_path(self) -> str:
+        return self.path.replace('\\', '/')
+
+    @property
+    def module_name(self) -> str:
+        return self.class_name.lower()
+
+    @property
+    def table_name(self) -> str:
+        return f"{self.module_name}s"
+
+    @property
+    def filename(self) -> str:
+        return Path(self.path).name
+
+
+def _build(factory: Callable, architecture: str, count: int) -> List:
+    return [
+        factory(path=path, class_name=class_name, file_type=FILE_TYPES[index % len(FILE_TYPES)],
+                template=FILE_TYPES[index % len(FILE_TYPES)])
+        for index, (path, class_name) in enumerate(iter_schema_files(architecture, count))
+    ]
+
+
+def _measure_memory(factory: Callable, architecture: str, count: int) -> tuple[List, int]:
+    """Строит список записей и возвращает его вместе с занятой памятью (включая строки схемы)."""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    files = _build(factory, architecture, count)
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return files, used
+
+
+def _schema_strings(architecture: str, count: int) -> int:
+    """Память строк путей и имен классов, общих для обоих представлений."""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    pairs = list(iter_schema_files(architecture, count))
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del pairs
+    return used
+
+
+def _read_derived(files: List, passes: int) -> float:
+    """Время чтения производных полей всех записей passes раз."""
+    started = time.perf_counter()
+    for _ in range(passes):
+        for project_file in files:
+            project_file.normalized_path
+            project_file.module_name
+            project_file.table_name
+            project_file.filename
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк памяти ProjectFile.")
+    parser.add_argument('--files', type=int, default=1_000_000, help='Количество записей схемы')
+    parser.add_argument('--architecture', default='layered', choices=ARCHITECTURES)
+    parser.add_argument('--passes', type=int, default=3,
+                        help='Сколько раз генераторы читают производные поля каждой записи')
+    args = parser.parse_args()
+
+    strings = _schema_strings(args.architecture, args.files)
+    print(f"Записей: {args.files:,}, архитектура: {args.architecture}, "
+          f"строки путей и имен классов: {strings / args.files:.0f} Б/запись (в обоих вариантах)")
+
+    results = {}
+    for label, factory in (('baseline', BaselineProjectFile), ('slots', ProjectFile)):
+        files, used = _measure_memory(factory, args.architecture, args.files)
+        sample = min(args.files, 100_000)
+        build_started = time.perf_counter()
+        _build(factory, args.architecture, sample)
+        build_time = (time.perf_counter() - build_started) / sample * args.files
+        read_time = _read_derived(files, args.passes)
+        results[label] = (used, read_time, build_time)
+        print(f"{label:<8} записи {used / 1e6:7.1f} МБ ({used / args.files:4.0f} Б/файл)  "
+              f"создание {build_time:6.2f} с  чтение полей x{args.passes} {read_time:6.2f} с")
+        del files
+        gc.collect()
+
+    baseline, current = results['baseline'], results['slots']
+    print(f"Относительно исходного ProjectFile: записи {(current[0] / baseline[0] - 1) * 100:+.1f}% памяти, "
+          f"чтение полей x{baseline[1] / current[1]:.1f} быстрее, "
+          f"создание + чтение: {baseline[1] + baseline[2]:.2f} с -> {current[1] + current[2]:.2f} с")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Сравнение режимов разбора YAML/JSON-схем на больших синтетических схемах.
+
+Запуск: python -m benchmarks.parsers [--sizes 1000 10000] [--architecture layered]
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import yaml
+
+from fastapi_generator.parsers import json_parser, yaml_parser
+from .synthetic import write_schema
+
+
+def _measure(parse, path: Path):
+    """Возвращает (секунды, пик памяти в байтах, количество файлов)."""
+    # Время и память меряются отдельными прогонами: tracemalloc сильно замедляет код
+    started = time.perf_counter()
+    schema = parse(path)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    parse(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, len(schema.files)
+
+
+def _yaml_modes():
+    modes = {}
+    if yaml_parser.SafeLoader is not yaml.SafeLoader:
+        # Чистый Python-загрузчик для сравнения с libyaml
+        def parse_pure_python(path):
+            loader = yaml_parser.SafeLoader
+            yaml_parser.SafeLoader = yaml.SafeLoader
+            try:
+                return yaml_parser.YamlParser().parse(path)
+            finally:
+                yaml_parser.SafeLoader = loader
+        modes['load (pure Python)'] = parse_pure_python
+    modes[f"load ({yaml_parser.SafeLoader.__name__})"] = yaml_parser.YamlParser().parse
+    modes[f"stream ({yaml_parser.SafeLoader.__name__})"] = yaml_parser.YamlParser(stream=True).parse
+    return modes
+
+
+def _json_modes():
+    return {
+        'load': json_parser.JsonParser().parse,
+        'stream': json_parser.JsonParser(stream=True).parse,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк режимов разбора схем.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='Количество файлов в синтетических схемах')
+    parser.add_argument('--architecture', default='layered', choices=['layered', 'clean', 'modular'])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        for schema_format, modes in (('yaml', _yaml_modes()), ('json', _json_modes())):
+            for size in args.sizes:
+                path = write_schema(directory, args.architecture, schema_format, size)
+                print(f"\n{schema_format.upper()}, {size} файлов ({path.stat().st_size / 1e6:.1f} МБ):")
+                results = []
+                for name, parse in modes.items():
+                    elapsed, peak, count = _measure(parse, path)
+                    results.append(count)
+                    print(f"   {name:<28} {elapsed:8.3f} с   пик памяти {peak / 1e6:8.1f} МБ")
+                assert len(set(results)) == 1, f"Режимы вернули разное число файлов: {results}"
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Сравнение скорости рендеринга: цепочка str.replace против скомпилированных шаблонов.
+
+Запуск: python -m benchmarks.render [--files N] [--repeat R]
+"""
+
+import argparse
+import time
+
+from app_templates import TEMPLATES
+from fastapi_generator.core.models import ProjectFile
+from fastapi_generator.core.template_engine import compile_template
+
+
+def render_legacy(template: str, project_file: ProjectFile) -> str:
+    """Прежний рендеринг FileGenerator через цепочку str.replace."""
+    return template.replace('{{ class_name }}', project_file.class_name)\
+                   .replace('{{ module_name }}', project_file.module_name)\
+                   .replace('{{ table_name }}', project_file.table_name)\
+                   .replace('{{ file_path }}', project_file.normalized_path)
+
+
+def render_compiled(template: str, project_file: ProjectFile) -> str:
+    """Рендеринг через скомпилированный шаблон."""
+    return compile_template(template).render({
+        'class_name': project_file.class_name,
+        'module_name': project_file.module_name,
+        'table_name': project_file.table_name,
+        'file_path': project_file.normalized_path,
+    })
+
+
+def _make_files(count: int) -> list[ProjectFile]:
+    return [ProjectFile(path=f"app/models/entity{i}.py", class_name=f"Entity{i}") for i in range(count)]
+
+
+def _measure(render, templates: list[str], files: list[ProjectFile], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for project_file in files:
+            for template in templates:
+                render(template, project_file)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк рендеринга шаблонов.")
+    parser.add_argument('--files', type=int, default=1000, help='Количество файлов-сущностей')
+    parser.add_argument('--repeat', type=int, default=5, help='Количество повторов (берется лучший)')
+    args = parser.parse_args()
+
+    templates = [source for registry in TEMPLATES.values() for source in registry.values()]
+    files = _make_files(args.files)
+
+    # Результаты обоих путей должны совпадать байт в байт
+    for project_file in files[:10]:
+        for template in templates:
+            assert render_legacy(template, project_file) == render_compiled(template, project_file)
+
+    renders = len(templates) * len(files)
+    legacy = _measure(render_legacy, templates, files, args.repeat)
+    compiled = _measure(render_compiled, templates, files, args.repeat)
+
+    print(f"Шаблонов: {len(templates)}, файлов: {len(files)}, рендеров: {renders}")
+    print(f"str.replace: {legacy:.3f} с ({renders / legacy:,.0f} рендеров/с)")
+    print(f"compiled:    {compiled:.3f} с ({renders / compiled:,.0f} рендеров/с)")
+    print(f"Ускорение:   x{legacy / compiled:.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+"""
+Набор бенчмарков генератора по фазам на синтетических схемах.
+
+Для каждой архитектуры, формата схемы и размера отдельно замеряются фазы:
+
+    parse             SchemaParser.parse_file
+    create_structure  ProjectGenerator.create_structure (включая config_generate)
+    config_generate   запись конфигов ConfigGenerator (фаза configs внутри create_structure)
+    test_generate     TestGenerator.generate
+    zip_directory     zip_directory
+
+Запуск:
+    python -m benchmarks.suite run [--sizes 10 1000] [--output results.json]
+    python -m benchmarks.suite compare old.json new.json [--threshold 10]
+"""
+
+import argparse
+import io
+import json
+import platform
+import subprocess
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from app_templates import ENTITY_BLOCKS, TEMPLATES
+from fastapi_generator.core.classifier import get_classifier
+from fastapi_generator.generators import ProjectGenerator, TestGenerator
+from fastapi_generator.parsers import SchemaParser
+from fastapi_generator.utils.file_utils import project_slug, zip_directory
+from fastapi_generator.utils.profiling import PhaseProfiler
+from fastapi_generator.utils.sinks import FileSystemSink
+from .synthetic import ARCHITECTURES, FORMATS, write_schema
+
+DEFAULT_SIZES = (10, 1000, 10000, 100000)
+PHASES = ('parse', 'create_structure', 'config_generate', 'test_generate', 'zip_directory')
+RESULTS_VERSION = 1
+
+
+def run_case(schema_path: Path, work_dir: Path) -> Tuple[Dict[str, float], int, int]:
+    """Один прогон всех фаз; возвращает (время фаз, файлов записано, байт записано)."""
+    timings: Dict[str, float] = {}
+    project_root = work_dir / 'project'
+
+    # Генераторы печатают прогресс по каждому файлу - в замер это не входит
+    with redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        project_schema = SchemaParser().parse_file(schema_path)
+        timings['parse'] = time.perf_counter() - started
+
+        sink = FileSystemSink()
+        # Время конфигов берется из фазы configs, о которой сообщают хуки генераторов
+        profiler = PhaseProfiler(trace_memory=False)
+        classifier = get_classifier(project_schema.architecture, project_schema.file_types)
+        project_gen = ProjectGenerator(project_schema.architecture, TEMPLATES, sink, profiler,
+                                       classifier=classifier, blocks=ENTITY_BLOCKS,
+                                       project_context={'project_slug': project_slug(project_root)})
+        started = time.perf_counter()
+        project_gen.create_structure(project_schema.files, project_root)
+        timings['create_structure'] = time.perf_counter() - started
+        timings['config_generate'] = profiler.phases['configs'].wall_time
+
+        started = time.perf_counter()
+        file_gen = project_gen.file_generator
+        TestGenerator(project_schema.architecture, sink, classifier=classifier, layout=file_gen.layout,
+                      cached_entities=file_gen.entity_contexts).generate(project_root, project_schema.files)
+        timings['test_generate'] = time.perf_counter() - started
+
+        errors = sink.close()
+        if errors:
+            raise RuntimeError(f"Ошибки записи: {errors[:3]}")
+
+        started = time.perf_counter()
+        zip_directory(project_root, work_dir / 'project.zip')
+        timings['zip_directory'] = time.perf_counter() - started
+
+    return timings, sink.files_written, sink.bytes_written
+
+
+def run_suite(architectures, formats, sizes, repeat: int) -> List[Dict]:
+    """Прогоняет все сочетания; для каждой фазы берется лучшее время из repeat прогонов."""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        for architecture in architectures:
+            for schema_format in formats:
+                for size in sizes:
+                    schema_path = write_schema(tmp_dir / 'schemas', architecture, schema_format, size)
+                    best: Dict[str, float] = {}
+                    for _ in range(repeat):
+                        with tempfile.TemporaryDirectory(dir=tmp_dir) as work:
+                            timings, files_written, bytes_written = run_case(schema_path, Path(work))
+                        for phase, seconds in timings.items():
+                            best[phase] = min(seconds, best.get(phase, seconds))
+                    schema_path.unlink()
+
+                    result = {
+                        'architecture': architecture,
+                        'format': schema_format,
+                        'size': size,
+                        'files_written': files_written,
+                        'bytes_written': bytes_written,
+                        'phases': {phase: round(best[phase], 6) for phase in PHASES},
+                    }
+                    results.append(result)
+                    phases = '  '.join(f"{phase} {best[phase]:.3f}" for phase in PHASES)
+                    print(f"   {architecture:<8} {schema_format:<5} {size:>7}  {phases}")
+    return results
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                   text=True, cwd=Path(__file__).resolve().parent, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+
+def command_run(args) -> None:
+    print(f"⏱️  Бенчмарк: архитектуры {', '.join(args.architectures)}, форматы {', '.join(args.formats)}, "
+          f"размеры {', '.join(map(str, args.sizes))}")
+    results = run_suite(args.architectures, args.formats, args.sizes, args.repeat)
+    report = {
+        'version': RESULTS_VERSION,
+        'meta': {
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+    output = Path(args.output)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"💾 Результаты: {output}")
+
+
+def _load_results(path: Path) -> Dict[Tuple[str, str, int], Dict[str, float]]:
+    try:
+        report = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"❌ Ошибка чтения результатов {path}: {e}")
+    if report.get('version') != RESULTS_VERSION:
+        raise SystemExit(f"❌ Неподдерживаемая версия результатов в {path}: {report.get('version')}")
+    return {(result['architecture'], result['format'], result['size']): result['phases']
+            for result in report['results']}
+
+
+def command_compare(args) -> None:
+    old = _load_results(Path(args.old))
+    new = _load_results(Path(args.new))
+    regressions = 0
+
+    print(f"{'случай':<26} {'фаза':<17} {'было, с':>10} {'стало, с':>10} {'изм.':>8}")
+    for key in sorted(old.keys() & new.keys()):
+        architecture, schema_format, size = key
+        case = f"{architecture}/{schema_format}/{size}"
+        for phase in PHASES:
+            if phase not in old[key] or phase not in new[key]:
+                continue
+            before, after = old[key][phase], new[key][phase]
+            change = (after - before) / before * 100 if before else 0.0
+            # Короткие фазы шумят - регрессией считаем только заметное абсолютное время
+            regression = change > args.threshold and after - before > args.min_seconds
+            regressions += regression
+            mark = ' ❌' if regression else ''
+            print(f"{case:<26} {phase:<17} {before:>10.4f} {after:>10.4f} {change:>+7.1f}%{mark}")
+
+    for key in sorted(old.keys() ^ new.keys()):
+        side = args.old if key in old else args.new
+        print(f"ℹ️  {'/'.join(map(str, key))} есть только в {side}")
+
+    if regressions:
+        print(f"\n❌ Регрессий (> {args.threshold:.0f}%): {regressions}")
+        if args.fail_on_regression:
+            raise SystemExit(1)
+    else:
+        print(f"\n✅ Регрессий нет (порог {args.threshold:.0f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк фаз генератора на синтетических схемах.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Запустить бенчмарк и сохранить результаты в JSON')
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                            help='Количество файлов в синтетических схемах')
+    run_parser.add_argument('--architectures', nargs='+', default=list(ARCHITECTURES), choices=ARCHITECTURES)
+    run_parser.add_argument('--formats', nargs='+', default=list(FORMATS), choices=FORMATS)
+    run_parser.add_argument('--repeat', type=int, default=1, help='Количество прогонов (берется лучший)')
+    run_parser.add_argument('-o', '--output', default='benchmark_results.json', help='Файл результатов')
+    run_parser.set_defaults(handler=command_run)
+
+    compare_parser = subparsers.add_parser('compare', help='Сравнить два файла результатов')
+    compare_parser.add_argument('old', help='Результаты до изменения')
+    compare_parser.add_argument('new', help='Результаты после изменения')
+    compare_parser.add_argument('--threshold', type=float, default=10.0,
+                                help='Порог регрессии в процентах')
+    compare_parser.add_argument('--min-seconds', type=float, default=0.005,
+                                help='Минимальный абсолютный прирост, считающийся регрессией')
+    compare_parser.add_argument('--fail-on-regression', action='store_true',
+                                help='Завершиться с кодом 1 при регрессиях')
+    compare_parser.set_defaults(handler=command_compare)
+
+    args = parser.parse_args()
+    if getattr(args, 'repeat', 1) < 1:
+        parser.error("--repeat должен быть положительным числом")
+    args.handler(args)
+
+
+if __name__ == '__main__':
+    main()
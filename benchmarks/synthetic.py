@@ -0,0 +1,129 @@
+"""
+Синтетические схемы проектов для бенчмарков.
+
+Схема строится из сущностей Entity0, Entity1, ...; для каждой сущности
+создаются файлы слоев выбранной архитектуры, пока не набрано нужное
+количество файлов.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import yaml
+
+ARCHITECTURES = ('layered', 'clean', 'modular')
+FORMATS = ('yaml', 'json', 'txt')
+
+# Слои архитектур: (шаблон пути, шаблон имени класса)
+LAYERS: Dict[str, List[Tuple[str, str]]] = {
+    'layered': [
+        ('app/models/{module}.py', '{name}'),
+        ('app/schemas/{module}.py', '{name}Create'),
+        ('app/repositories/{module}_repository.py', '{name}Repository'),
+        ('app/services/{module}_service.py', '{name}Service'),
+        ('app/api/v1/endpoints/{module}s.py', '{name}Router'),
+    ],
+    'clean': [
+        ('src/domain/entities/{module}.py', '{name}'),
+        ('src/domain/repositories/{module}_repository.py', '{name}Repository'),
+        ('src/application/use_cases/create_{module}.py', 'Create{name}UseCase'),
+        ('src/infrastructure/database/{module}_repository.py', 'SQLAlchemy{name}Repository'),
+        ('src/interface_adapters/schemas/{module}.py', '{name}Response'),
+    ],
+    'modular': [
+        ('app/models/{module}.py', '{name}'),
+        ('app/schemas/{module}.py', '{name}Create'),
+        ('app/crud/{module}.py', '{name}CRUD'),
+        ('app/routers/{module}s.py', '{name}Router'),
+    ],
+}
+
+
+def iter_schema_files(architecture: str, count: int) -> Iterator[Tuple[str, str]]:
+    """Выдает count пар (путь, класс) для архитектуры."""
+    layers = LAYERS[architecture]
+    produced = 0
+    entity = 0
+    while produced < count:
+        name = f"Entity{entity}"
+        module = name.lower()
+        for path_template, class_template in layers:
+            if produced >= count:
+                return
+            yield path_template.format(module=module), class_template.format(name=name)
+            produced += 1
+        entity += 1
+
+
+def write_yaml_schema(path: Path, architecture: str, count: int) -> Path:
+    """Пишет YAML-схему в стандартизированном формате."""
+    data = {
+        'metadata': {
+            'name': f"Synthetic {architecture} {count}",
+            'architecture': architecture,
+            'description': 'Синтетическая схема для бенчмарков',
+            'version': '1.0.0',
+        },
+        'structure': {
+            'files': [{'path': file_path, 'class': class_name}
+                      for file_path, class_name in iter_schema_files(architecture, count)],
+        },
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        yaml.dump(data, f, Dumper=getattr(yaml, 'CSafeDumper', yaml.SafeDumper),
+                  allow_unicode=True, sort_keys=False)
+    return path
+
+
+def write_json_schema(path: Path, architecture: str, count: int) -> Path:
+    """Пишет JSON-схему в формате file/class."""
+    data = {
+        'architecture': architecture,
+        'project_name': f"Synthetic {architecture} {count}",
+        'description': 'Синтетическая схема для бенчмарков',
+        'files': [{'file': file_path, 'class': class_name}
+                  for file_path, class_name in iter_schema_files(architecture, count)],
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def write_txt_schema(path: Path, architecture: str, count: int) -> Path:
+    """Пишет TXT-дерево; файлы группируются по директориям."""
+    by_directory: Dict[str, List[Tuple[str, str]]] = {}
+    for file_path, class_name in iter_schema_files(architecture, count):
+        directory, _, filename = file_path.rpartition('/')
+        by_directory.setdefault(directory, []).append((filename, class_name))
+
+    lines = ['project/']
+    opened: List[str] = []
+    for directory in sorted(by_directory):
+        parts = directory.split('/')
+        common = 0
+        while common < min(len(opened), len(parts)) and opened[common] == parts[common]:
+            common += 1
+        for depth in range(common, len(parts)):
+            lines.append(f"{'│   ' * depth}├── {parts[depth]}/")
+        opened = parts
+        prefix = '│   ' * len(parts)
+        for filename, class_name in by_directory[directory]:
+            lines.append(f"{prefix}├── {filename:<30} # → {class_name}")
+
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return path
+
+
+WRITERS = {
+    'yaml': write_yaml_schema,
+    'json': write_json_schema,
+    'txt': write_txt_schema,
+}
+
+
+def write_schema(directory: Path, architecture: str, schema_format: str, count: int) -> Path:
+    """Создает синтетическую схему и возвращает путь к ней."""
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{architecture}_{count}.{schema_format}"
+    return WRITERS[schema_format](path, architecture, count)
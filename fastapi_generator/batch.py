@@ -0,0 +1,172 @@
+"""
+Пакетная генерация проектов по манифесту в пуле процессов.
+
+Формат манифеста (YAML):
+
+    defaults:            # параметры для всех заданий (необязательно)
+      with_tests: true
+    jobs:
+      - input: schemas/shop.yaml
+        output: shop
+      - input: schemas/blog.json
+        output: blog
+        zip_only: true
+
+Ключи заданий совпадают с флагами CLI (with_tests или with-tests).
+Пути input считаются относительно директории манифеста.
+"""
+
+import io
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+import yaml
+
+from .pipeline import GenerationOptions, generate_project
+
+# Сколько последних строк лога показывать для упавшего задания
+FAILED_LOG_LINES = 10
+
+
+@dataclass
+class BatchJob:
+    """Одно задание пакетного режима."""
+    index: int
+    options: GenerationOptions
+
+
+@dataclass
+class BatchJobResult:
+    """Итог выполнения задания."""
+    index: int
+    output: str
+    ok: bool
+    elapsed: float
+    files_count: int = 0
+    files_written: int = 0
+    error: str = ''
+    log: str = ''
+
+
+def load_manifest(manifest_path: Path) -> List[BatchJob]:
+    """Читает манифест и проверяет задания до запуска пула."""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f)
+    except (yaml.YAMLError, OSError) as e:
+        raise SystemExit(f"❌ Ошибка чтения манифеста: {e}")
+
+    if not isinstance(data, dict) or not isinstance(data.get('jobs'), list):
+        raise SystemExit("❌ Манифест должен содержать список jobs.")
+    defaults = data.get('defaults') or {}
+    if not isinstance(defaults, dict):
+        raise SystemExit("❌ defaults в манифесте должен быть словарем.")
+
+    base_dir = manifest_path.parent
+    jobs = []
+    outputs: Dict[str, int] = {}
+    for index, item in enumerate(data['jobs'], start=1):
+        if not isinstance(item, dict) or 'input' not in item:
+            raise SystemExit(f"❌ Задание #{index}: ожидается словарь с ключом input.")
+        try:
+            options = GenerationOptions.from_mapping({**defaults, **item})
+            options.validate()
+        except (TypeError, ValueError) as e:
+            raise SystemExit(f"❌ Задание #{index}: {e}")
+        if options.tar_stdout:
+            raise SystemExit(f"❌ Задание #{index}: tar_stdout недоступен в пакетном режиме.")
+
+        options.input = str(base_dir / options.input)
+        if options.cache_dir:
+            # Общий кэш рендеринга безопасен для одновременных процессов пула
+            options.cache_dir = str(base_dir / options.cache_dir)
+        # Задания уже идут в нескольких процессах - по умолчанию архив сжимается в одном потоке
+        if options.zip_jobs is None:
+            options.zip_jobs = 1
+        # Задания с одним output перезаписывали бы друг друга
+        if options.output in outputs:
+            raise SystemExit(f"❌ Задания #{outputs[options.output]} и #{index} "
+                             f"используют один output: {options.output}")
+        outputs[options.output] = index
+        jobs.append(BatchJob(index, options))
+
+    if not jobs:
+        raise SystemExit("❌ В манифесте нет заданий.")
+    return jobs
+
+
+def _init_worker() -> None:
+    """Инициализатор процесса пула: компилирует реестр шаблонов один раз на процесс."""
+    from .core.template_engine import precompile_all
+    precompile_all()
+
+
+def run_job(job: BatchJob) -> BatchJobResult:
+    """Выполняет задание в процессе пула; любые ошибки возвращаются в результате."""
+    log = io.StringIO()
+    started = time.perf_counter()
+    try:
+        with redirect_stdout(log):
+            result = generate_project(job.options)
+    except BaseException as e:
+        # SystemExit генератора - ошибка задания, а не всего пула
+        if isinstance(e, KeyboardInterrupt):
+            raise
+        error = str(e).removeprefix('❌ ') if isinstance(e, SystemExit) else traceback.format_exc().strip()
+        return BatchJobResult(job.index, job.options.output, False,
+                              time.perf_counter() - started, error=error, log=log.getvalue())
+    return BatchJobResult(job.index, job.options.output, True, time.perf_counter() - started,
+                          files_count=result.files_count, files_written=result.files_written,
+                          log=log.getvalue())
+
+
+def run_batch(manifest_path: Path, workers: int | None = None) -> List[BatchJobResult]:
+    """Запускает все задания манифеста и выводит отчет по времени."""
+    jobs = load_manifest(manifest_path)
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    print(f"📦 Пакетный режим: {len(jobs)} заданий, процессов: {workers}")
+
+    started = time.perf_counter()
+    results: List[BatchJobResult] = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = {pool.submit(run_job, job): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # Процесс пула упал целиком (например, BrokenProcessPool)
+                result = BatchJobResult(job.index, job.options.output, False, 0.0, error=repr(e))
+            mark = '✅' if result.ok else '❌'
+            print(f"   {mark} #{result.index} {result.output} ({result.elapsed:.2f} с)")
+            results.append(result)
+
+    results.sort(key=lambda result: result.index)
+    _print_report(results, time.perf_counter() - started)
+    return results
+
+
+def _print_report(results: List[BatchJobResult], total_elapsed: float) -> None:
+    """Выводит таблицу времени по заданиям и ошибки упавших заданий."""
+    width = max(len(result.output) for result in results)
+    print(f"\n⏱️  Время по заданиям:")
+    for result in results:
+        status = 'ok' if result.ok else 'FAILED'
+        print(f"   #{result.index:<3} {result.output:<{width}}  {result.elapsed:8.2f} с  "
+              f"{status:<6}  файлов: {result.files_count}, записано: {result.files_written}")
+
+    failed = [result for result in results if not result.ok]
+    for result in failed:
+        print(f"\n❌ Задание #{result.index} ({result.output}): {result.error}")
+        for line in result.log.splitlines()[-FAILED_LOG_LINES:]:
+            print(f"   | {line}")
+
+    jobs_time = sum(result.elapsed for result in results)
+    print(f"\n📊 Успешно: {len(results) - len(failed)}/{len(results)}, "
+          f"общее время: {total_elapsed:.2f} с (сумма по заданиям: {jobs_time:.2f} с)")
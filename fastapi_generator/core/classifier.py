@@ -0,0 +1,208 @@
+"""
+Классификация файлов проекта по пути: тип файла и шаблон.
+
+Одна таблица правил используется и парсерами (автоопределение type и
+template), и FileGenerator (выбор шаблона), поэтому они не расходятся.
+
+Правила компилируются в индексы по сегментам пути:
+    имя файла          __init__.py, main.py, config.py, database.py, ... - файлы уровня проекта;
+    имя директории     models, schemas, services, ... - слои;
+    слово имени файла  user_repository.py -> repository (для плоских раскладок).
+Из совпавших правил слоев выигрывает правило с наименьшим приоритетом
+(порядок в таблице), поэтому результат не зависит от порядка сегментов.
+Классификация директорий и имен файлов запоминается (с ограничением размера:
+классификатор живет весь процесс сервера).
+
+Схема может добавить свои директории (metadata.file_types в YAML,
+file_types в JSON); они важнее встроенных правил слоев:
+
+    file_types:
+      handlers: router
+      adapters: {type: repository, template: infrastructure_repository}
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Tuple
+
+# Архитектуры, для которых есть правила и наборы шаблонов (app_templates)
+ARCHITECTURES = ('layered', 'clean', 'modular')
+
+# Шаблон-заглушка: такого ключа нет в наборах шаблонов, FileGenerator рендерит FALLBACK_TEMPLATE
+# (как и для шаблона, которого нет в наборе архитектуры: config у clean)
+STUB_TEMPLATE = 'default'
+
+
+@dataclass(frozen=True)
+class FileClass:
+    """Результат классификации: тип файла и имя шаблона."""
+    file_type: str
+    template: str
+
+
+@dataclass(frozen=True)
+class LayerRule:
+    """Правило слоя: директории и слова имени файла, тип и шаблоны по архитектурам."""
+    file_type: str
+    directories: Tuple[str, ...]
+    words: Tuple[str, ...]
+    # Шаблон по архитектуре; '*' - для остальных архитектур
+    templates: Tuple[Tuple[str, str], ...]
+
+    def template_for(self, architecture: str) -> str:
+        templates = dict(self.templates)
+        return templates.get(architecture, templates['*'])
+
+
+# Файлы уровня проекта: тип и шаблоны по архитектурам по имени файла
+_DATABASE_TEMPLATES = (('clean', 'database_config'), ('*', 'database'))
+FILENAME_RULES: Dict[str, Tuple[str, Tuple[Tuple[str, str], ...]]] = {
+    '__init__.py': ('package', (('*', STUB_TEMPLATE),)),
+    'main.py': ('main', (('*', 'main'),)),
+    'config.py': ('config', (('*', 'config'),)),
+    'settings.py': ('config', (('*', 'config'),)),
+    'database.py': ('database', _DATABASE_TEMPLATES),
+    'db.py': ('database', _DATABASE_TEMPLATES),
+    'session.py': ('database', _DATABASE_TEMPLATES),
+    'dependencies.py': ('dependencies', (('*', 'dependencies'),)),
+    # Общий роутер версии API (app/api/v1/api.py)
+    'api.py': ('router', (('*', 'api_router'),)),
+}
+
+# Слои в порядке приоритета
+LAYER_RULES: Tuple[LayerRule, ...] = (
+    LayerRule('model', ('models', 'entities'), ('model', 'entity'),
+              (('clean', 'domain_entity'), ('*', 'model'))),
+    LayerRule('schema', ('schemas', 'dtos'), ('schema', 'dto'),
+              (('clean', 'interface_schema'), ('*', 'schema'))),
+    LayerRule('service', ('services',), ('service',),
+              (('clean', 'use_case'), ('*', 'service'))),
+    LayerRule('use_case', ('use_cases',), (),
+              (('*', 'use_case'),)),
+    LayerRule('repository', ('repositories',), ('repository',),
+              (('clean', 'domain_repository'), ('*', 'repository'))),
+    LayerRule('router', ('routers', 'endpoints'), ('router', 'endpoint'),
+              (('*', 'router'),)),
+    LayerRule('crud', ('crud',), ('crud',),
+              (('*', 'crud'),)),
+    LayerRule('test', ('tests',), ('test',),
+              (('*', 'test'),)),
+    LayerRule('util', ('utils', 'helpers'), ('util', 'helper'),
+              (('*', 'util'),)),
+)
+
+DEFAULT_CLASS = FileClass('default', STUB_TEMPLATE)
+
+# Приоритет пользовательских директорий - выше любого встроенного слоя
+_CUSTOM_PRIORITY = -1
+# Предел памяти классификации на классификатор: при заполнении память сбрасывается
+MEMO_SIZE = 65536
+# Сколько классификаторов (архитектура + file_types схемы) держит процесс
+CLASSIFIERS_SIZE = 32
+_NO_MATCH = (len(LAYER_RULES), DEFAULT_CLASS)
+
+
+class PathClassifier:
+    """Классификатор путей одной архитектуры (с пользовательскими директориями схемы)."""
+
+    def __init__(self, architecture: str, custom: Mapping[str, Tuple[str, str | None]] | None = None):
+        self.architecture = architecture
+        self._rule_classes = {rule.file_type: FileClass(rule.file_type, rule.template_for(architecture))
+                              for rule in LAYER_RULES}
+        # Индексы: сегмент -> (приоритет, класс)
+        self._directories: Dict[str, Tuple[int, FileClass]] = {}
+        self._words: Dict[str, Tuple[int, FileClass]] = {}
+        for priority, rule in enumerate(LAYER_RULES):
+            file_class = self._rule_classes[rule.file_type]
+            for directory in rule.directories:
+                self._directories[directory] = (priority, file_class)
+            for word in rule.words:
+                self._words[word] = (priority, file_class)
+        for directory, (file_type, template) in (custom or {}).items():
+            file_class = FileClass(file_type, template or self.template_for(file_type))
+            self._directories[directory] = (_CUSTOM_PRIORITY, file_class)
+        self._project_files = {
+            name: FileClass(file_type, LayerRule(file_type, (), (), templates).template_for(architecture))
+            for name, (file_type, templates) in FILENAME_RULES.items()
+        }
+        # Память классификации: директорий и имен файлов в схеме намного меньше, чем путей
+        self._directory_cache: Dict[str, Tuple[int, FileClass]] = {}
+        self._filename_cache: Dict[str, Tuple[int, FileClass]] = {}
+
+    def classify(self, path: str) -> FileClass:
+        """Тип и шаблон файла по пути (разделители - '/')."""
+        directory, _, filename = path.rpartition('/')
+        project_file = self._project_files.get(filename)
+        if project_file is not None:
+            return project_file
+
+        by_directory = self._directory_cache.get(directory)
+        if by_directory is None:
+            by_directory = min((self._directories[segment] for segment in directory.split('/')
+                                if segment in self._directories),
+                               default=_NO_MATCH, key=lambda match: match[0])
+            _remember(self._directory_cache, directory, by_directory)
+        if by_directory[0] == _CUSTOM_PRIORITY:
+            return by_directory[1]
+
+        by_filename = self._filename_cache.get(filename)
+        if by_filename is None:
+            stem = filename.rpartition('.')[0] or filename
+            by_filename = min((self._words[word] for word in stem.lower().split('_') if word in self._words),
+                              default=_NO_MATCH, key=lambda match: match[0])
+            _remember(self._filename_cache, filename, by_filename)
+
+        return min(by_directory, by_filename, key=lambda match: match[0])[1]
+
+    def template_for(self, file_type: str) -> str:
+        """Шаблон для явно заданного в схеме типа файла."""
+        file_class = self._rule_classes.get(file_type)
+        return file_class.template if file_class is not None else file_type
+
+
+def _remember(memo: Dict[str, Tuple[int, FileClass]], key: str, value: Tuple[int, FileClass]) -> None:
+    """Запоминает классификацию; заполненная память сбрасывается, а не растет без предела."""
+    if len(memo) >= MEMO_SIZE:
+        memo.clear()
+    memo[key] = value
+
+
+def parse_file_types(value: Any) -> Dict[str, Tuple[str, str | None]]:
+    """
+    Разбирает пользовательские директории схемы: директория -> (тип, шаблон).
+
+    Значение - имя типа или словарь {type, template}. Без явного шаблона
+    берется шаблон встроенного правила этого типа, а для неизвестного типа -
+    шаблон с именем типа.
+    """
+    if value is None:
+        return {}
+    if not isinstance(value, Mapping):
+        raise SystemExit("❌ file_types должен быть словарем: директория -> тип или {type, template}.")
+
+    custom = {}
+    for directory, spec in value.items():
+        if isinstance(spec, str):
+            custom[str(directory)] = (spec, None)
+        elif isinstance(spec, Mapping) and isinstance(spec.get('type') or spec.get('template'), str):
+            custom[str(directory)] = (spec.get('type') or spec['template'], spec.get('template'))
+        else:
+            raise SystemExit(f"❌ file_types.{directory}: ожидается имя типа или {{type, template}}.")
+    return custom
+
+
+def get_classifier(architecture: str, file_types: Any = None) -> PathClassifier:
+    """
+    Классификатор для архитектуры и пользовательских директорий схемы.
+
+    Один и тот же объект (вместе с накопленной памятью) получают парсер и
+    генератор, а также схемы с одинаковыми настройками; процесс держит не
+    больше CLASSIFIERS_SIZE последних классификаторов.
+    """
+    custom = parse_file_types(file_types)
+    return _classifier(architecture, tuple(sorted(custom.items())))
+
+
+@lru_cache(maxsize=CLASSIFIERS_SIZE)
+def _classifier(architecture: str, custom: Tuple[Tuple[str, Tuple[str, str | None]], ...]) -> PathClassifier:
+    return PathClassifier(architecture, dict(custom))
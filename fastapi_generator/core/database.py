@@ -0,0 +1,167 @@
+"""
+Настройки БД генерируемого проекта из metadata.database схемы.
+
+Значения становятся значениями по умолчанию в Settings сгенерированного
+проекта (пул соединений и PRAGMA SQLite) и переопределяются переменными
+окружения при запуске:
+
+    metadata:
+      database:
+        pool_size: 20
+        max_overflow: 10
+        pool_timeout: 30
+        pool_recycle: 1800
+        pool_pre_ping: true
+        sqlite:
+          journal_mode: WAL
+          synchronous: NORMAL
+          mmap_size: 268435456
+          cache_size: -64000
+
+Там же описан read-through кэш сущностей: элемент файла схемы с ключом
+cache включает кэш get_by_id/get для своего класса (ttl - секунды,
+max_size - записей в LRU):
+
+    - path: app/models/user.py
+      class: User
+      cache: {ttl: 60, max_size: 1000}
+"""
+
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Tuple
+
+# Допустимые значения PRAGMA journal_mode и synchronous
+JOURNAL_MODES = ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF')
+SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+POOL_KEYS = ('pool_size', 'max_overflow', 'pool_timeout', 'pool_recycle', 'pool_pre_ping')
+SQLITE_KEYS = ('journal_mode', 'synchronous', 'mmap_size', 'cache_size')
+
+CACHE_KEYS = ('ttl', 'max_size')
+# cache: true или неполный словарь дополняется значениями по умолчанию
+DEFAULT_CACHE = {'ttl': 300, 'max_size': 1024}
+# Плейсхолдеры варианта шаблона с кэшем (cached_repository, cached_crud)
+CACHE_PLACEHOLDERS = ('cache_ttl', 'cache_max_size')
+
+
+@dataclass(frozen=True)
+class DatabaseOptions:
+    """Пул соединений и PRAGMA SQLite сгенерированного проекта."""
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: int = 30
+    # Соединения старше pool_recycle секунд пересоздаются (-1 - никогда)
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    # WAL: читатели не блокируют писателя; при WAL synchronous=NORMAL не теряет целостность
+    journal_mode: str = 'WAL'
+    synchronous: str = 'NORMAL'
+    # Отображение файла БД в память, байты (256 МиБ)
+    mmap_size: int = 268435456
+    # Кэш страниц: отрицательное значение - в КиБ (64 МиБ)
+    cache_size: int = -64000
+
+    @classmethod
+    def from_metadata(cls, metadata: Mapping[str, Any] | None) -> 'DatabaseOptions':
+        """Читает metadata.database; значения уже проверены database_errors."""
+        database = (metadata or {}).get('database') or {}
+        values = {key: database[key] for key in POOL_KEYS if key in database}
+        sqlite = database.get('sqlite') or {}
+        values.update({key: sqlite[key] for key in SQLITE_KEYS if key in sqlite})
+        for key in ('journal_mode', 'synchronous'):
+            if key in values:
+                values[key] = values[key].upper()
+        return cls(**values)
+
+    def context(self) -> Dict[str, str]:
+        """Значения плейсхолдеров шаблонов БД: {{ db_pool_size }}, {{ sqlite_journal_mode }}..."""
+        context = {}
+        for field in fields(self):
+            prefix = 'sqlite' if field.name in SQLITE_KEYS else 'db'
+            context[f"{prefix}_{field.name}"] = str(getattr(self, field.name))
+        return context
+
+
+def database_errors(metadata: Mapping[str, Any] | None) -> List[Tuple[str, str]]:
+    """Проверяет metadata.database; возвращает [(ключ, описание)]."""
+    database = (metadata or {}).get('database')
+    if database is None:
+        return []
+    if not isinstance(database, dict):
+        return [('database', "ожидается словарь")]
+
+    errors = []
+    sqlite = database.get('sqlite') or {}
+    if not isinstance(sqlite, dict):
+        errors.append(('database.sqlite', "ожидается словарь"))
+        sqlite = {}
+    for key in database.keys() - {*POOL_KEYS, 'sqlite'}:
+        errors.append((f"database.{key}", "неизвестный параметр"))
+    for key in sqlite.keys() - set(SQLITE_KEYS):
+        errors.append((f"database.sqlite.{key}", "неизвестный параметр"))
+
+    def integer(section: Mapping[str, Any], name: str, key: str, minimum: int | None) -> None:
+        value = section.get(key)
+        if key not in section:
+            return
+        # bool - подкласс int, но pool_size: true - ошибка схемы
+        if isinstance(value, bool) or not isinstance(value, int):
+            errors.append((name, "ожидается целое число"))
+        elif minimum is not None and value < minimum:
+            errors.append((name, f"должно быть не меньше {minimum}"))
+
+    integer(database, 'database.pool_size', 'pool_size', 1)
+    integer(database, 'database.max_overflow', 'max_overflow', 0)
+    integer(database, 'database.pool_timeout', 'pool_timeout', 0)
+    integer(database, 'database.pool_recycle', 'pool_recycle', -1)
+    if 'pool_pre_ping' in database and not isinstance(database['pool_pre_ping'], bool):
+        errors.append(('database.pool_pre_ping', "ожидается true или false"))
+    integer(sqlite, 'database.sqlite.mmap_size', 'mmap_size', 0)
+    integer(sqlite, 'database.sqlite.cache_size', 'cache_size', None)
+    for key, allowed in (('journal_mode', JOURNAL_MODES), ('synchronous', SYNCHRONOUS_MODES)):
+        value = sqlite.get(key)
+        if key in sqlite and (not isinstance(value, str) or value.upper() not in allowed):
+            errors.append((f"database.sqlite.{key}", f"допустимые значения: {', '.join(allowed)}"))
+    return sorted(errors)
+
+
+def cache_errors(cache: Any) -> List[Tuple[str, str]]:
+    """Проверяет cache элемента файла схемы; возвращает [(ключ, описание)]."""
+    if cache is None or isinstance(cache, bool):
+        return []
+    if not isinstance(cache, dict):
+        return [('cache', "ожидается словарь {ttl, max_size} или true")]
+
+    errors = [(f"cache.{key}", "неизвестный параметр") for key in cache.keys() - set(CACHE_KEYS)]
+    ttl = cache.get('ttl')
+    if 'ttl' in cache and (isinstance(ttl, bool) or not isinstance(ttl, (int, float)) or ttl <= 0):
+        errors.append(('cache.ttl', "ожидается положительное число секунд"))
+    max_size = cache.get('max_size')
+    if 'max_size' in cache and (isinstance(max_size, bool) or not isinstance(max_size, int) or max_size < 1):
+        errors.append(('cache.max_size', "ожидается целое число не меньше 1"))
+    return sorted(errors)
+
+
+def entity_cache_contexts(files: Iterable[Any],
+                          entity_of: Callable[[Any], str | None]) -> Dict[str, Dict[str, str]]:
+    """
+    Плейсхолдеры {{ cache_ttl }} и {{ cache_max_size }} по module_name сущности.
+
+    entity_of - module_name сущности файла (User, UserRepository,
+    SQLAlchemyUserRepository, SQLUser -> user) или None для файла вне
+    сущностей. cache достаточно указать у одного файла сущности (обычно
+    модели) - значения получат все ее файлы; сущности без cache в словарь
+    не попадают, и их репозитории рендерятся без кэша.
+    """
+    contexts = {}
+    for project_file in files:
+        cache = project_file.cache
+        if not cache:
+            continue
+        module_name = entity_of(project_file)
+        if module_name is None or module_name in contexts:
+            continue
+        values = {**DEFAULT_CACHE, **(cache if isinstance(cache, dict) else {})}
+        contexts[module_name] = {'cache_ttl': str(values['ttl']),
+                                 'cache_max_size': str(values['max_size'])}
+    return contexts
@@ -0,0 +1,72 @@
+"""
+Хуки генерации: точки, в которые генераторы сообщают о фазах и файлах.
+
+Генераторы вызывают методы GenerationHooks, не зная, кто их слушает:
+профилировщик (--profile), строка прогресса, поток событий (--events json)
+или встраивающий сервис.
+Базовый класс ничего не делает, поэтому без подписчиков хуки бесплатны.
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+class GenerationHooks:
+    """Набор хуков генерации; подписчики переопределяют нужные методы."""
+
+    def on_phase_start(self, phase: str) -> None:
+        """Начало фазы (parse, directories, render, configs, tests, ...)."""
+
+    def on_phase_end(self, phase: str) -> None:
+        """Конец фазы; вызывается и при исключении внутри фазы."""
+
+    def on_plan_ready(self, files: int) -> None:
+        """План проекта передан на выполнение (files - сколько файлов в нем)."""
+
+    def on_file_written(self, path: Path, size: int) -> None:
+        """Файл отрендерен и передан приемнику (size - байт содержимого)."""
+
+    def on_file_skipped(self, path: Path) -> None:
+        """Файл не рендерился: приемник считает его актуальным или он уже существует (if_absent)."""
+
+    @contextmanager
+    def phase(self, phase: str) -> Iterator[None]:
+        """Оборачивает блок кода в фазу."""
+        self.on_phase_start(phase)
+        try:
+            yield
+        finally:
+            self.on_phase_end(phase)
+
+
+class CompositeHooks(GenerationHooks):
+    """Передает события нескольким подписчикам по порядку."""
+
+    def __init__(self, *hooks: GenerationHooks):
+        self.hooks = list(hooks)
+
+    def on_phase_start(self, phase: str) -> None:
+        for hooks in self.hooks:
+            hooks.on_phase_start(phase)
+
+    def on_phase_end(self, phase: str) -> None:
+        # Фазы закрываются в обратном порядке, как вложенные контексты
+        for hooks in reversed(self.hooks):
+            hooks.on_phase_end(phase)
+
+    def on_plan_ready(self, files: int) -> None:
+        for hooks in self.hooks:
+            hooks.on_plan_ready(files)
+
+    def on_file_written(self, path: Path, size: int) -> None:
+        for hooks in self.hooks:
+            hooks.on_file_written(path, size)
+
+    def on_file_skipped(self, path: Path) -> None:
+        for hooks in self.hooks:
+            hooks.on_file_skipped(path)
+
+
+# Общий экземпляр для генераторов без подписчиков
+NULL_HOOKS = GenerationHooks()
@@ -0,0 +1,254 @@
+"""
+Раскладка проекта: сущности, шаблоны файлов и пути модулей для импортов.
+
+Шаблоны app_templates импортируют друг друга через плейсхолдеры
+``{{ <шаблон>_module }}``: ``from {{ database_module }} import Base``,
+``from {{ model_module }} import {{ class_name }}``. Значение - путь модуля
+от корня проекта (app.db.session, blog_api.app.models.user) файла схемы,
+который рендерится этим шаблоном; для шаблонов сущности - файла той же
+сущности.
+
+Сущности - классы файлов моделей (шаблоны model и domain_entity).
+Остальные файлы слоев относятся к сущности по имени класса: UserCreate,
+UserRepository, SQLAlchemyUserRepository, SQLUser, GetUsersUseCase -> User.
+
+Файл рендерится своим шаблоном, только если в проекте есть все модули,
+которые шаблон импортирует, и они тоже рендерятся шаблонами. Иначе файл
+получает заглушку, как файл без шаблона: схема без database.py получает
+заглушки моделей, а не модели с импортом несуществующего Base.
+
+Блоки (ENTITY_BLOCKS в app_templates) - строки на каждую сущность в файлах
+уровня проекта: подключение роутеров, провайдеры зависимостей. Сущность
+попадает во все блоки, если есть все модули, которые импортируют блоки:
+импорт роутера и его подключение не расходятся.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, List, Mapping, Tuple
+
+from .models import ProjectFile
+from .template_engine import CompiledTemplate, compile_template
+
+# Шаблоны, файлы которых объявляют сущности проекта
+ENTITY_TEMPLATES = frozenset({'model', 'domain_entity'})
+# Плейсхолдеры, которые делают шаблон шаблоном сущности
+ENTITY_PLACEHOLDERS = frozenset({'class_name', 'module_name', 'table_name'})
+MODULE_SUFFIX = '_module'
+
+# Аффиксы имен классов слоев вокруг имени сущности
+CLASS_PREFIXES = ('SQLAlchemy', 'SQL')
+CLASS_SUFFIXES = ('Repository', 'Service', 'Router', 'Controller', 'CRUD', 'UseCase',
+                  'Create', 'Update', 'Response', 'Schema')
+USE_CASE_VERBS = ('Create', 'Get', 'List', 'Update', 'Delete')
+
+_WORD_BOUNDARY = re.compile(r'(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])')
+# Имя класса верхнего уровня в исходнике шаблона: class {{ class_name }}Repository(...)
+_CLASS_DEFINITION = re.compile(r'^class ((?:\w|\{\{ \w+ \}\})+)', re.MULTILINE)
+
+# Шаблон сущности - (шаблон, module_name сущности), шаблон уровня проекта - (шаблон, None)
+ModuleKey = Tuple[str, str | None]
+
+
+def snake_case(name: str) -> str:
+    """OrderItem -> order_item, APIDocs -> api_docs."""
+    return _WORD_BOUNDARY.sub('_', name).lower()
+
+
+def module_imports(template: CompiledTemplate) -> FrozenSet[str]:
+    """Шаблоны модулей, которые импортирует шаблон ({{ database_module }} -> database)."""
+    return frozenset(name.removesuffix(MODULE_SUFFIX) for name in template.placeholders
+                     if name.endswith(MODULE_SUFFIX))
+
+
+def module_path(path: str) -> str:
+    """Путь модуля для импорта: app/models/user.py -> app.models.user."""
+    return path.removesuffix('.py').removesuffix('/__init__').replace('/', '.')
+
+
+@dataclass(frozen=True)
+class Entity:
+    """Сущность проекта: класс модели и производные имена для шаблонов."""
+    class_name: str
+    module_name: str
+
+    def context(self) -> Dict[str, str]:
+        return {
+            'class_name': self.class_name,
+            'module_name': self.module_name,
+            'table_name': f"{self.module_name}s",
+        }
+
+
+def _strip_prefix(name: str, prefixes: Tuple[str, ...]) -> str:
+    for prefix in prefixes:
+        if name.startswith(prefix) and name[len(prefix):][:1].isupper():
+            return name[len(prefix):]
+    return name
+
+
+def _strip_suffix(name: str, suffixes: Tuple[str, ...]) -> str:
+    for suffix in suffixes:
+        if name.endswith(suffix) and len(name) > len(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+class ProjectLayout:
+    """Сущности схемы и модули, которые рендерятся шаблонами."""
+
+    def __init__(self, templates: Mapping[str, CompiledTemplate],
+                 blocks: Mapping[str, CompiledTemplate] | None = None):
+        self.templates = templates
+        self.blocks = blocks or {}
+        # Сущности по имени класса модели и по module_name
+        self.entities: Dict[str, Entity] = {}
+        self._by_module: Dict[str, Entity] = {}
+        # Модули, которые рендерятся шаблонами: ключ -> путь модуля
+        self.modules: Dict[ModuleKey, str] = {}
+        self._keys: Dict[str, ModuleKey] = {}
+        self._imports: Dict[str, FrozenSet[str]] = {}
+        self._classes: Dict[str, Tuple[CompiledTemplate, ...]] = {}
+        self._block_values: Dict[str, str] = {}
+
+    def find_entities(self, files: Iterable[ProjectFile],
+                      template_of: Callable[[ProjectFile], str]) -> 'ProjectLayout':
+        """Находит сущности - классы файлов моделей (до build, если модули зависят от сущностей)."""
+        for project_file in files:
+            if template_of(project_file) in ENTITY_TEMPLATES and project_file.class_name not in self.entities:
+                entity = Entity(project_file.class_name, snake_case(project_file.class_name))
+                self.entities[entity.class_name] = entity
+                self._by_module.setdefault(entity.module_name, entity)
+        return self
+
+    def build(self, files: Iterable[ProjectFile], template_of: Callable[[ProjectFile], str]) -> 'ProjectLayout':
+        """Находит сущности и модули; template_of - имя шаблона файла схемы."""
+        files = list(files)
+        self.find_entities(files, template_of)
+
+        candidates: Dict[ModuleKey, str] = {}
+        for project_file in files:
+            key = self._candidate_key(project_file, template_of(project_file))
+            if key is not None:
+                candidates.setdefault(key, module_path(project_file.normalized_path))
+
+        # Модуль без своих импортов исключается, пока исключать нечего
+        modules = candidates
+        while True:
+            missing = [key for key in modules if not self._resolves(key, modules)]
+            if not missing:
+                break
+            for key in missing:
+                del modules[key]
+        self.modules = modules
+        self._keys = {path: key for key, path in modules.items()}
+        self._block_values = self._render_blocks()
+        return self
+
+    def placeholders(self) -> FrozenSet[str]:
+        """Плейсхолдеры, которые заполняет раскладка: имена сущности, {шаблон}_module и блоки."""
+        return ENTITY_PLACEHOLDERS.union((f"{name}{MODULE_SUFFIX}" for name in self.templates), self.blocks)
+
+    def entity_for(self, class_name: str) -> Entity | None:
+        """Сущность файла по имени класса: User, UserCreate, SQLAlchemyUserRepository, GetUsersUseCase."""
+        entity = self.entities.get(class_name)
+        if entity is not None:
+            return entity
+        name = _strip_suffix(_strip_prefix(class_name, CLASS_PREFIXES), CLASS_SUFFIXES)
+        candidates = [name]
+        verb_less = _strip_prefix(name, USE_CASE_VERBS)
+        if verb_less != name:
+            candidates.append(verb_less)
+        for candidate in candidates:
+            entity = self.entities.get(candidate)
+            if entity is None and candidate.endswith('s'):
+                entity = self.entities.get(candidate[:-1])
+            if entity is not None:
+                return entity
+        return None
+
+    def key(self, project_file: ProjectFile, template_name: str) -> ModuleKey | None:
+        """
+        Ключ модуля файла, если файл рендерится шаблоном; None - заглушкой.
+
+        Из нескольких файлов одной сущности с одним шаблоном (create_user.py,
+        get_user.py) шаблоном рендерится первый - на него указывают импорты.
+        """
+        key = self._candidate_key(project_file, template_name)
+        if key is None or self.modules.get(key) != module_path(project_file.normalized_path):
+            return None
+        return key
+
+    def context(self, key: ModuleKey) -> Dict[str, str]:
+        """Значения сущности, путей импортируемых модулей и блоков для файла с ключом key."""
+        template_name, module_name = key
+        context = dict(self._block_values)
+        if module_name is not None:
+            context.update(self._by_module[module_name].context())
+        for dependency in self._template_imports(template_name):
+            context[f"{dependency}{MODULE_SUFFIX}"] = self.modules[self._dependency_key(dependency, module_name)]
+        return context
+
+    def declares_class(self, key: ModuleKey, class_name: str) -> bool:
+        """Объявляет ли модуль с ключом key класс class_name (роутер UserRouter - нет) - без рендеринга."""
+        template_name, module_name = key
+        classes = self._classes.get(template_name)
+        if classes is None:
+            classes = self._classes[template_name] = tuple(
+                compile_template(name) for name in _CLASS_DEFINITION.findall(self.templates[template_name].source))
+        context = self._by_module[module_name].context() if module_name is not None else {}
+        return any(name.render(context) == class_name for name in classes)
+
+    def module_key(self, path: str) -> ModuleKey | None:
+        """Ключ модуля по пути файла (app/models/user.py); None - файл рендерится заглушкой."""
+        return self._keys.get(module_path(path))
+
+    def entities_with(self, imports: FrozenSet[str]) -> List[Entity]:
+        """Сущности, для которых в проекте есть все модули imports."""
+        return [entity for entity in self.entities.values()
+                if self.imports_context(imports, entity.module_name) is not None]
+
+    def imports_context(self, imports: FrozenSet[str], module_name: str | None = None) -> Dict[str, str] | None:
+        """Пути модулей imports ({dep}_module) для сущности module_name; None - модуля нет."""
+        context = {}
+        for dependency in imports:
+            path = self.modules.get(self._dependency_key(dependency, module_name))
+            if path is None:
+                return None
+            context[f"{dependency}{MODULE_SUFFIX}"] = path
+        return context
+
+    def _candidate_key(self, project_file: ProjectFile, template_name: str) -> ModuleKey | None:
+        template = self.templates.get(template_name)
+        if template is None:
+            return None
+        if not template.placeholders & ENTITY_PLACEHOLDERS:
+            return template_name, None
+        entity = self.entity_for(project_file.class_name)
+        return (template_name, entity.module_name) if entity is not None else None
+
+    def _template_imports(self, template_name: str) -> FrozenSet[str]:
+        """Шаблоны модулей, которые импортирует шаблон ({{ database_module }} -> database)."""
+        imports = self._imports.get(template_name)
+        if imports is None:
+            imports = self._imports[template_name] = module_imports(self.templates[template_name])
+        return imports
+
+    def _dependency_key(self, dependency: str, module_name: str | None) -> ModuleKey:
+        template = self.templates.get(dependency)
+        if template is not None and template.placeholders & ENTITY_PLACEHOLDERS:
+            return dependency, module_name
+        return dependency, None
+
+    def _resolves(self, key: ModuleKey, modules: Mapping[ModuleKey, str]) -> bool:
+        template_name, module_name = key
+        return all(self._dependency_key(dependency, module_name) in modules
+                   for dependency in self._template_imports(template_name))
+
+    def _render_blocks(self) -> Dict[str, str]:
+        """Строки блоков для сущностей, у которых есть все импортируемые блоками модули."""
+        imports = frozenset().union(*(module_imports(block) for block in self.blocks.values()))
+        contexts = [{**entity.context(), **self.imports_context(imports, entity.module_name)}
+                    for entity in self.entities_with(imports)]
+        return {name: '\n'.join(block.render(context) for context in contexts)
+                for name, block in self.blocks.items()}
@@ -2,36 +2,52 @@
 Модели данных для генератора.
 """
 
-from dataclasses import dataclass
-from pathlib import Path
+import sys
+from dataclasses import dataclass, field
 from typing import List, Dict, Any
 
+from .database import DatabaseOptions
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class ProjectFile:
-    """Модель файла проекта."""
+    """
+    Модель файла проекта.
+
+    Неизменяемая запись без __dict__. Производные строки (module_name,
+    table_name, filename) не хранятся в записи, а вычисляются при обращении:
+    на схемах из миллионов файлов три строки на запись дороже пересчета.
+    normalized_path хранится, но без обратных слешей это тот же объект,
+    что и path. Повторяющиеся во всей схеме значения (file_type, template)
+    интернируются.
+    """
     path: str
     class_name: str
     file_type: str = "default"
     template: str = "default"
     content: str = ""
+    # cache элемента схемы: {ttl, max_size}, true или None (проверяется cache_errors)
+    cache: Any = field(default=None, repr=False, compare=False)
+    normalized_path: str = field(init=False, repr=False, compare=False)
     
-    @property
-    def normalized_path(self) -> str:
-        """Возвращает путь с нормализованными разделителями."""
-        return self.path.replace('\\', '/')
+    def __post_init__(self):
+        set_field = object.__setattr__
+        set_field(self, 'file_type', sys.intern(self.file_type))
+        set_field(self, 'template', sys.intern(self.template))
+        # Без обратных слешей replace возвращает ту же строку - копии пути не создаются
+        set_field(self, 'normalized_path', self.path.replace('\\', '/'))
     
     @property
     def module_name(self) -> str:
         return self.class_name.lower()
     
-    @property 
+    @property
     def table_name(self) -> str:
-        return f"{self.module_name}s"
+        return f"{self.class_name.lower()}s"
     
     @property
     def filename(self) -> str:
-        return Path(self.path).name
+        return self.normalized_path.rpartition('/')[2]
     
 
 @dataclass
@@ -55,4 +71,19 @@ class ProjectSchema:
     
     @property
     def root_dir(self) -> str:
-        return self.metadata.get('root_dir', '')
\ No newline at end of file
+        return self.metadata.get('root_dir', '')
+    
+    @property
+    def file_types(self) -> Dict[str, Any] | None:
+        """Пользовательские директории схемы: директория -> тип или {type, template}."""
+        return self.metadata.get('file_types')
+    
+    @property
+    def database(self) -> DatabaseOptions:
+        """metadata.database: пул соединений и PRAGMA SQLite сгенерированного проекта."""
+        return DatabaseOptions.from_metadata(self.metadata)
+    
+    @property
+    def async_db(self) -> bool:
+        """metadata.async: асинхронный режим БД (AsyncSession, aiosqlite)."""
+        return bool(self.metadata.get('async', False))
@@ -0,0 +1,201 @@
+"""
+План проекта: все директории и файлы, вычисленные до какого-либо ввода-вывода.
+
+Генераторы не пишут файлы сами, а добавляют их в ProjectPlan. План
+дедуплицирует пути и фиксирует конфликты, после чего PlanExecutor
+создает каждую директорию и записывает каждый файл ровно один раз.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Set
+
+from .hooks import GenerationHooks, NULL_HOOKS
+
+# Виды файлов в порядке выполнения и соответствующие фазы хуков
+FILE_KINDS = ('init', 'source', 'config', 'test')
+KIND_PHASES = {
+    'init': 'init_files',
+    'source': 'render',
+    'config': 'configs',
+    'test': 'tests',
+}
+
+
+@dataclass(slots=True)
+class PlannedFile:
+    """
+    Файл в плане.
+
+    Содержимое задается строкой (content) или функцией рендеринга (render),
+    которую исполнитель вызывает только если файл действительно нужно писать.
+    """
+    path: Path
+    kind: str
+    origin: str
+    content: str | None = None
+    render: Callable[[], str] | None = None
+    # Хэш входных данных рендеринга для инкрементальной записи
+    fingerprint: str | None = None
+    # Не перезаписывать файл, уже существующий в приемнике (заглушки __init__, main.py, тесты)
+    if_absent: bool = False
+
+    def text(self) -> str:
+        return self.content if self.render is None else self.render()
+
+
+@dataclass
+class PlanConflict:
+    """Два источника претендуют на один путь."""
+    path: Path
+    kept: str
+    dropped: str
+    fatal: bool = False
+
+    def __str__(self) -> str:
+        if self.fatal:
+            return f"{self.path}: {self.kept} и {self.dropped}"
+        return f"{self.path}: {self.kept} заменяет {self.dropped}"
+
+
+class ProjectPlan:
+    """Директории и файлы проекта с дедупликацией и обнаружением конфликтов."""
+
+    def __init__(self, project_root: Path):
+        self.project_root = project_root
+        self.directories: Set[Path] = {project_root}
+        self.files: Dict[Path, PlannedFile] = {}
+        self.conflicts: List[PlanConflict] = []
+        # Файлы if_absent, не попавшие в план: путь уже занят другим файлом плана
+        self.skipped: List[PlannedFile] = []
+
+    def add_directory(self, path: Path) -> None:
+        self.directories.add(path)
+
+    def has_file(self, path: Path) -> bool:
+        return path in self.files
+
+    def add_file(self, planned: PlannedFile) -> bool:
+        """
+        Добавляет файл; возвращает False, если файл не попал в план.
+
+        Файл if_absent уступает уже запланированному. Остальные файлы
+        заменяют предыдущий с тем же путем (как повторная запись раньше),
+        а замена файла с другим происхождением фиксируется как конфликт.
+        """
+        existing = self.files.get(planned.path)
+        if existing is not None:
+            if planned.if_absent:
+                self.skipped.append(planned)
+                return False
+            if existing.origin != planned.origin:
+                self.conflicts.append(PlanConflict(planned.path, planned.origin, existing.origin))
+        self.files[planned.path] = planned
+        self.add_directory(planned.path.parent)
+        return True
+
+    def check(self) -> List[PlanConflict]:
+        """Находит неразрешимые конфликты: путь нужен и как файл, и как директория."""
+        all_directories = set(self.directories)
+        for directory in self.directories:
+            all_directories.update(directory.parents)
+        return [
+            PlanConflict(path, f"файл ({self.files[path].origin})", "директория", fatal=True)
+            for path in sorted(self.files) if path in all_directories
+        ]
+
+    def leaf_directories(self) -> List[Path]:
+        """Директории без вложенных директорий плана: их создание создает и всех предков."""
+        ancestors: Set[Path] = set()
+        for directory in self.directories:
+            ancestors.update(directory.parents)
+        return sorted(self.directories - ancestors)
+
+    def iter_files(self) -> Iterator[PlannedFile]:
+        """Файлы в порядке выполнения: по видам, внутри вида - в порядке добавления."""
+        by_kind: Dict[str, List[PlannedFile]] = {kind: [] for kind in FILE_KINDS}
+        for planned in self.files.values():
+            by_kind[planned.kind].append(planned)
+        for kind in FILE_KINDS:
+            yield from by_kind[kind]
+
+    def counts(self) -> Dict[str, int]:
+        counts = {kind: 0 for kind in FILE_KINDS}
+        for planned in self.files.values():
+            counts[planned.kind] += 1
+        return counts
+
+    def describe(self) -> List[str]:
+        """Строки для вывода плана (--plan)."""
+        counts = ', '.join(f"{kind}: {count}" for kind, count in self.counts().items())
+        lines = [
+            f"📋 План проекта: {self.project_root}",
+            f"   Директорий: {len(self.directories)}, файлов: {len(self.files)} ({counts})",
+        ]
+        for planned in self.iter_files():
+            relative_path = planned.path.relative_to(self.project_root).as_posix()
+            mark = '?' if planned.if_absent else '+'
+            lines.append(f"   {mark} {relative_path:<60} [{planned.kind}] {planned.origin}")
+        for planned in self.skipped:
+            relative_path = planned.path.relative_to(self.project_root).as_posix()
+            lines.append(f"   = {relative_path:<60} [{planned.kind}] уже в плане, пропущен")
+        for conflict in self.conflicts:
+            lines.append(f"   ⚠️  Конфликт: {conflict}")
+        return lines
+
+
+@dataclass
+class PlanResult:
+    """Итог выполнения плана."""
+    directories_created: int = 0
+    files_written: int = 0
+    # Файлы, которые приемник счел актуальными (инкрементальный режим)
+    files_fresh: int = 0
+    # Файлы if_absent, уже существующие в приемнике
+    files_existing: int = 0
+
+
+class PlanExecutor:
+    """Выполняет план: каждая директория создается и каждый файл пишется один раз."""
+
+    def __init__(self, sink, hooks: GenerationHooks | None = None):
+        self.sink = sink
+        self.hooks = hooks if hooks is not None else NULL_HOOKS
+
+    def execute(self, plan: ProjectPlan) -> PlanResult:
+        result = PlanResult()
+        self.hooks.on_plan_ready(len(plan.files))
+        with self.hooks.phase('directories'):
+            for directory in plan.leaf_directories():
+                self.sink.ensure_directory(directory)
+                result.directories_created += 1
+
+        current_kind = None
+        phase = None
+        try:
+            for planned in plan.iter_files():
+                if planned.kind != current_kind:
+                    if phase is not None:
+                        self.hooks.on_phase_end(phase)
+                    current_kind, phase = planned.kind, KIND_PHASES[planned.kind]
+                    self.hooks.on_phase_start(phase)
+                self._execute_file(planned, result)
+        finally:
+            if phase is not None:
+                self.hooks.on_phase_end(phase)
+        return result
+
+    def _execute_file(self, planned: PlannedFile, result: PlanResult) -> None:
+        path = planned.path
+        if planned.if_absent and self.sink.exists(path):
+            result.files_existing += 1
+            self.hooks.on_file_skipped(path)
+            return
+        if planned.fingerprint is not None and self.sink.is_fresh(path, planned.fingerprint):
+            result.files_fresh += 1
+            self.hooks.on_file_skipped(path)
+            return
+        data = planned.text().encode('utf-8')
+        self.sink.write(path, data, planned.fingerprint)
+        result.files_written += 1
+        self.hooks.on_file_written(path, len(data))
@@ -0,0 +1,122 @@
+"""
+Компилятор шаблонов генератора.
+
+Шаблон разбирается один раз на литеральные сегменты и плейсхолдеры
+вида ``{{ name }}``, после чего рендеринг сводится к одному ``str.join``.
+"""
+
+import hashlib
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Mapping, Tuple
+
+from .database import CACHE_PLACEHOLDERS, DatabaseOptions
+
+# Плейсхолдер строго в форме "{{ name }}" - так же, как его понимал
+# прежний рендеринг через str.replace ("{{self.id}}" плейсхолдером не является)
+PLACEHOLDER_PATTERN = re.compile(r'\{\{ ([A-Za-z_]\w*) \}\}')
+
+# Плейсхолдеры, которые генераторы заполняют сверх раскладки проекта (ProjectLayout.placeholders):
+# путь файла, slug проекта, настройки БД и кэша сущностей
+GENERATOR_PLACEHOLDERS = frozenset({'file_path', 'project_slug', *DatabaseOptions().context(), *CACHE_PLACEHOLDERS})
+
+
+class CompiledTemplate:
+    """Шаблон, разобранный на литералы и плейсхолдеры."""
+
+    __slots__ = ('source', 'placeholders', 'digest', '_segments', '_slots', '_names')
+
+    def __init__(self, source: str):
+        self.source = source
+        segments = []
+        slots = []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(source):
+            if match.start() > position:
+                segments.append(source[position:match.start()])
+            slots.append((len(segments), match.group(1)))
+            # Исходный текст плейсхолдера остается на случай, если значение не передано
+            segments.append(match.group(0))
+            position = match.end()
+        if position < len(source):
+            segments.append(source[position:])
+
+        self._segments: Tuple[str, ...] = tuple(segments)
+        self._slots: Tuple[Tuple[int, str], ...] = tuple(slots)
+        self.placeholders: FrozenSet[str] = frozenset(name for _, name in slots)
+        self.digest = hashlib.blake2b(source.encode('utf-8'), digest_size=16).hexdigest()
+        self._names: Tuple[str, ...] = tuple(sorted(self.placeholders))
+
+    def render(self, context: Mapping[str, str]) -> str:
+        """Рендерит шаблон; незаполненные плейсхолдеры остаются как есть."""
+        if not self._slots:
+            return self.source
+        parts = list(self._segments)
+        for index, name in self._slots:
+            value = context.get(name)
+            if value is not None:
+                parts[index] = value
+        return ''.join(parts)
+
+    def fingerprint(self, context: Mapping[str, str]) -> str:
+        """Хэш исходника шаблона и используемых им значений - без рендеринга."""
+        values = '\0'.join(f"{name}={context.get(name)}" for name in self._names)
+        return hashlib.blake2b(f"{self.digest}\0{values}".encode('utf-8'), digest_size=16).hexdigest()
+
+    def unresolved(self, context: Mapping[str, str]) -> FrozenSet[str]:
+        """Возвращает плейсхолдеры, для которых в контексте нет значения."""
+        return frozenset(name for name in self.placeholders if name not in context)
+
+    def __repr__(self) -> str:
+        return f"CompiledTemplate(placeholders={sorted(self.placeholders)})"
+
+
+@lru_cache(maxsize=None)
+def compile_template(source: str) -> CompiledTemplate:
+    """Компилирует шаблон; повторные вызовы с тем же текстом берутся из кэша процесса."""
+    return CompiledTemplate(source)
+
+
+def compile_templates(templates: Mapping[str, str]) -> Dict[str, CompiledTemplate]:
+    """Компилирует набор шаблонов одной архитектуры."""
+    return {name: compile_template(source) for name, source in templates.items()}
+
+
+def precompile_registry(registry: Mapping[str, Mapping[str, str]]) -> Dict[str, Dict[str, CompiledTemplate]]:
+    """Компилирует реестр шаблонов вида {архитектура: {тип: шаблон}}."""
+    return {architecture: compile_templates(templates) for architecture, templates in registry.items()}
+
+
+def find_unknown_placeholders(registry: Mapping[str, Mapping[str, str]],
+                              blocks: Mapping[str, Mapping[str, str]] | None = None,
+                              known: FrozenSet[str] = GENERATOR_PLACEHOLDERS) -> Dict[str, FrozenSet[str]]:
+    """
+    Возвращает {"архитектура.тип": плейсхолдеры}, которые генераторы не заполняют.
+
+    Кроме known, известны плейсхолдеры раскладки проекта архитектуры: имена
+    сущности, пути модулей ее шаблонов и блоки (по умолчанию ENTITY_BLOCKS).
+    """
+    from .layout import ProjectLayout
+
+    if blocks is None:
+        from app_templates import ENTITY_BLOCKS as blocks
+
+    unknown = {}
+    for architecture, templates in registry.items():
+        layout = ProjectLayout(compile_templates(templates), compile_templates(blocks.get(architecture, {})))
+        architecture_known = known | layout.placeholders()
+        for name, source in templates.items():
+            names = compile_template(source).placeholders - architecture_known
+            if names:
+                unknown[f"{architecture}.{name}"] = names
+    return unknown
+
+
+def precompile_all() -> int:
+    """Компилирует шаблоны и блоки из app_templates (синхронные и асинхронные), возвращает их количество."""
+    from app_templates import ASYNC_ENTITY_BLOCKS, ASYNC_TEMPLATES, ENTITY_BLOCKS, TEMPLATES
+
+    count = 0
+    for registry in (TEMPLATES, ASYNC_TEMPLATES, ENTITY_BLOCKS, ASYNC_ENTITY_BLOCKS):
+        count += sum(len(templates) for templates in precompile_registry(registry).values())
+    return count
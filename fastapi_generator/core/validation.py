@@ -0,0 +1,118 @@
+"""
+Проверка схемы целиком до какого-либо ввода-вывода.
+
+Раньше ошибка схемы обнаруживалась посреди записи (повтор класса, путь
+и как файл, и как директория), и наполовину записанный проект удалялся
+следующим запуском. Проверка проходит по схеме один раз, сверяя файлы
+с хэш-индексами путей, директорий, таблиц и путей тестов, и сообщает
+обо всех проблемах сразу:
+
+    повтор класса          один и тот же класс дважды в одном модуле;
+    файл и директория      путь файла - префикс пути другого файла;
+    небезопасный путь      абсолютный путь, '..' или пустой сегмент;
+    имена                  класс или имя модуля - не идентификатор Python;
+    root_dir               файл вне корневой директории схемы;
+    таблицы                две модели с одной таблицей (User и user);
+    тесты                  два файла схемы получают один путь теста;
+    metadata.database      параметры пула и PRAGMA SQLite (типы и допустимые значения);
+    metadata.async         true или false.
+"""
+
+import keyword
+from dataclasses import dataclass
+from typing import Dict, List, Set, Tuple
+
+from .database import cache_errors, database_errors
+from .models import ProjectFile, ProjectSchema
+
+
+@dataclass(frozen=True)
+class SchemaIssue:
+    """Проблема схемы: путь файла и описание."""
+    path: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.message}"
+
+
+def _is_identifier(name: str) -> bool:
+    return name.isidentifier() and not keyword.iskeyword(name)
+
+
+def validate_schema(schema: ProjectSchema, with_tests: bool = False) -> List[SchemaIssue]:
+    """
+    Возвращает все проблемы схемы; пустой список - схему можно генерировать.
+
+    with_tests добавляет проверку путей тестов (они выводятся из путей файлов).
+    """
+    issues: List[SchemaIssue] = [SchemaIssue(f"metadata.{key}", message)
+                                 for key, message in database_errors(schema.metadata)]
+    if not isinstance(schema.metadata.get('async', False), bool):
+        issues.append(SchemaIssue("metadata.async", "ожидается true или false"))
+    paths: Set[str] = set()
+    classes: Set[Tuple[str, str]] = set()
+    directories: Set[str] = set()
+    tables: Dict[str, ProjectFile] = {}
+    tests: Dict[str, ProjectFile] = {}
+    root_dir = (schema.root_dir or '').replace('\\', '/').strip('/')
+    root_prefix = f"{root_dir}/" if root_dir else ''
+
+    if with_tests:
+        # Генераторы импортируются только при проверке тестов, как и в pipeline
+        from ..generators.test_generator import needs_test, test_path_for
+
+    for project_file in schema.files:
+        path = project_file.normalized_path
+
+        # Несколько классов в одном модуле - норма (UserCreate, UserResponse), повтор класса - нет
+        if (path, project_file.class_name) in classes:
+            issues.append(SchemaIssue(path, f"класс {project_file.class_name} повторяется"))
+            continue
+        classes.add((path, project_file.class_name))
+        new_path = path not in paths
+        if new_path:
+            paths.add(path)
+            segments = path.split('/')
+            if path.startswith('/') or '..' in segments or '' in segments or ':' in segments[0]:
+                issues.append(SchemaIssue(path, "путь должен быть относительным, без '..' и пустых сегментов"))
+                continue
+            # Директории-предки от ближайшей: если директория уже в индексе, то и все ее предки
+            for depth in range(len(segments) - 1, 0, -1):
+                directory = '/'.join(segments[:depth])
+                if directory in directories:
+                    break
+                directories.add(directory)
+
+        if not _is_identifier(project_file.class_name):
+            issues.append(SchemaIssue(path, f"имя класса {project_file.class_name!r} - не идентификатор Python"))
+        if new_path:
+            stem = project_file.filename.removesuffix('.py')
+            if project_file.filename.endswith('.py') and not _is_identifier(stem):
+                issues.append(SchemaIssue(path, f"модуль {stem!r} нельзя импортировать: имя - не идентификатор Python"))
+            if root_prefix and not path.startswith(root_prefix):
+                issues.append(SchemaIssue(path, f"файл вне root_dir {root_dir!r}"))
+
+        for key, message in cache_errors(project_file.cache):
+            issues.append(SchemaIssue(path, f"{key}: {message}"))
+
+        if project_file.file_type == 'model':
+            other = tables.get(project_file.table_name)
+            if other is not None:
+                issues.append(SchemaIssue(path, f"таблица {project_file.table_name!r} уже есть у модели "
+                                                f"{other.class_name} ({other.normalized_path})"))
+            else:
+                tables[project_file.table_name] = project_file
+
+        if with_tests and new_path and needs_test(project_file):
+            test_path = test_path_for(schema.architecture, path)
+            other = tests.get(test_path)
+            if other is not None:
+                issues.append(SchemaIssue(path, f"тест {test_path} совпадает с тестом {other.normalized_path}"))
+            else:
+                tests[test_path] = project_file
+
+    # Путь нужен и как файл, и как директория: проверяется по полным индексам
+    for path in sorted(directories & paths):
+        issues.append(SchemaIssue(path, "путь используется и как файл, и как директория"))
+    return issues
@@ -1,14 +1,26 @@
-from .base import BaseGenerator
-from .file_generator import FileGenerator
-from .config_generator import ConfigGenerator
-from .test_generator import TestGenerator
-from .project_generator import ProjectGenerator
+from importlib import import_module
+
+# Генераторы импортируются при первом обращении: например, TestGenerator
+# загружается только при генерации тестов.
+_LAZY_EXPORTS = {
+    'BaseGenerator': '.base',
+    'FileGenerator': '.file_generator',
+    'ConfigGenerator': '.config_generator',
+    'TestGenerator': '.test_generator',
+    'ProjectGenerator': '.project_generator',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        return getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 __all__ = [
-    'BaseGenerator', 
-    'FileGenerator', 
-    'ConfigGenerator', 
+    'BaseGenerator',
+    'FileGenerator',
+    'ConfigGenerator',
     'TestGenerator',
     'ProjectGenerator'
-]
\ No newline at end of file
+]
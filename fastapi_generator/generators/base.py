@@ -4,21 +4,46 @@
 
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import List
+from typing import Callable, List
+from ..core.hooks import GenerationHooks, NULL_HOOKS
 from ..core.models import ProjectFile
+from ..core.plan import PlanExecutor, PlanResult, ProjectPlan
+from ..utils.render_cache import RenderCache
+from ..utils.sinks import OutputSink, FileSystemSink
 
 
 class BaseGenerator(ABC):
     """Абстрактный базовый класс генератора."""
     
-    def __init__(self, architecture: str):
+    def __init__(self, architecture: str, sink: OutputSink | None = None,
+                 hooks: GenerationHooks | None = None, cache: RenderCache | None = None):
         self.architecture = architecture
+        self.sink = sink if sink is not None else FileSystemSink()
+        self.hooks = hooks if hooks is not None else NULL_HOOKS
+        # Постоянный кэш рендеринга между запусками (None - рендерить всегда)
+        self.cache = cache
     
     @abstractmethod
     def generate(self, project_root: Path, files: List[ProjectFile]) -> None:
         """Генерирует часть проекта."""
         pass
     
+    def _execute_plan(self, plan: ProjectPlan) -> PlanResult:
+        """Выполняет план в приемнике генератора."""
+        return PlanExecutor(self.sink, self.hooks).execute(plan)
+    
+    def _render_cached(self, key: str, render: Callable[[], str]) -> str:
+        """Берет содержимое из кэша рендеринга или рендерит и сохраняет его."""
+        if self.cache is None:
+            return render()
+        return self.cache.get_or_render(key, render)
+    
     def _ensure_directory(self, path: Path) -> None:
         """Создает директорию если не существует."""
-        path.mkdir(parents=True, exist_ok=True)
+        self.sink.ensure_directory(path)
+    
+    def _write_file(self, path: Path, content: str, fingerprint: str | None = None) -> None:
+        """Передает содержимое файла приемнику."""
+        data = content.encode('utf-8')
+        self.sink.write(path, data, fingerprint)
+        self.hooks.on_file_written(path, len(data))
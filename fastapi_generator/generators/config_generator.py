@@ -6,44 +6,78 @@ from pathlib import Path
 from typing import List
 from .base import BaseGenerator
 from ..core.models import ProjectFile
+from ..core.plan import PlannedFile, ProjectPlan
 from ..core.config import ARCHITECTURE_STRUCTURES
+from ..core.hooks import GenerationHooks
+from ..utils import console
+from ..utils.file_utils import project_slug
+from ..utils.sinks import OutputSink
 
 
 class ConfigGenerator(BaseGenerator):
     """Генерирует конфигурационные файлы проекта."""
     
+    def __init__(self, architecture: str, sink: OutputSink | None = None,
+                 hooks: GenerationHooks | None = None, async_db: bool = False):
+        super().__init__(architecture, sink, hooks)
+        # Асинхронный режим БД: драйвер aiosqlite и greenlet для AsyncSession SQLAlchemy
+        self.async_db = async_db
+    
     def generate(self, project_root: Path, files: List[ProjectFile]) -> None:
         """Генерирует все конфигурационные файлы."""
-        self._generate_pyproject_toml(project_root)
-        self._generate_readme(project_root)
-        self._generate_gitignore(project_root)
-        self._generate_ruff_toml(project_root)
-        self._generate_editorconfig(project_root)
-        self._generate_main_file(project_root)
+        plan = ProjectPlan(project_root)
+        self.plan(project_root, files, plan)
+        self._execute_plan(plan)
+    
+    def plan(self, project_root: Path, files: List[ProjectFile], plan: ProjectPlan) -> None:
+        """Добавляет конфигурационные файлы в план."""
+        self._generate_pyproject_toml(project_root, plan)
+        self._generate_readme(project_root, plan)
+        self._generate_gitignore(project_root, plan)
+        self._generate_ruff_toml(project_root, plan)
+        self._generate_editorconfig(project_root, plan)
+        self._generate_main_file(project_root, plan)
+    
+    def _add_config(self, plan: ProjectPlan, path: Path, content: str, if_absent: bool = False) -> None:
+        plan.add_file(PlannedFile(path=path, kind='config', origin='config', content=content,
+                                  if_absent=if_absent))
     
-    def _generate_pyproject_toml(self, project_root: Path) -> None:
+    def _generate_pyproject_toml(self, project_root: Path, plan: ProjectPlan) -> None:
         """Генерирует pyproject.toml для uv."""
-        project_slug = project_root.name.lower().replace(' ', '_').replace('-', '_')
+        slug = project_slug(project_root)
+        database_dependencies = ('"sqlalchemy[asyncio]>=2.0.0",\n    "aiosqlite>=0.20.0",' if self.async_db
+                                 else '"sqlalchemy>=2.0.0",')
         
         content = f'''[project]
-name = "{project_slug}"
+name = "{slug}"
 version = "0.1.0"
 description = "FastAPI project with {self.architecture} architecture"
 readme = "README.md"
-requires-python = ">=3.12.*"
+requires-python = ">=3.12"
 dependencies = [
     "fastapi[standard]>=0.110.0",
     "uvicorn>=0.27.0",
-    "sqlalchemy>=2.0.0",
+    {database_dependencies}
     "pydantic>=2.0.0",
     "pydantic-settings>=2.0.0",
     "ruff==0.14.2",
 ]
 
+[dependency-groups]
+dev = [
+    "pytest>=8.0.0",
+    "pytest-xdist>=3.5.0",
+]
+
+[tool.pytest.ini_options]
+testpaths = ["tests"]
+pythonpath = ["."]
+# Тесты повторяют структуру исходников: одинаковые имена файлов в разных директориях
+addopts = "--import-mode=importlib"
 '''
-        (project_root / "pyproject.toml").write_text(content, encoding='utf-8')
+        self._add_config(plan, project_root / "pyproject.toml", content)
     
-    def _generate_readme(self, project_root: Path) -> None:
+    def _generate_readme(self, project_root: Path, plan: ProjectPlan) -> None:
         """Генерирует README.md."""
         structure = ARCHITECTURE_STRUCTURES.get(self.architecture, "")
         
@@ -64,9 +98,9 @@ uv run dev
 {structure}
 ```
 '''
-        (project_root / "README.md").write_text(content, encoding='utf-8')
+        self._add_config(plan, project_root / "README.md", content)
 
-    def _generate_ruff_toml(self, project_root: Path) -> None:
+    def _generate_ruff_toml(self, project_root: Path, plan: ProjectPlan) -> None:
         """Генерирует ruff.toml."""
         content = '''# Exclude a variety of commonly ignored directories.
 exclude = [
@@ -168,16 +202,16 @@ ignore = [
 # Allow unused variables when underscore-prefixed.
 dummy-variable-rgx = "^(_+|(_+[a-zA-Z0-9_]*[a-zA-Z0-9]+?))$"
 '''
-        (project_root / "ruff.toml").write_text(content, encoding='utf-8')
+        self._add_config(plan, project_root / "ruff.toml", content)
     
-    def _generate_main_file(self, project_root: Path) -> None:
+    def _generate_main_file(self, project_root: Path, plan: ProjectPlan) -> None:
         """Генерирует основной файл приложения."""
-        project_slug = project_root.name.lower().replace(' ', '_').replace('-', '_')
+        slug = project_slug(project_root)
         
         if self.architecture == "layered":
             content = f'''from fastapi import FastAPI
 
-app = FastAPI(title="{project_slug}")
+app = FastAPI(title="{slug}")
 
 @app.get("/")
 def read_root():
@@ -187,7 +221,7 @@ def read_root():
         elif self.architecture == "clean":
             content = f'''from fastapi import FastAPI
 
-app = FastAPI(title="{project_slug}")
+app = FastAPI(title="{slug}")
 
 @app.get("/")
 def read_root():
@@ -197,14 +231,13 @@ def read_root():
         else:  # modular
             # Для modular архитектуры НЕ создаем main.py в корне, 
             # так как он должен быть внутри blog_api/app/main.py
-            print("ℹ️  Для modular архитектуры main.py создается через схему")
+            console.detail("ℹ️  Для modular архитектуры main.py создается через схему")
             return
     
-        self._ensure_directory(main_path.parent)
-        if not main_path.exists():  # Создаем только если не существует
-            main_path.write_text(content, encoding='utf-8')
+        # Создаем только если не существует (в плане или в приемнике)
+        self._add_config(plan, main_path, content, if_absent=True)
         
-    def _generate_gitignore(self, project_root: Path) -> None:
+    def _generate_gitignore(self, project_root: Path, plan: ProjectPlan) -> None:
         """Генерирует .gitignore файл для Python/FastAPI проекта."""
         gitignore_content = '''# Byte-compiled / optimized / DLL files
 __pycache__/
@@ -363,10 +396,10 @@ temp/
 .uv/
     '''
         gitignore_path = project_root / ".gitignore"
-        gitignore_path.write_text(gitignore_content, encoding='utf-8')
+        self._add_config(plan, gitignore_path, gitignore_content)
         
         
-    def _generate_editorconfig(self, project_root: Path) -> None:
+    def _generate_editorconfig(self, project_root: Path, plan: ProjectPlan) -> None:
         """Генерирует .editorconfig файл для Python/FastAPI проекта."""
         editorconfig_content = '''# EditorConfig is awesome: https://editorconfig.org
 
@@ -391,4 +424,4 @@ indent_size = 4
 indent_style = tab
 '''
         editorconfig_path = project_root / ".editorconfig"
-        editorconfig_path.write_text(editorconfig_content, encoding='utf-8')
\ No newline at end of file
+        self._add_config(plan, editorconfig_path, editorconfig_content)
\ No newline at end of file
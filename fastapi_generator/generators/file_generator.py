@@ -3,23 +3,129 @@
 """
 
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Mapping, Set
 from .base import BaseGenerator
+from ..core.classifier import PathClassifier, get_classifier
+from ..core.database import entity_cache_contexts
+from ..core.hooks import GenerationHooks
+from ..core.layout import ModuleKey, ProjectLayout
 from ..core.models import ProjectFile
+from ..core.plan import PlannedFile, ProjectPlan
+from ..core.template_engine import CompiledTemplate, compile_template, compile_templates
+from ..utils import console
+from ..utils.render_cache import RenderCache
+from ..utils.sinks import OutputSink
+
+FALLBACK_TEMPLATE = '''# {{ file_path }}
+
+class {{ class_name }}:
+    """{{ class_name }} class."""
+    
+    def __init__(self):
+        pass
+'''
+
+# Модуль кэша сущностей (шаблон entity_cache) и варианты шаблонов с кэшем (cached_repository):
+# модуль генерируется рядом с модулем БД, только если cache объявлен у какой-либо сущности
+CACHE_MODULE_TEMPLATE = 'entity_cache'
+CACHE_MODULE_FILENAME = 'entity_cache.py'
+CACHED_TEMPLATE_PREFIX = 'cached_'
+_CACHE_IMPORTS = frozenset({CACHE_MODULE_TEMPLATE})
+
+
+def _is_header_line(line: str) -> bool:
+    """Строка заголовка модуля: пустая, комментарий или однострочный импорт."""
+    if line.rstrip().endswith('('):
+        return False
+    return not line.strip() or line.startswith(('#', 'import ', 'from '))
+
+
+def merge_modules(sources: List[str]) -> str:
+    """
+    Собирает модуль из частей, отрендеренных для классов одного пути.
+
+    Заголовок части - начальные комментарии и импорты до последнего
+    импорта; строки заголовков попадают в модуль один раз, тела частей
+    идут следом в порядке схемы.
+    """
+    if len(sources) == 1:
+        return sources[0]
+    header: List[str] = []
+    seen: Set[str] = set()
+    bodies: List[str] = []
+    for source in sources:
+        lines = source.splitlines()
+        end = 0
+        while end < len(lines) and _is_header_line(lines[end]):
+            end += 1
+        imports = [index for index in range(end) if lines[index].startswith(('import ', 'from '))]
+        if imports:
+            end = imports[-1] + 1
+        for line in lines[:end]:
+            if line.strip() and line not in seen:
+                seen.add(line)
+                header.append(line)
+        body = '\n'.join(lines[end:]).strip('\n')
+        if body and body not in bodies:
+            bodies.append(body)
+    return '\n'.join(header) + '\n\n' + '\n\n\n'.join(bodies) + '\n'
 
 
 class FileGenerator(BaseGenerator):
     """Генерирует файлы проекта на основе шаблонов."""
     
-    def __init__(self, architecture: str, templates: Dict):
-        super().__init__(architecture)
+    def __init__(self, architecture: str, templates: Dict, sink: OutputSink | None = None,
+                 hooks: GenerationHooks | None = None, cache: RenderCache | None = None,
+                 classifier: PathClassifier | None = None, project_context: Mapping[str, str] | None = None,
+                 blocks: Dict | None = None):
+        super().__init__(architecture, sink, hooks, cache)
+        # Та же таблица правил, что у парсера схемы (с пользовательскими file_types схемы)
+        self.classifier = classifier or get_classifier(architecture)
         self.templates = templates.get(architecture, {})
+        self.compiled_templates = compile_templates(self.templates)
+        # Строки на каждую сущность в файлах уровня проекта (ENTITY_BLOCKS)
+        self.compiled_blocks = compile_templates((blocks or {}).get(architecture, {}))
+        self.layout = ProjectLayout(self.compiled_templates, self.compiled_blocks)
+        # Общие для всех файлов значения (настройки БД из metadata.database)
+        self.project_context = dict(project_context or {})
+        # Кэш сущностей из cache элементов схемы: {module_name сущности: {cache_ttl, cache_max_size}}
+        self.entity_contexts: Dict[str, Dict[str, str]] = {}
+        self.fallback_template = compile_template(FALLBACK_TEMPLATE)
+        # Незаполненные плейсхолдеры по шаблонам: {шаблон: {имя, ...}}
+        self.unresolved_placeholders: Dict[str, Set[str]] = {}
     
     def generate(self, project_root: Path, files) -> None:
         """Генерирует все файлы проекта."""
+        plan = ProjectPlan(project_root)
+        self.plan(project_root, files, plan)
+        self._execute_plan(plan)
+        self._report_unresolved_placeholders()
+    
+    def plan(self, project_root: Path, files, plan: ProjectPlan) -> None:
+        """
+        Добавляет файлы схемы в план.
+        
+        Рендеринг откладывается до выполнения плана; записи схемы с одним
+        путем (UserCreate, UserResponse в schemas/user.py) становятся одним
+        модулем из нескольких частей.
+        """
         project_files = self._convert_to_project_files(files)
+        # cache задается по сущности: сущности нужны раньше модулей, от них зависит модуль кэша
+        self.layout = ProjectLayout(self.compiled_templates, self.compiled_blocks).find_entities(
+            project_files, self._template_name)
+        self.entity_contexts = entity_cache_contexts(project_files, self._entity_module)
+        cache_module = self._cache_module(project_files)
+        if cache_module is not None:
+            project_files.append(cache_module)
+        self.layout.build(project_files, self._template_name)
+        if self.layout.imports_context(_CACHE_IMPORTS) is None:
+            # Модуля кэша нет (нет модуля БД) - репозитории рендерятся без кэша
+            self.entity_contexts = {}
+        modules: Dict[str, List[ProjectFile]] = {}
         for project_file in project_files:
-            self._generate_file(project_root, project_file)
+            modules.setdefault(project_file.normalized_path, []).append(project_file)
+        for parts in modules.values():
+            plan.add_file(self._plan_file(project_root, parts))
 
     def _convert_to_project_files(self, files) -> List[ProjectFile]:
         """Конвертирует входные данные в список ProjectFile."""
@@ -34,50 +140,119 @@ class FileGenerator(BaseGenerator):
                 raise ValueError(f"Неизвестный формат данных: {type(item)}")
         return project_files
     
-    def _generate_file(self, project_root: Path, project_file: ProjectFile) -> None:
-        """Генерирует один файл."""
-        full_path = project_root / project_file.normalized_path
-        self._ensure_directory(full_path.parent)
+    def _plan_file(self, project_root: Path, parts: List[ProjectFile]) -> PlannedFile:
+        """Готовит модуль к рендерингу: шаблоны частей, контекст и fingerprint."""
+        # Часть - (имя шаблона, шаблон, ключ модуля раскладки или None для заглушки)
+        prepared = [self._prepare(part) for part in parts]
+        # Части с одинаковым fingerprint рендерятся в одинаковый текст - остается одна
+        fingerprints = {}
+        for part, (template_name, template, key) in zip(parts, prepared):
+            fingerprint = template.fingerprint(self._build_context(part, key))
+            fingerprints.setdefault(fingerprint, (part, template_name, template, key))
+        if len(fingerprints) == 1:
+            fingerprint = next(iter(fingerprints))
+        else:
+            fingerprint = RenderCache.key('module', *fingerprints)
         
-        content = self._generate_content(project_file)
-        full_path.write_text(content, encoding='utf-8')
+        # По fingerprint приемник пропустит рендеринг, если входные данные не менялись,
+        # а кэш рендеринга отдаст готовое содержимое, отрендеренное в другом проекте.
+        # Контекст собирается заново при рендеринге: поля ProjectFile уже вычислены,
+        # а план большой схемы не держит по словарю на каждый файл
+        return PlannedFile(
+            path=project_root / parts[0].normalized_path,
+            kind='source',
+            origin=f"{parts[0].file_type} {', '.join(part.class_name for part in parts)}",
+            render=lambda: merge_modules([
+                self._render(template_name, template, self._build_context(part, key), part_fingerprint)
+                for part_fingerprint, (part, template_name, template, key) in fingerprints.items()
+            ]),
+            fingerprint=fingerprint,
+        )
+    
+    def _template_name(self, project_file: ProjectFile) -> str:
+        """Шаблон файла: явный шаблон схемы или шаблон классификатора по пути."""
+        if project_file.template != 'default' and project_file.template in self.compiled_templates:
+            return project_file.template
+        return self.classifier.classify(project_file.normalized_path).template
+    
+    def _cache_module(self, project_files: List[ProjectFile]) -> ProjectFile | None:
+        """Файл модуля кэша рядом с модулем БД; None - кэш не нужен или модуля БД нет."""
+        if not self.entity_contexts or CACHE_MODULE_TEMPLATE not in self.compiled_templates:
+            return None
+        # Шаблон модуля БД архитектуры: database или database_config (clean)
+        database_template = self.classifier.classify('database.py').template
+        for project_file in project_files:
+            if self._template_name(project_file) == database_template:
+                directory = project_file.normalized_path.rpartition('/')[0]
+                path = f"{directory}/{CACHE_MODULE_FILENAME}" if directory else CACHE_MODULE_FILENAME
+                return ProjectFile(path, 'EntityCache', 'cache', CACHE_MODULE_TEMPLATE)
+        return None
+    
+    def _entity_module(self, project_file: ProjectFile) -> str | None:
+        """module_name сущности файла: у UserRepository и SQLUser - user."""
+        entity = self.layout.entity_for(project_file.class_name)
+        return entity.module_name if entity is not None else None
+    
+    def _prepare(self, project_file: ProjectFile):
+        """Шаблон файла и ключ модуля; файл без разрешимых импортов получает заглушку."""
+        template_name = self._template_name(project_file)
+        key = self.layout.key(project_file, template_name)
+        if key is None:
+            return template_name, self.fallback_template, None
+        # Сущность с cache получает вариант шаблона с кэшем, остальные - шаблон без него
+        cached = self.compiled_templates.get(f"{CACHED_TEMPLATE_PREFIX}{template_name}")
+        if cached is not None and key[1] in self.entity_contexts:
+            return template_name, cached, key
+        return template_name, self.compiled_templates[template_name], key
     
     def _generate_content(self, project_file: ProjectFile) -> str:
         """Генерирует содержимое файла."""
-        file_type = self._determine_file_type(project_file.normalized_path)
-        template = self.templates.get(file_type, self._get_fallback_template())
-       
-        return template.replace('{{ class_name }}', project_file.class_name)\
-                      .replace('{{ module_name }}', project_file.module_name)\
-                      .replace('{{ table_name }}', project_file.table_name)\
-                      .replace('{{ file_path }}', project_file.normalized_path)
+        template_name, template, key = self._prepare(project_file)
+        return self._render(template_name, template, self._build_context(project_file, key))
     
-    def _determine_file_type(self, file_path: str) -> str:
-        """Определяет тип файла на основе пути."""
-        parts = Path(file_path).parts
+    def _render(self, template_name: str, template: CompiledTemplate, context: Dict[str, str],
+                fingerprint: str | None = None) -> str:
+        """Рендерит шаблон (или берет из кэша) и запоминает незаполненные плейсхолдеры."""
+        if template.placeholders:
+            unresolved = template.unresolved(context)
+            if unresolved:
+                self.unresolved_placeholders.setdefault(template_name, set()).update(unresolved)
         
-        if 'models' in parts or 'entities' in parts:
-            return 'model' if self.architecture == 'layered' else 'domain_entity'
-        elif 'schemas' in parts:
-            return 'schema'
-        elif 'services' in parts:
-            return 'service'
-        elif 'repositories' in parts:
-            return 'repository' if self.architecture == 'layered' else 'domain_repository'
-        elif 'routers' in parts or 'endpoints' in parts:
-            return 'router'
-        elif 'use_cases' in parts:
-            return 'use_case'
-        
-        return 'model'  # fallback
+        if fingerprint is None:
+            return template.render(context)
+        # fingerprint покрывает исходник шаблона и подставляемые значения
+        key = RenderCache.key('source', self.architecture, fingerprint)
+        return self._render_cached(key, lambda: template.render(context))
     
-    def _get_fallback_template(self) -> str:
-        """Возвращает шаблон по умолчанию."""
-        return f'''# {{{{ file_path }}}}
-
-class {{{{ class_name }}}}:
-    """{{{{ class_name }}}} class."""
+    def _build_context(self, project_file: ProjectFile, key: ModuleKey | None = None) -> Dict[str, str]:
+        """
+        Собирает значения плейсхолдеров для файла.
+        
+        Для файла, который рендерится шаблоном (key), имена берутся из его
+        сущности (UserRepository -> User, users), пути импортов - из раскладки.
+        """
+        if key is None:
+            return {
+                **self.project_context,
+                'class_name': project_file.class_name,
+                'module_name': project_file.module_name,
+                'table_name': project_file.table_name,
+                'file_path': project_file.normalized_path,
+            }
+        context = self.layout.context(key)
+        # cache сущности: указан у модели - действует и в репозитории, и в CRUD
+        cache = self.entity_contexts.get(key[1])
+        if cache is not None:
+            context.update(cache)
+            context.update(self.layout.imports_context(_CACHE_IMPORTS))
+        return {
+            **self.project_context,
+            **context,
+            'file_path': project_file.normalized_path,
+        }
     
-    def __init__(self):
-        pass
-'''
+    def _report_unresolved_placeholders(self) -> None:
+        """Сообщает о плейсхолдерах, оставшихся в сгенерированных файлах."""
+        for template_name, names in sorted(self.unresolved_placeholders.items()):
+            placeholders = ', '.join(f"{{{{ {name} }}}}" for name in sorted(names))
+            console.warn(f"⚠️  Незаполненные плейсхолдеры в шаблоне '{template_name}': {placeholders}")
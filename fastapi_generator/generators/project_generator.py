@@ -8,35 +8,68 @@ from pathlib import Path
 """
 
 from pathlib import Path
-from typing import List, Union, Tuple
+from typing import List, Mapping, Union, Tuple
 from .file_generator import FileGenerator
 from .config_generator import ConfigGenerator
-from .test_generator import TestGenerator
+from ..core.hooks import GenerationHooks, NULL_HOOKS
+from ..core.classifier import PathClassifier
 from ..core.models import ProjectFile
+from ..core.plan import PlanExecutor, PlanResult, PlannedFile, ProjectPlan
+from ..utils import console
+from ..utils.render_cache import RenderCache
+from ..utils.sinks import OutputSink, FileSystemSink
 
 
 class ProjectGenerator:
     """Фасад для генерации всего проекта."""
     
-    def __init__(self, architecture: str, templates: dict):
+    def __init__(self, architecture: str, templates: dict, sink: OutputSink | None = None,
+                 hooks: GenerationHooks | None = None, cache: RenderCache | None = None,
+                 classifier: PathClassifier | None = None, async_db: bool = False,
+                 project_context: Mapping[str, str] | None = None, blocks: dict | None = None):
         self.architecture = architecture
-        self.file_generator = FileGenerator(architecture, templates)
-        self.config_generator = ConfigGenerator(architecture)
+        self.sink = sink if sink is not None else FileSystemSink()
+        self.hooks = hooks if hooks is not None else NULL_HOOKS
+        self.file_generator = FileGenerator(architecture, templates, self.sink, self.hooks, cache,
+                                            classifier, project_context, blocks)
+        self.config_generator = ConfigGenerator(architecture, self.sink, self.hooks, async_db)
         # self.test_generator = TestGenerator(architecture)
     
     def create_structure(self, files, project_root: Path, with_init: bool = True) -> None:
         """Создает всю структуру проекта."""
+        plan = self.build_plan(files, project_root, with_init=with_init)
+        self.execute_plan(plan)
+    
+    def build_plan(self, files, project_root: Path, with_init: bool = True,
+                   plan: ProjectPlan | None = None) -> ProjectPlan:
+        """Вычисляет директории и файлы проекта без ввода-вывода."""
+        if plan is None:
+            plan = ProjectPlan(project_root)
         # Конвертируем входные данные в ProjectFile объекты
         project_files = self._convert_to_project_files(files)
         
-        self._create_directories(project_files, project_root)
-        
-        if with_init:
-            self._create_init_files(project_files, project_root)
+        with self.hooks.phase('plan'):
+            self._plan_directories(project_files, project_root, plan)
+            # Файлы схемы планируются раньше заглушек __init__, чтобы заглушки им уступили
+            self.file_generator.plan(project_root, project_files, plan)
+            if with_init:
+                self._plan_init_files(project_files, project_root, plan)
+            self.config_generator.plan(project_root, project_files, plan)
+        return plan
+    
+    def execute_plan(self, plan: ProjectPlan) -> PlanResult:
+        """Создает директории и пишет файлы плана в приемник."""
+        fatal = plan.check()
+        if fatal:
+            for conflict in fatal:
+                console.warn(f"❌ Конфликт путей: {conflict}")
+            raise SystemExit(f"❌ План проекта содержит конфликтов: {len(fatal)}")
+        for conflict in plan.conflicts:
+            console.warn(f"⚠️  Конфликт путей: {conflict}")
         
-        self.file_generator.generate(project_root, project_files)
-        self.config_generator.generate(project_root, project_files)
-        # self.test_generator.generate(project_root, project_files)
+        result = PlanExecutor(self.sink, self.hooks).execute(plan)
+        self.file_generator._report_unresolved_placeholders()
+        return result
     
     def _convert_to_project_files(self, files) -> List[ProjectFile]:
         """Конвертирует входные данные в список ProjectFile."""
@@ -53,28 +86,29 @@ class ProjectGenerator:
                 raise ValueError(f"Неизвестный формат данных: {type(item)} - {item}")
         return project_files
     
-    def _create_directories(self, files: List[ProjectFile], project_root: Path) -> None:
-        """Создает все необходимые директории."""
-        directories = set()
-        
+    def _plan_directories(self, files: List[ProjectFile], project_root: Path, plan: ProjectPlan) -> None:
+        """Добавляет в план директории файлов схемы."""
         for project_file in files:
-            full_path = project_root / project_file.path
-            directories.add(full_path.parent)
-        
-        for directory in sorted(directories):
-            directory.mkdir(parents=True, exist_ok=True)
+            plan.add_directory((project_root / project_file.path).parent)
     
-    def _create_init_files(self, files: List[ProjectFile], project_root: Path) -> None:
-        """Создает __init__.py файлы."""
+    def _plan_init_files(self, files: List[ProjectFile], project_root: Path, plan: ProjectPlan) -> None:
+        """Добавляет в план заглушки __init__.py для директорий с файлами схемы."""
         directories = set()
         
         for project_file in files:
-            full_path = project_root / project_file.path
-            directory = full_path.parent
+            directory = (project_root / project_file.path).parent
             if directory != project_root:
                 directories.add(directory)
         
         for directory in sorted(directories):
             init_file = directory / '__init__.py'
-            if not init_file.exists():
-                init_file.write_text(f"# {directory.relative_to(project_root)}/__init__.py\n")
\ No newline at end of file
+            # __init__.py из схемы создаст FileGenerator, заглушка для него не нужна
+            if plan.has_file(init_file):
+                continue
+            plan.add_file(PlannedFile(
+                path=init_file,
+                kind='init',
+                origin='__init__',
+                content=f"# {directory.relative_to(project_root)}/__init__.py\n",
+                if_absent=True,
+            ))
@@ -1,30 +1,57 @@
+import io
+from importlib import import_module
+
 from .base import BaseParser
-from .txt_parser import TxtParser
-from .json_parser import JsonParser
-from .yaml_parser import YamlParser
+
+# Парсеры по расширению файла: (модуль, класс, поддерживает stream).
+# Модуль импортируется при первом обращении к формату, поэтому разбор
+# .txt-схемы не загружает yaml и парсер JSON.
+PARSER_REGISTRY = {
+    '.txt': ('.txt_parser', 'TxtParser', False),
+    '.json': ('.json_parser', 'JsonParser', True),
+    '.yaml': ('.yaml_parser', 'YamlParser', True),
+    '.yml': ('.yaml_parser', 'YamlParser', True),
+}
+
+_LAZY_EXPORTS = {class_name: module_name for module_name, class_name, _ in PARSER_REGISTRY.values()}
 
 
 class SchemaParser:
     """Фасад для парсеров разных форматов."""
-    
-    def __init__(self):
-        self._parsers = {
-            '.txt': TxtParser(),
-            '.json': JsonParser(), 
-            '.yaml': YamlParser(),
-            '.yml': YamlParser()
-        }
-    
+
+    def __init__(self, stream: bool = False):
+        # stream=True - потоковый разбор JSON/YAML без загрузки документа целиком
+        self.stream = stream
+        self._parsers = {}
+
     def parse_file(self, file_path) -> 'ProjectSchema':
         """Парсит файл схемы и возвращает стандартизированную схему."""
         if not file_path.exists():
             raise SystemExit(f"❌ Файл не найден: {file_path}")
-        
-        parser = self._parsers.get(file_path.suffix)
-        if not parser:
-            raise SystemExit("❌ Поддерживаются только: .txt, .json, .yaml, .yml")
-        
-        return parser.parse(file_path)
+
+        return self._get_parser(file_path.suffix).parse(file_path)
+
+    def parse_content(self, content: str, suffix: str) -> 'ProjectSchema':
+        """Парсит схему из строки (например, тела HTTP-запроса); формат задается расширением."""
+        return self._get_parser(suffix).parse_stream(io.StringIO(content))
+
+    def _get_parser(self, suffix: str) -> BaseParser:
+        parser = self._parsers.get(suffix)
+        if parser is None:
+            if suffix not in PARSER_REGISTRY:
+                raise SystemExit("❌ Поддерживаются только: .txt, .json, .yaml, .yml")
+            module_name, class_name, supports_stream = PARSER_REGISTRY[suffix]
+            parser_class = getattr(import_module(module_name, __name__), class_name)
+            parser = parser_class(stream=self.stream) if supports_stream else parser_class()
+            self._parsers[suffix] = parser
+        return parser
+
+
+def __getattr__(name):
+    # from fastapi_generator.parsers import YamlParser импортирует модуль только по запросу
+    if name in _LAZY_EXPORTS:
+        return getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-__all__ = ['SchemaParser', 'TxtParser', 'JsonParser', 'YamlParser']
\ No newline at end of file
+__all__ = ['SchemaParser', 'BaseParser', 'TxtParser', 'JsonParser', 'YamlParser']
@@ -5,6 +5,7 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Dict, Any, List
+from fastapi_generator.core.classifier import ARCHITECTURES, PathClassifier, get_classifier
 from fastapi_generator.core.models import ProjectFile, ProjectSchema
 
 
@@ -21,19 +22,22 @@ class BaseParser(ABC):
         return path.replace('\\', '/')
 
     def _create_project_file(self, path: str, class_name: str, 
-                             file_type: str = "default", template: str = "default") -> ProjectFile:
+                             file_type: str = "default", template: str = "default",
+                             cache: Any = None) -> ProjectFile:
         """Создает объект ProjectFile."""
         normalized_path = self._normalize_path(path)        
         return ProjectFile(
             path=normalized_path, 
             class_name=class_name,
             file_type=file_type,
-            template=template
+            template=template,
+            cache=cache
         )
     
     def _create_project_schema(self, architecture: str, files: List[ProjectFile], 
                                metadata: Dict[str, Any] | None = None) -> ProjectSchema:
         """Создает стандартизированную схему проекта."""
+        self._check_architecture(architecture)
         if metadata is None:
             metadata = {}
         
@@ -43,46 +47,36 @@ class BaseParser(ABC):
             metadata=metadata
         )
     
-    def _detect_file_type(self, path: str, architecture: str) -> str:
-        """Определяет тип файла по пути."""
-        path_lower = path.lower()
-        
-        if path.endswith('__init__.py'):
-            return 'package'
-        elif 'main.py' in path:
-            return 'main'
-        elif 'config.py' in path or 'settings.py' in path:
-            return 'config'
-        elif 'database.py' in path or 'db.py' in path:
-            return 'database'
-        elif 'model' in path_lower or 'entity' in path_lower:
-            return 'model'
-        elif 'schema' in path_lower or 'dto' in path_lower:
-            return 'schema'
-        elif 'service' in path_lower or 'use_case' in path_lower:
-            return 'service'
-        elif 'repository' in path_lower:
-            return 'repository'
-        elif 'router' in path_lower or 'endpoint' in path_lower:
-            return 'router'
-        elif 'crud' in path_lower:
-            return 'crud'
-        elif 'test' in path_lower:
-            return 'test'
-        elif 'util' in path_lower or 'helper' in path_lower:
-            return 'util'
-        
-        return 'default'
-    
-    def _detect_template(self, path: str, file_type: str, architecture: str) -> str:
-        """Определяет шаблон для файла."""
-        # Для разных архитектур могут быть разные шаблоны
-        if architecture == "clean":
-            if file_type == "model":
-                return "domain_entity"
-            elif file_type == "repository":
-                return "domain_repository"
-            elif file_type == "service":
-                return "use_case"
-        
-        return file_type
\ No newline at end of file
+    def _classifier(self, architecture: str, metadata: Dict[str, Any] | None = None) -> PathClassifier:
+        """Классификатор путей для архитектуры с пользовательскими директориями схемы (file_types)."""
+        self._check_architecture(architecture)
+        return get_classifier(architecture, (metadata or {}).get('file_types'))
+
+    # Проверки формы схемы: документ может разобраться, но иметь не ту структуру
+    # (structure: 5, path: [1]) - это ошибка схемы, а не сбой генератора
+
+    def _check_architecture(self, architecture: Any) -> None:
+        if architecture not in ARCHITECTURES:
+            raise ValueError(f"architecture: ожидается одно из {', '.join(ARCHITECTURES)}, "
+                             f"получено {architecture!r}")
+
+    def _mapping(self, value: Any, name: str) -> Dict[str, Any]:
+        """Секция схемы, которая должна быть словарем; пустая секция - пустой словарь."""
+        if value is None:
+            return {}
+        if not isinstance(value, dict):
+            raise ValueError(f"{name} должен быть словарем, получено {type(value).__name__}")
+        return value
+
+    def _list(self, value: Any, name: str) -> List[Any]:
+        """Секция схемы, которая должна быть списком; пустая секция - пустой список."""
+        if value is None:
+            return []
+        if not isinstance(value, list):
+            raise ValueError(f"{name} должен быть списком, получено {type(value).__name__}")
+        return value
+
+    def _string(self, value: Any, name: str) -> str:
+        if not isinstance(value, str):
+            raise ValueError(f"{name} должен быть строкой, получено {value!r}")
+        return value
@@ -3,48 +3,196 @@
 """
 
 import json
+import re
 from pathlib import Path
+from typing import Any, Dict, Iterator, List
 from .base import BaseParser
+from fastapi_generator.core.classifier import PathClassifier
 from fastapi_generator.core.models import ProjectFile, ProjectSchema
 
+WHITESPACE_PATTERN = re.compile(r'[ \t\n\r]*')
+
+
+class JsonStreamReader:
+    """
+    Минимальный потоковый читатель JSON поверх JSONDecoder.raw_decode.
+
+    Держит в памяти только непрочитанный хвост текущего чанка и значение,
+    которое декодируется в данный момент.
+    """
+
+    def __init__(self, stream, chunk_size: int = 1 << 16):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+
+    def _fill(self) -> None:
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+
+    def peek(self) -> str:
+        """Возвращает следующий значащий символ, не потребляя его ('' в конце потока)."""
+        while True:
+            self.position = WHITESPACE_PATTERN.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer) or self.eof:
+                return self.buffer[self.position:self.position + 1]
+            self._fill()
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"ожидался '{char}', найден '{found or 'конец файла'}' (позиция {self.position})")
+        self.position += 1
+
+    def value(self) -> Any:
+        """Декодирует очередное значение целиком."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self._fill()
+                continue
+            # Число или литерал в конце буфера может быть обрезан - дочитываем
+            if end == len(self.buffer) and not self.eof:
+                self._fill()
+                continue
+            self.position = end
+            return obj
+
 
 class JsonParser(BaseParser):
     """Парсит JSON файлы и конвертирует в стандартный формат."""
-    
+
+    def __init__(self, stream: bool = False):
+        # stream=True - массив files обходится по элементам без загрузки документа целиком
+        self.stream = stream
+
     def parse(self, file_path: Path) -> ProjectSchema:
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        except Exception as e:
+                return self.parse_stream(f)
+        except (OSError, ValueError) as e:
             raise SystemExit(f"❌ Ошибка чтения JSON: {e}")
-        
+
+    def parse_stream(self, stream) -> ProjectSchema:
+        """Разбирает JSON из открытого потока."""
+        if self.stream:
+            top_level: Dict[str, Any] = {}
+            files = list(self.iter_files(stream, top_level))
+            return self._build_schema(top_level, files)
+
+        data = json.load(stream)
+        if not isinstance(data, dict):
+            raise ValueError("JSON должен содержать объект")
+
         # Определяем архитектуру
         architecture = data.get('architecture', 'layered')
-        
+
         # Обрабатываем файлы в старом и новом формате
-        files_data = data.get('files', [])
+        classifier = self._classifier(architecture, data)
         files = []
-        
-        for item in files_data:
-            if isinstance(item, dict):
-                # Поддержка старого формата (file/class) и нового (path/class)
-                path = item.get('path') or item.get('file', '')
-                class_name = item.get('class', '')
-                
-                if path and class_name:
-                    # Автоматически определяем тип и шаблон файла
-                    file_type = self._detect_file_type(path, architecture)
-                    template = self._detect_template(path, file_type, architecture)
-                    
-                    files.append(self._create_project_file(
-                        path, class_name, file_type, template
-                    ))
-        
+        for item in self._list(data.get('files'), 'files'):
+            project_file = self._convert_item(item, classifier)
+            if project_file:
+                files.append(project_file)
+
+        return self._build_schema(data, files)
+
+    def _build_schema(self, data: Dict[str, Any], files: List[ProjectFile]) -> ProjectSchema:
+        architecture = data.get('architecture', 'layered')
+
         # Создаем метаданные из старого формата
         metadata = {
             'name': data.get('project_name', 'FastAPI Project'),
             'description': data.get('description', ''),
             'architecture': architecture
         }
-        
-        return self._create_project_schema(architecture, files, metadata)
\ No newline at end of file
+        # Пользовательские директории нужны и генератору - он классифицирует пути той же таблицей
+        if data.get('file_types'):
+            metadata['file_types'] = data['file_types']
+        for key in ('async', 'database'):
+            if key in data:
+                metadata[key] = data[key]
+
+        return self._create_project_schema(architecture, files, metadata)
+
+    def _convert_item(self, item, classifier: PathClassifier) -> ProjectFile | None:
+        """Конвертирует элемент files в ProjectFile."""
+        if not isinstance(item, dict):
+            return None
+
+        # Поддержка старого формата (file/class) и нового (path/class)
+        path = item.get('path') or item.get('file', '')
+        class_name = item.get('class', '')
+
+        if not (path and class_name):
+            return None
+        path = self._string(path, 'files.path')
+        class_name = self._string(class_name, 'files.class')
+
+        # Автоматически определяем тип и шаблон файла
+        file_class = classifier.classify(self._normalize_path(path))
+
+        return self._create_project_file(path, class_name, file_class.file_type, file_class.template,
+                                         item.get('cache'))
+
+    def iter_files(self, stream, top_level: Dict[str, Any] | None = None) -> Iterator[ProjectFile]:
+        """
+        Выдает ProjectFile по одному элементу массива files.
+
+        Остальные ключи верхнего уровня декодируются целиком и сохраняются
+        в top_level. Если architecture идет после files, элементы
+        откладываются до конца документа; file_types должен идти до files.
+        """
+        if top_level is None:
+            top_level = {}
+        reader = JsonStreamReader(stream)
+        pending: List[Dict[str, Any]] = []
+        classifier = None
+
+        reader.expect('{')
+        while reader.peek() != '}':
+            key = reader.value()
+            reader.expect(':')
+
+            if key == 'files' and reader.peek() == '[':
+                reader.expect('[')
+                while reader.peek() != ']':
+                    item = reader.value()
+                    if 'architecture' in top_level:
+                        if classifier is None:
+                            classifier = self._classifier(top_level['architecture'], top_level)
+                        project_file = self._convert_item(item, classifier)
+                        if project_file:
+                            yield project_file
+                    else:
+                        pending.append(item)
+                    if reader.peek() == ',':
+                        reader.expect(',')
+                reader.expect(']')
+            elif key == 'files':
+                self._list(reader.value(), 'files')
+            else:
+                if key == 'file_types' and classifier is not None:
+                    raise ValueError("file_types должен идти до files при потоковом разборе")
+                top_level[key] = reader.value()
+
+            if reader.peek() == ',':
+                reader.expect(',')
+        reader.expect('}')
+
+        classifier = self._classifier(top_level.get('architecture', 'layered'), top_level)
+        for item in pending:
+            project_file = self._convert_item(item, classifier)
+            if project_file:
+                yield project_file
@@ -3,33 +3,97 @@
 """
 
 import re
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List
 from .base import BaseParser
+from fastapi_generator.core.classifier import PathClassifier
 from fastapi_generator.core.models import ProjectFile, ProjectSchema
+from fastapi_generator.utils import console
+
+# Символы псевдографики дерева и пробелы в начале строки
+INDENT_PATTERN = re.compile(r'[├└│─\s]*')
+# Основной паттерн строки с файлом: filename.py # → ClassName
+PY_FILE_PATTERN = re.compile(r'([a-zA-Z0-9_.-]+\.py)\s*#\s*→\s*([A-Za-z_]\w*)')
+
+
+@dataclass
+class TxtParseState:
+    """Состояние потокового разбора: корень, текущий путь и признаки архитектуры."""
+    root_dir: str = ""
+    path_parts: List[str] = field(default_factory=list)
+    files_count: int = 0
+    is_clean: bool = False
+    is_layered: bool = False
+
+    def observe(self, path: str) -> None:
+        """Обновляет признаки архитектуры по пути очередного файла."""
+        self.files_count += 1
+        if self.is_clean:
+            return
+        if 'domain/entities' in path or 'application/use_cases' in path:
+            self.is_clean = True
+        elif not self.is_layered:
+            self.is_layered = (('services/' in path and 'repositories/' in path)
+                               or 'api/v1/endpoints' in path)
+
+    @property
+    def architecture(self) -> str:
+        if self.is_clean:
+            return 'clean'
+        if self.is_layered:
+            return 'layered'
+        return 'modular'
 
 
 class TxtParser(BaseParser):
     """Парсит TXT файлы и конвертирует в стандартный формат."""
     
     def parse(self, file_path: Path) -> ProjectSchema:
-        print(f"🔍 Парсим TXT файл: {file_path}")
+        console.info(f"🔍 Парсим TXT файл: {file_path}")
         
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+            return self.parse_stream(f)
+    
+    def parse_stream(self, lines: Iterable[str]) -> ProjectSchema:
+        """Разбирает дерево из итератора строк (файл, сокет, список) за один проход."""
+        state = TxtParseState()
+        files = list(self.iter_files(lines, state))
+        architecture = state.architecture
+        
+        metadata = {
+            'name': 'Generated from TXT',
+            'description': 'Автоматически сгенерировано из TXT схемы',
+            'architecture': architecture,
+            'root_dir': state.root_dir
+        }
         
-        files = []
-        current_path = ""
-        root_dir = ""
+        console.info(f"📄 Распознано {len(files)} файлов, архитектура: {architecture}")
+        return self._create_project_schema(architecture, files, metadata)
+    
+    def iter_files(self, lines: Iterable[str], state: TxtParseState | None = None) -> Iterator[ProjectFile]:
+        """
+        Лениво выдает ProjectFile по мере чтения строк.
         
-        for line in content.split('\n'):
+        В памяти держится только стек текущего пути, поэтому расход памяти
+        пропорционален глубине дерева, а не числу строк. Архитектура
+        определяется в том же проходе и доступна в state после исчерпания итератора.
+        """
+        if state is None:
+            state = TxtParseState()
+        path_parts = state.path_parts
+        # Архитектура известна только после прохода - типы определяются по правилам modular
+        classifier = self._classifier('modular')
+        
+        for line in lines:
             line = line.rstrip('\n')
             if not line.strip():
                 continue
-                
-            # Определяем уровень вложенности
-            indent_level = self._get_indent_level(line)
-            clean_line = self._clean_line(line)
+            
+            # Уровень вложенности и очищенная строка за одно сопоставление
+            indent_end = INDENT_PATTERN.match(line).end()
+            indent_level = indent_end // 4
+            clean_line = line[indent_end:].strip()
             
             # Пропускаем комментарии без файлов
             if clean_line.startswith('#') and '.py' not in clean_line:
@@ -37,59 +101,26 @@ class TxtParser(BaseParser):
             
             # Если это корневая директория (уровень 0 и заканчивается на /)
             if indent_level == 0 and clean_line.endswith('/'):
-                root_dir = clean_line.rstrip('/')
-                current_path = root_dir
+                state.root_dir = clean_line.rstrip('/')
+                path_parts[:] = state.root_dir.split('/') if state.root_dir else []
                 continue
             
             # Если это директория (заканчивается на /)
             if clean_line.endswith('/'):
-                dir_name = clean_line.rstrip('/')
-                if indent_level == 0:
-                    current_path = dir_name
-                else:
-                    current_path_parts = current_path.split('/') if current_path else []
-                    if len(current_path_parts) > indent_level:
-                        current_path_parts = current_path_parts[:indent_level]
-                    current_path_parts.append(dir_name)
-                    current_path = '/'.join(current_path_parts)
+                if len(path_parts) > indent_level:
+                    del path_parts[indent_level:]
+                path_parts.append(clean_line.rstrip('/'))
                 continue
             
             # Если это файл .py
-            project_file = self._parse_py_file_line(clean_line, current_path)
+            project_file = self._parse_py_file_line(clean_line, '/'.join(path_parts), classifier)
             if project_file:
-                files.append(project_file)
-        
-        # Определяем архитектуру по содержимому
-        architecture = self._detect_architecture_from_content(content, files)
-        
-        metadata = {
-            'name': 'Generated from TXT',
-            'description': 'Автоматически сгенерировано из TXT схемы',
-            'architecture': architecture,
-            'root_dir': root_dir
-        }
-        
-        print(f"📄 Распознано {len(files)} файлов, архитектура: {architecture}")
-        return self._create_project_schema(architecture, files, metadata)
+                state.observe(project_file.path)
+                yield project_file
     
-    def _get_indent_level(self, line: str) -> int:
-        """Определяет уровень вложенности."""
-        indent_match = re.match(r'^([├└│─\s]*)', line)
-        if indent_match:
-            indent_chars = indent_match.group(1)
-            normalized_indent = len(indent_chars.replace('├', ' ').replace('└', ' ').replace('│', ' ').replace('─', ' '))
-            return normalized_indent // 4
-        return 0
-    
-    def _clean_line(self, line: str) -> str:
-        """Очищает строку от символов форматирования."""
-        return re.sub(r'^[├└│─\s]*', '', line).strip()
-    
-    def _parse_py_file_line(self, line: str, current_path: str):
+    def _parse_py_file_line(self, line: str, current_path: str, classifier: PathClassifier):
         """Парсит строку с указанием .py файла."""
-        # Ищем основной паттерн: filename.py # → ClassName
-        pattern = r'([a-zA-Z0-9_.-]+\.py)\s*#\s*→\s*([A-Za-z_]\w*)'
-        match = re.search(pattern, line)
+        match = PY_FILE_PATTERN.search(line)
         if match:
             filename = match.group(1).strip()
             class_name = match.group(2).strip()
@@ -101,26 +132,8 @@ class TxtParser(BaseParser):
                 full_path = filename
             
             # Автоматически определяем тип и шаблон
-            file_type = self._detect_file_type(full_path, 'modular')
-            template = self._detect_template(full_path, file_type, 'modular')
+            file_class = classifier.classify(full_path)
             
-            return self._create_project_file(full_path, class_name, file_type, template)
+            return self._create_project_file(full_path, class_name, file_class.file_type, file_class.template)
         
         return None
-    
-    def _detect_architecture_from_content(self, content: str, files: List[ProjectFile]) -> str:
-        """Определяет архитектуру по содержимому TXT."""
-        content_lower = content.lower()
-        paths = [f.path for f in files]
-        
-        # Проверяем пути файлов для определения архитектуры
-        if any('domain/entities' in path for path in paths):
-            return 'clean'
-        elif any('application/use_cases' in path for path in paths):
-            return 'clean'
-        elif any('services/' in path and 'repositories/' in path for path in paths):
-            return 'layered'
-        elif any('api/v1/endpoints' in path for path in paths):
-            return 'layered'
-        else:
-            return 'modular'
\ No newline at end of file
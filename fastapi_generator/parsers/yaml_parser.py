@@ -4,64 +4,275 @@
 
 import yaml
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, Iterator, List
 from .base import BaseParser
+from fastapi_generator.core.classifier import PathClassifier
 from fastapi_generator.core.models import ProjectFile, ProjectSchema
 
+# C-загрузчик из libyaml в разы быстрее чистого Python, если PyYAML собран с ним
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+
+class YamlStreamState:
+    """Данные, собранные потоковым разбором помимо файлов."""
+
+    def __init__(self):
+        self.metadata: Dict[str, Any] | None = None
+        self.root_dir = ''
+        # Файлы, встреченные до metadata: архитектура для них еще неизвестна
+        self.pending: List[Dict[str, Any]] = []
+        self.files_started = False
+        # Классификатор путей: создается, когда metadata (архитектура и file_types) уже прочитана
+        self.classifier: PathClassifier | None = None
+
 
 class YamlParser(BaseParser):
     """Парсит YAML файлы со стандартизированной структурой."""
-    
+
+    def __init__(self, stream: bool = False):
+        # stream=True - обход событий парсера без построения документа целиком
+        self.stream = stream
+
     def parse(self, file_path: Path) -> ProjectSchema:
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-        except Exception as e:
+                return self.parse_stream(f)
+        except (yaml.YAMLError, OSError, ValueError) as e:
             raise SystemExit(f"❌ Ошибка чтения YAML: {e}")
-        
+
+    def parse_stream(self, stream) -> ProjectSchema:
+        """Разбирает YAML из открытого потока или строки."""
+        if self.stream:
+            return self._parse_events(stream)
+
+        data = yaml.load(stream, Loader=SafeLoader)
         if not isinstance(data, dict):
             raise SystemExit("❌ YAML должен содержать словарь.")
-        
+
         # Извлекаем метаданные
-        metadata = data.get('metadata', {})
+        metadata = self._mapping(data.get('metadata'), 'metadata')
         architecture = metadata.get('architecture', 'layered')
-        structure = data.get('structure', {})
-        
+        structure = self._mapping(data.get('structure'), 'structure')
+
         # Корневая директория
-        root_dir = structure.get('root_dir', '')
-        if root_dir and not root_dir.endswith('/'):
-            root_dir += '/'
-        
+        root_dir = self._normalize_root_dir(structure.get('root_dir'))
+
         # Обрабатываем файлы
-        files_data = structure.get('files', [])
+        files_data = self._list(structure.get('files'), 'structure.files')
         files = []
-        
+
+        classifier = self._classifier(architecture, metadata)
         for item in files_data:
-            if isinstance(item, dict):
-                path = item.get('path', '')
-                class_name = item.get('class', '')
-                file_type = item.get('type', 'default')
-                template = item.get('template', 'default')
-                
-                if path and class_name:
-                    # Добавляем корневую директорию если указана
-                    if root_dir and not path.startswith(root_dir):
-                        full_path = f"{root_dir}{path}"
-                    else:
-                        full_path = path
-                    
-                    # Автодетект типа и шаблона если не указаны
-                    if file_type == 'default':
-                        file_type = self._detect_file_type(full_path, architecture)
-                    if template == 'default':
-                        template = self._detect_template(full_path, file_type, architecture)
-                    
-                    files.append(self._create_project_file(
-                        full_path, class_name, file_type, template
-                    ))
-        
+            project_file = self._convert_item(item, classifier, root_dir)
+            if project_file:
+                files.append(project_file)
+
         # Добавляем root_dir в метаданные
         if root_dir:
             metadata['root_dir'] = root_dir.rstrip('/')
-        
-        return self._create_project_schema(architecture, files, metadata)
\ No newline at end of file
+
+        return self._create_project_schema(architecture, files, metadata)
+
+    def _normalize_root_dir(self, root_dir: str | None) -> str:
+        root_dir = self._normalize_path(self._string(root_dir or '', 'structure.root_dir'))
+        if root_dir and not root_dir.endswith('/'):
+            root_dir += '/'
+        return root_dir
+
+    def _convert_item(self, item, classifier: PathClassifier, root_dir: str) -> ProjectFile | None:
+        """Конвертирует элемент structure.files в ProjectFile."""
+        if not isinstance(item, dict):
+            return None
+
+        path = item.get('path', '')
+        class_name = item.get('class', '')
+        file_type = item.get('type', 'default')
+        template = item.get('template', 'default')
+
+        if not (path and class_name):
+            return None
+        path = self._string(path, 'files.path')
+        class_name = self._string(class_name, 'files.class')
+        file_type = self._string(file_type, 'files.type')
+        template = self._string(template, 'files.template')
+
+        # Добавляем корневую директорию если указана (сравниваются нормализованные пути,
+        # иначе путь с обратными слешами получил бы корень дважды)
+        path = self._normalize_path(path)
+        if root_dir and not path.startswith(root_dir):
+            full_path = f"{root_dir}{path}"
+        else:
+            full_path = path
+
+        # Автодетект типа и шаблона если не указаны
+        if file_type == 'default':
+            file_class = classifier.classify(full_path)
+            file_type = file_class.file_type
+            if template == 'default':
+                template = file_class.template
+        elif template == 'default':
+            template = classifier.template_for(file_type)
+
+        return self._create_project_file(full_path, class_name, file_type, template, item.get('cache'))
+
+    def _parse_events(self, stream) -> ProjectSchema:
+        """Потоковый режим: собирает схему из iter_files."""
+        state = YamlStreamState()
+        files = list(self.iter_files(stream, state))
+
+        metadata = state.metadata if state.metadata is not None else {}
+        architecture = metadata.get('architecture', 'layered')
+        if state.root_dir:
+            metadata['root_dir'] = state.root_dir.rstrip('/')
+
+        return self._create_project_schema(architecture, files, metadata)
+
+    def iter_files(self, stream, state: YamlStreamState | None = None) -> Iterator[ProjectFile]:
+        """
+        Выдает ProjectFile по одному, обходя события парсера.
+
+        В памяти строится только текущий элемент structure.files, а не весь
+        документ. Файлы, встреченные до секции metadata, откладываются до ее
+        появления (архитектура нужна для определения шаблонов); root_dir
+        должен идти в structure раньше files.
+        """
+        if state is None:
+            state = YamlStreamState()
+
+        loader = SafeLoader(stream)
+        try:
+            self._expect(loader, yaml.StreamStartEvent)
+            if loader.check_event(yaml.StreamEndEvent):
+                raise SystemExit("❌ YAML должен содержать словарь.")
+            self._expect(loader, yaml.DocumentStartEvent)
+            if not loader.check_event(yaml.MappingStartEvent):
+                raise SystemExit("❌ YAML должен содержать словарь.")
+            loader.get_event()
+
+            while not loader.check_event(yaml.MappingEndEvent):
+                key = self._construct(loader, loader.get_event())
+                if key == 'structure' and loader.check_event(yaml.MappingStartEvent):
+                    loader.get_event()
+                    yield from self._iter_structure(loader, state)
+                elif key == 'structure':
+                    self._mapping(self._construct(loader, loader.get_event()), 'structure')
+                elif key == 'metadata':
+                    metadata = self._construct(loader, loader.get_event())
+                    state.metadata = self._mapping(metadata, 'metadata')
+                    yield from self._flush_pending(state)
+                else:
+                    self._skip(loader)
+        finally:
+            loader.dispose()
+
+        # metadata так и не встретилась - архитектура по умолчанию
+        if state.metadata is None:
+            state.metadata = {}
+        yield from self._flush_pending(state)
+
+    def _iter_structure(self, loader, state: YamlStreamState) -> Iterator[ProjectFile]:
+        """Обходит ключи секции structure."""
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = self._construct(loader, loader.get_event())
+            if key == 'files' and loader.check_event(yaml.SequenceStartEvent):
+                loader.get_event()
+                state.files_started = True
+                while not loader.check_event(yaml.SequenceEndEvent):
+                    item = self._construct(loader, loader.get_event())
+                    if state.metadata is None:
+                        state.pending.append(item)
+                        continue
+                    project_file = self._convert_stream_item(item, state)
+                    if project_file:
+                        yield project_file
+                loader.get_event()
+            elif key == 'files':
+                self._list(self._construct(loader, loader.get_event()), 'structure.files')
+            elif key == 'root_dir':
+                if state.files_started:
+                    raise SystemExit("❌ В потоковом режиме root_dir должен идти в structure до files.")
+                state.root_dir = self._normalize_root_dir(self._construct(loader, loader.get_event()))
+            else:
+                self._skip(loader)
+        loader.get_event()
+
+    def _flush_pending(self, state: YamlStreamState) -> Iterator[ProjectFile]:
+        pending, state.pending = state.pending, []
+        for item in pending:
+            project_file = self._convert_stream_item(item, state)
+            if project_file:
+                yield project_file
+
+    def _convert_stream_item(self, item, state: YamlStreamState) -> ProjectFile | None:
+        if state.classifier is None:
+            state.classifier = self._classifier(state.metadata.get('architecture', 'layered'), state.metadata)
+        return self._convert_item(item, state.classifier, state.root_dir)
+
+    def _expect(self, loader, event_class) -> None:
+        event = loader.get_event()
+        if not isinstance(event, event_class):
+            raise yaml.YAMLError(f"ожидалось {event_class.__name__}, получено {type(event).__name__}")
+
+    def _skip(self, loader) -> None:
+        """Пропускает значение целиком, не конструируя объекты."""
+        depth = 0
+        while True:
+            event = loader.get_event()
+            if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+                depth += 1
+            elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                depth -= 1
+            if depth == 0:
+                return
+
+    def _construct(self, loader, event) -> Any:
+        """Строит Python-объект из поддерева, начинающегося с event."""
+        node = self._compose(loader, event, {})
+        return loader.construct_document(node)
+
+    def _compose(self, loader, event, anchors: Dict[str, yaml.Node]) -> yaml.Node:
+        """Собирает узел из событий с разрешением тегов, как это делает Composer."""
+        if isinstance(event, yaml.AliasEvent):
+            if event.anchor not in anchors:
+                raise yaml.YAMLError(f"якорь {event.anchor!r} не найден в текущем элементе")
+            return anchors[event.anchor]
+
+        if isinstance(event, yaml.ScalarEvent):
+            tag = event.tag
+            if tag is None or tag == '!':
+                tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+            node = yaml.ScalarNode(tag, event.value, event.start_mark, event.end_mark, style=event.style)
+            if event.anchor:
+                anchors[event.anchor] = node
+            return node
+
+        if isinstance(event, yaml.SequenceStartEvent):
+            tag = event.tag
+            if tag is None or tag == '!':
+                tag = loader.resolve(yaml.SequenceNode, None, event.implicit)
+            node = yaml.SequenceNode(tag, [], event.start_mark, None, flow_style=event.flow_style)
+            if event.anchor:
+                anchors[event.anchor] = node
+            while not loader.check_event(yaml.SequenceEndEvent):
+                node.value.append(self._compose(loader, loader.get_event(), anchors))
+            node.end_mark = loader.get_event().end_mark
+            return node
+
+        if isinstance(event, yaml.MappingStartEvent):
+            tag = event.tag
+            if tag is None or tag == '!':
+                tag = loader.resolve(yaml.MappingNode, None, event.implicit)
+            node = yaml.MappingNode(tag, [], event.start_mark, None, flow_style=event.flow_style)
+            if event.anchor:
+                anchors[event.anchor] = node
+            while not loader.check_event(yaml.MappingEndEvent):
+                key_node = self._compose(loader, loader.get_event(), anchors)
+                value_node = self._compose(loader, loader.get_event(), anchors)
+                node.value.append((key_node, value_node))
+            node.end_mark = loader.get_event().end_mark
+            return node
+
+        raise yaml.YAMLError(f"неожиданное событие {type(event).__name__}")
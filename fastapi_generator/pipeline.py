@@ -0,0 +1,406 @@
+"""
+Полный цикл генерации проекта: разбор схемы, рендеринг и запись.
+
+Используется CLI (main.py) и пакетным режимом.
+"""
+
+import shutil
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any, BinaryIO, List, Mapping
+
+from .core.database import DatabaseOptions
+from .core.hooks import GenerationHooks, NULL_HOOKS
+from .core.validation import SchemaIssue, validate_schema
+from .parsers import SchemaParser
+from .utils import console
+from .utils.file_utils import zip_directory, ensure_output_dir, get_output_path, project_slug
+from .utils.manifest import Manifest
+from .utils.render_cache import DEFAULT_MAX_SIZE, RenderCache, parse_size
+from .utils.zip_writer import ZipSettings
+from .utils.sinks import (
+    OutputSink, FileSystemSink, ThreadedFileSystemSink, ZipSink, TarSink, IncrementalSink
+)
+
+
+PROFILE_MODES = (None, 'json', 'cprofile')
+
+
+@dataclass
+class GenerationOptions:
+    """Параметры генерации одного проекта (соответствуют флагам CLI)."""
+    input: str
+    output: str = 'fastapi_project'
+    no_init: bool = False
+    zip: bool = False
+    zip_only: bool = False
+    tar_stdout: bool = False
+    with_tests: bool = False
+    # Асинхронный режим БД (AsyncSession, aiosqlite); включается и metadata.async схемы
+    async_db: bool = False
+    jobs: int = 1
+    stream: bool = False
+    full: bool = False
+    prune: bool = False
+    # None, 'json' (отчет по фазам) или 'cprofile' (отчет + pstats)
+    profile: str | None = None
+    # Только вывести план проекта, без ввода-вывода
+    plan: bool = False
+    # Упаковка ZIP: метод (stored, deflate, bzip2, lzma), уровень и потоки сжатия (None - по числу CPU)
+    zip_compression: str = 'deflate'
+    zip_level: int | None = None
+    zip_jobs: int | None = None
+    # Постоянный кэш рендеринга между запусками: директория (None - без кэша) и лимит размера
+    cache_dir: str | None = None
+    cache_max_size: int | str = DEFAULT_MAX_SIZE
+
+    @classmethod
+    def from_mapping(cls, values: Mapping[str, Any]) -> 'GenerationOptions':
+        """Создает параметры из словаря (argparse.Namespace, элемент манифеста); ключи с '-' допустимы."""
+        known = {field.name for field in fields(cls)}
+        options = {}
+        for key, value in values.items():
+            name = key.replace('-', '_')
+            if name not in known:
+                raise ValueError(f"Неизвестный параметр генерации: {key}")
+            options[name] = value
+        return cls(**options)
+
+    def validate(self) -> None:
+        """Проверяет совместимость параметров."""
+        if self.jobs < 1:
+            raise ValueError("jobs должен быть положительным числом")
+        if self.tar_stdout and (self.zip or self.zip_only):
+            raise ValueError("tar_stdout нельзя совмещать с zip и zip_only")
+        if self.profile not in PROFILE_MODES:
+            raise ValueError(f"profile: допустимые значения {', '.join(map(str, PROFILE_MODES))}")
+        self.zip_settings().validate()
+        parse_size(self.cache_max_size)
+
+    def render_cache(self) -> RenderCache | None:
+        if not self.cache_dir:
+            return None
+        return RenderCache(Path(self.cache_dir), parse_size(self.cache_max_size))
+
+    def zip_settings(self) -> ZipSettings:
+        return ZipSettings(self.zip_compression, self.zip_level, self.zip_jobs)
+
+
+@dataclass
+class GenerationResult:
+    """Итог генерации проекта."""
+    architecture: str
+    files_count: int
+    project_path: Path | str | None = None
+    zip_path: Path | None = None
+    files_written: int = 0
+    bytes_written: int = 0
+
+
+def generate_project(options: GenerationOptions, archive_stream: BinaryIO | None = None,
+                     hooks: GenerationHooks | None = None) -> GenerationResult:
+    """
+    Парсит схему и генерирует проект согласно параметрам.
+
+    hooks получают события фаз и файлов; с options.profile к ним добавляется
+    профилировщик, отчет которого сохраняется в output/.
+    """
+    if hooks is None:
+        hooks = NULL_HOOKS
+    if not options.profile:
+        return _generate_project(options, archive_stream, hooks)
+
+    import cProfile
+    from .core.hooks import CompositeHooks
+    from .utils.profiling import PhaseProfiler, print_profile_summary
+
+    profiler = PhaseProfiler()
+    cprofile = cProfile.Profile() if options.profile == 'cprofile' else None
+    with profiler:
+        if cprofile is not None:
+            cprofile.enable()
+        try:
+            result = _generate_project(options, archive_stream, CompositeHooks(hooks, profiler))
+        finally:
+            if cprofile is not None:
+                cprofile.disable()
+
+    report_path = get_output_path(f"{options.output}.profile.json")
+    report = profiler.write_json(report_path, input=str(options.input), output=options.output,
+                                 architecture=result.architecture, files_count=result.files_count)
+    print_profile_summary(report)
+    console.info(f"📈 Отчет профилирования: {report_path}")
+    if cprofile is not None:
+        stats_path = get_output_path(f"{options.output}.pstats")
+        cprofile.dump_stats(stats_path)
+        console.info(f"📈 Статистика cProfile: {stats_path} (python -m pstats {stats_path})")
+    return result
+
+
+def _generate_project(options: GenerationOptions, archive_stream: BinaryIO | None,
+                      hooks: GenerationHooks) -> GenerationResult:
+    input_path = Path(options.input)
+    output_name = options.output
+
+    # Парсим схему
+    parser = SchemaParser(stream=options.stream)
+    with hooks.phase('parse'):
+        project_schema = parser.parse_file(input_path)
+
+    architecture = project_schema.architecture
+    file_data = project_schema.files
+
+    console.info(f"🔍 Результат парсинга:")
+    console.info(f"   Архитектура: {architecture}")
+    console.info(f"   Файлов: {len(file_data)}")
+    console.info(f"   Проект: {project_schema.project_name}")
+    if project_schema.description:
+        console.info(f"   Описание: {project_schema.description}")
+
+    for i, project_file in enumerate(file_data[:10]):
+        console.detail(f"   {i}: {project_file.normalized_path} -> {project_file.class_name}")
+    if len(file_data) > 10:
+        console.detail(f"   ... и еще {len(file_data) - 10} файлов")
+
+    if not file_data:
+        raise SystemExit("❌ Не распознано ни одного .py-файла.")
+
+    # Вся схема проверяется до первой записи; --plan показывает проблемы вместе с планом
+    with hooks.phase('validate'):
+        issues = validate_schema(project_schema, with_tests=options.with_tests)
+    if options.plan:
+        return _print_plan(options, architecture, file_data, hooks, project_schema.file_types, issues)
+    _report_schema_issues(issues)
+
+    # Создаем output директорию (--plan не выполняет ввода-вывода)
+    if archive_stream is None:
+        output_dir = ensure_output_dir()
+        console.info(f"📁 Выходная директория: {output_dir.resolve()}")
+
+    console.info(f"🏗️  Создание FastAPI проекта: {project_schema.project_name}")
+    console.info(f"📋 Архитектура: {architecture}")
+
+    # Корень проекта в текущей директории (для архивов - только префикс имен записей)
+    temp_project_root = Path(output_name).resolve()
+
+    # Обработка выходных результатов
+    final_project_path = None
+    zip_file_path = None
+
+    # Рендеринг идет в текущем потоке, запись - в приемнике
+    if archive_stream is not None:
+        console.info("📦 Запись tar-архива в stdout")
+        sink = TarSink(temp_project_root, archive_stream)
+    elif options.zip_only:
+        # Файлы пишутся сразу в архив, без временной папки
+        zip_file_path = get_output_path(f"{output_name}.zip")
+        console.info(f"📦 Запись напрямую в архив: {zip_file_path}")
+        sink = ZipSink(temp_project_root, zip_file_path, options.zip_settings())
+    else:
+        incremental = not options.zip and not options.full and Manifest.exists(temp_project_root)
+        # Без манифеста прошлого запуска (или с --full) удаляем существующую папку
+        if not incremental and temp_project_root.exists():
+            shutil.rmtree(temp_project_root)
+        sink = ThreadedFileSystemSink(options.jobs) if options.jobs > 1 else FileSystemSink()
+        if not options.zip:
+            # Манифест пишется всегда, чтобы следующий запуск был инкрементальным
+            sink = IncrementalSink(sink, temp_project_root, prune=options.prune)
+            if incremental:
+                console.info(f"♻️  Инкрементальное обновление: {temp_project_root}")
+
+    cache = options.render_cache()
+    render_project(architecture, file_data, temp_project_root, sink,
+                   with_init=not options.no_init, with_tests=options.with_tests, hooks=hooks, cache=cache,
+                   file_types=project_schema.file_types,
+                   async_db=options.async_db or project_schema.async_db, database=project_schema.database)
+    if cache is not None:
+        cache.close()
+        console.info(f"🗃️  Кэш рендеринга {cache.directory}: {cache.summary()}")
+
+    # Дозапись очередей потоков-писателей, манифест, закрытие архива
+    with hooks.phase('finalize'):
+        errors = sink.close()
+    _report_write_errors(errors)
+    if isinstance(sink, IncrementalSink):
+        console.info(f"♻️  Записано: {sink.files_written}, без изменений: {sink.files_skipped}, "
+              f"удалено: {sink.files_pruned}")
+
+    if options.zip and not options.zip_only:
+        # Создаем ZIP в output директории
+        zip_filename = f"{output_name}.zip"
+        zip_file_path = get_output_path(zip_filename)
+        console.info(f"📦 Упаковка в архив: {zip_file_path}")
+        with hooks.phase('zip'):
+            zip_directory(temp_project_root, zip_file_path, options.zip_settings())
+
+    if archive_stream is not None:
+        final_project_path = "stdout"
+    elif options.zip_only:
+        final_project_path = zip_file_path
+    else:
+        if options.zip:
+            # Переносим папку проекта в output
+            final_project_dir = get_output_path(output_name)
+            if final_project_dir.exists():
+                shutil.rmtree(final_project_dir)
+            shutil.move(str(temp_project_root), str(final_project_dir))
+            final_project_path = final_project_dir
+            console.info(f"📁 Проект перемещен в: {final_project_path}")
+        else:
+            # Без ZIP - оставляем папку в текущей директории
+            final_project_path = temp_project_root
+
+    # Статистика - ТОЛЬКО ОДИН РАЗ
+    _print_statistics(file_data, architecture, final_project_path, options, zip_file_path)
+
+    console.info(f"\n🚀 Для начала работы:")
+    if archive_stream is not None:
+        console.info(f"   📦 Архив передан в stdout")
+    elif not options.zip_only:
+        console.info(f"   cd {final_project_path}")
+        console.info(f"   uv sync")
+        console.info(f"   uv run dev")
+    else:
+        console.info(f"   📦 Архив готов: {final_project_path}")
+
+    return GenerationResult(
+        architecture=architecture,
+        files_count=len(file_data),
+        project_path=final_project_path,
+        zip_path=zip_file_path,
+        files_written=sink.files_written,
+        bytes_written=sink.bytes_written,
+    )
+
+
+def render_project(architecture: str, file_data, project_root: Path, sink: OutputSink,
+                   with_init: bool = True, with_tests: bool = False,
+                   hooks: GenerationHooks | None = None, cache: RenderCache | None = None,
+                   file_types: Mapping[str, Any] | None = None, async_db: bool = False,
+                   database: DatabaseOptions | None = None) -> None:
+    """
+    Рендерит файлы проекта в приемник; закрывать приемник (и кэш) должен вызывающий код.
+
+    file_types - пользовательские директории схемы (ProjectSchema.file_types):
+    генератор классифицирует пути так же, как парсер. async_db - асинхронный
+    режим БД: зависимости проекта и шаблоны тестов для AsyncSession. database -
+    пул соединений и PRAGMA SQLite (ProjectSchema.database) для шаблонов настроек.
+    """
+    project_gen, plan = plan_project(architecture, file_data, project_root, sink, with_init, with_tests,
+                                     hooks, cache, file_types, async_db, database)
+    project_gen.execute_plan(plan)
+
+
+def plan_project(architecture: str, file_data, project_root: Path, sink: OutputSink,
+                 with_init: bool = True, with_tests: bool = False,
+                 hooks: GenerationHooks | None = None, cache: RenderCache | None = None,
+                 file_types: Mapping[str, Any] | None = None, async_db: bool = False,
+                 database: DatabaseOptions | None = None):
+    """
+    Строит план проекта без записи; возвращает (ProjectGenerator, ProjectPlan).
+
+    Для вызывающих, которым ошибки плана нужны до начала вывода (сервер
+    отвечает на конфликт путей статусом, а не оборванным архивом):
+    plan.check() до записи, затем project_gen.execute_plan(plan).
+    """
+    return _plan_project(architecture, file_data, project_root, sink,
+                         with_init, with_tests, hooks, cache, file_types, async_db, database)
+
+
+def _plan_project(architecture: str, file_data, project_root: Path, sink: OutputSink | None,
+                  with_init: bool, with_tests: bool, hooks: GenerationHooks | None,
+                  cache: RenderCache | None = None, file_types: Mapping[str, Any] | None = None,
+                  async_db: bool = False, database: DatabaseOptions | None = None):
+    """Строит общий план проекта и тестов; возвращает (ProjectGenerator, ProjectPlan)."""
+    # Генераторы и шаблоны импортируются здесь, а не при загрузке модуля
+    from app_templates import ASYNC_ENTITY_BLOCKS, ASYNC_TEMPLATES, ENTITY_BLOCKS, TEMPLATES
+    from .core.classifier import get_classifier
+    from .generators import ProjectGenerator
+
+    # ConfigGenerator вызывается внутри ProjectGenerator
+    classifier = get_classifier(architecture, file_types)
+    project_context = {
+        **(database or DatabaseOptions()).context(),
+        'project_slug': project_slug(project_root),
+    }
+    templates, blocks = (ASYNC_TEMPLATES, ASYNC_ENTITY_BLOCKS) if async_db else (TEMPLATES, ENTITY_BLOCKS)
+    project_gen = ProjectGenerator(architecture, templates, sink, hooks, cache, classifier, async_db,
+                                   project_context, blocks)
+    plan = project_gen.build_plan(file_data, project_root, with_init=with_init)
+
+    # Генерируем тесты только если указан флаг
+    if with_tests:
+        from .generators import TestGenerator
+        # Тесты импортируют те же модули, что рендерит FileGenerator
+        file_gen = project_gen.file_generator
+        test_gen = TestGenerator(architecture, project_gen.sink, hooks, cache, classifier, async_db,
+                                 file_gen.layout, file_gen.entity_contexts)
+        with test_gen.hooks.phase('plan'):
+            test_gen.plan(project_root, file_data, plan)
+    return project_gen, plan
+
+
+def _print_plan(options: GenerationOptions, architecture: str, file_data,
+                hooks: GenerationHooks, file_types: Mapping[str, Any] | None = None,
+                issues: List[SchemaIssue] = ()) -> GenerationResult:
+    """Выводит план проекта и проблемы схемы без создания файлов (--plan)."""
+    project_root = Path(options.output).resolve()
+    _, plan = _plan_project(architecture, file_data, project_root, None,
+                            not options.no_init, options.with_tests, hooks, file_types=file_types)
+    for line in plan.describe():
+        print(line)
+    for conflict in plan.check():
+        print(f"   ❌ Конфликт путей: {conflict}")
+    for issue in issues:
+        print(f"   ❌ Схема: {issue}")
+    print("ℹ️  Файлы с '?' создаются, только если их еще нет на диске")
+    return GenerationResult(architecture=architecture, files_count=len(file_data))
+
+
+def _report_schema_issues(issues: List[SchemaIssue]) -> None:
+    """Выводит все проблемы схемы и прерывает работу до записи."""
+    if not issues:
+        return
+    for issue in issues:
+        console.warn(f"❌ Схема: {issue}")
+    raise SystemExit(f"❌ Схема содержит ошибок: {len(issues)}; ничего не записано")
+
+
+def _report_write_errors(errors):
+    """Выводит ошибки записи по каждому файлу и прерывает работу."""
+    if not errors:
+        return
+    for write_error in errors:
+        console.warn(f"❌ Ошибка записи {write_error.path}: {write_error.error}")
+    raise SystemExit(f"❌ Не удалось записать файлов: {len(errors)}")
+
+
+def _print_statistics(file_data, architecture, project_path, options, zip_path=None):
+    """Выводит статистику проекта."""
+    entities = services = routers = 0
+    # Один проход по схеме: на больших схемах это миллионы файлов
+    for project_file in file_data:
+        path = project_file.normalized_path
+        if 'entities' in path or 'models' in path:
+            entities += 1
+        if 'services' in path or 'use_cases' in path:
+            services += 1
+        if 'routers' in path or 'endpoints' in path:
+            routers += 1
+    total_files = len(file_data)
+
+    console.info(f"📊 Статистика:")
+    console.info(f"   🏗️  Архитектура: {architecture}")
+    console.info(f"   📦 Модели/Сущности: {entities}")
+    console.info(f"   ⚙️  Сервисы/Use Cases: {services}")
+    console.info(f"   🌐 Роутеры: {routers}")
+    console.info(f"   📁 Всего файлов: {total_files}")
+
+    if project_path:
+        if options.zip_only or options.tar_stdout:
+            console.info(f"✅ Создан архив: {project_path}")
+        else:
+            console.info(f"✅ Создан проект: {project_path}")
+
+    if zip_path and not options.zip_only:
+        console.info(f"📦 Дополнительный архив: {zip_path}")
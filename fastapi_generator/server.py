@@ -0,0 +1,320 @@
+"""
+HTTP-сервер генератора: принимает схему в теле запроса и отдает проект ZIP-потоком.
+
+Парсеры и скомпилированные шаблоны создаются один раз при старте и
+переиспользуются между запросами. Запросы не трогают файловую систему:
+проект пишется ZipSink прямо в сокет, а корень проекта - относительный
+путь, который используется только как префикс имен записей архива.
+
+    POST /generate?name=my_project&format=yaml&with_tests=1&async_db=1&compression=deflate&level=6
+    GET  /health
+"""
+
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from pathlib import Path
+from typing import Dict, Iterator
+from urllib.parse import parse_qs, urlsplit
+
+import yaml
+
+from .core.template_engine import precompile_all
+from .core.validation import validate_schema
+from .parsers import SchemaParser
+from .pipeline import plan_project
+from .utils.render_cache import RenderCache
+from .utils.sinks import ZipSink
+from .utils.zip_writer import ZipSettings
+
+# Ограничение размера схемы в теле запроса
+MAX_BODY_SIZE = 64 * 1024 * 1024
+# Размер чанка HTTP-ответа: архив пишется мелкими кусками, копим их в буфере
+CHUNK_SIZE = 64 * 1024
+
+PROJECT_NAME_PATTERN = re.compile(r'[A-Za-z0-9_][A-Za-z0-9_.-]*')
+
+# Формат схемы по параметру format или Content-Type
+FORMAT_SUFFIXES = {'yaml': '.yaml', 'yml': '.yaml', 'json': '.json', 'txt': '.txt'}
+CONTENT_TYPE_SUFFIXES = {
+    'application/json': '.json',
+    'application/yaml': '.yaml',
+    'application/x-yaml': '.yaml',
+    'text/yaml': '.yaml',
+    'text/x-yaml': '.yaml',
+    'text/plain': '.txt',
+}
+
+TRUE_VALUES = {'1', 'true', 'yes', 'on'}
+
+
+class RequestError(Exception):
+    """Ошибка запроса клиента, возвращается ответом 4xx."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ThreadLocalStdout:
+    """
+    Подменяет sys.stdout и направляет print() в буфер текущего потока.
+
+    Генераторы печатают прогресс в stdout; без подмены вывод параллельных
+    запросов перемешивался бы в логе сервера.
+    """
+
+    def __init__(self, default):
+        self._default = default
+        self._local = threading.local()
+
+    @contextmanager
+    def capture(self) -> Iterator[StringIO]:
+        buffer = StringIO()
+        self._local.buffer = buffer
+        try:
+            yield buffer
+        finally:
+            self._local.buffer = None
+
+    def _target(self):
+        return getattr(self._local, 'buffer', None) or self._default
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._default, name)
+
+
+class ChunkedWriter:
+    """Файлоподобный объект для ZipWriter, пишущий HTTP-ответ в chunked-кодировке."""
+
+    def __init__(self, wfile, chunk_size: int = CHUNK_SIZE):
+        self.wfile = wfile
+        self.chunk_size = chunk_size
+        self._buffer = bytearray()
+        self.bytes_sent = 0
+
+    def write(self, data) -> int:
+        self._buffer += data
+        if len(self._buffer) >= self.chunk_size:
+            self._send_chunk()
+        return len(data)
+
+    def flush(self) -> None:
+        # Буфер отправляется по заполнении и в finish(), сокет сбрасывается там же
+        pass
+
+    def _send_chunk(self) -> None:
+        if not self._buffer:
+            return
+        self.wfile.write(f"{len(self._buffer):X}\r\n".encode('ascii'))
+        self.wfile.write(self._buffer)
+        self.wfile.write(b"\r\n")
+        self.bytes_sent += len(self._buffer)
+        self._buffer = bytearray()
+
+    def finish(self) -> None:
+        """Отправляет остаток буфера и завершающий чанк."""
+        self._send_chunk()
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+class GeneratorServer(ThreadingHTTPServer):
+    """Многопоточный HTTP-сервер с общими для всех запросов парсерами."""
+
+    daemon_threads = True
+
+    def __init__(self, address, stdout: ThreadLocalStdout, cache: RenderCache | None = None):
+        super().__init__(address, GenerateRequestHandler)
+        self.stdout = stdout
+        # Общий для всех запросов кэш рендеринга; вытесняет лишнее по ходу работы
+        self.cache = cache
+        self.parsers: Dict[bool, SchemaParser] = {
+            False: SchemaParser(),
+            True: SchemaParser(stream=True),
+        }
+
+
+class GenerateRequestHandler(BaseHTTPRequestHandler):
+    """Обработчик запросов генерации."""
+
+    protocol_version = 'HTTP/1.1'
+    server: GeneratorServer
+
+    def do_GET(self):
+        if urlsplit(self.path).path == '/health':
+            self._send_text(HTTPStatus.OK, 'ok')
+        else:
+            self._send_text(HTTPStatus.NOT_FOUND, 'not found')
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != '/generate':
+            self._send_text(HTTPStatus.NOT_FOUND, 'not found')
+            return
+
+        started = time.perf_counter()
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            content = self._read_body()
+            name = self._project_name(params)
+            suffix = self._schema_suffix(params)
+            zip_settings = self._zip_settings(params)
+            stream = params.get('stream', '').lower() in TRUE_VALUES
+            with self.server.stdout.capture():
+                project_schema = self.server.parsers[stream].parse_content(content, suffix)
+            if not project_schema.files:
+                raise RequestError(HTTPStatus.UNPROCESSABLE_ENTITY, "Не распознано ни одного .py-файла.")
+            with_tests = params.get('with_tests', '').lower() in TRUE_VALUES
+            issues = validate_schema(project_schema, with_tests=with_tests)
+            if issues:
+                raise RequestError(HTTPStatus.UNPROCESSABLE_ENTITY,
+                                   '\n'.join([f"Схема содержит ошибок: {len(issues)}", *map(str, issues)]))
+            # План строится до ответа: конфликт путей - статус 422, а не оборванный архив.
+            # Писатель и приемник ничего не отправляют, пока план не выполняется
+            writer = ChunkedWriter(self.wfile)
+            sink = ZipSink(Path(name), writer, zip_settings)
+            with self.server.stdout.capture():
+                project_gen, plan = plan_project(
+                    project_schema.architecture, project_schema.files, Path(name), sink,
+                    with_init=params.get('no_init', '').lower() not in TRUE_VALUES,
+                    with_tests=with_tests,
+                    cache=self.server.cache, file_types=project_schema.file_types,
+                    async_db=(params.get('async_db', '').lower() in TRUE_VALUES
+                              or project_schema.async_db),
+                    database=project_schema.database)
+            conflicts = plan.check()
+            if conflicts:
+                raise RequestError(HTTPStatus.UNPROCESSABLE_ENTITY,
+                                   '\n'.join([f"План проекта содержит конфликтов: {len(conflicts)}",
+                                               *map(str, conflicts)]))
+        except RequestError as e:
+            # Тело могло остаться непрочитанным - соединение не переиспользуем
+            self.close_connection = True
+            self._send_text(e.status, str(e))
+            return
+        except (SystemExit, ValueError, yaml.YAMLError) as e:
+            self._send_text(HTTPStatus.BAD_REQUEST, f"Ошибка разбора схемы: {str(e).removeprefix('❌ ')}")
+            return
+        except Exception as e:
+            # Схема, которую не отловили проверки формы: ответ еще не начат - отвечаем статусом
+            self.log_error("ошибка разбора схемы: %r", e)
+            self._send_text(HTTPStatus.BAD_REQUEST, f"Схему не удалось обработать: {e!r}")
+            return
+
+        # Дальше ответ уже начат: ошибки можно только залогировать
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'application/zip')
+        self.send_header('Content-Disposition', f'attachment; filename="{name}.zip"')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        try:
+            with self.server.stdout.capture():
+                project_gen.execute_plan(plan)
+                errors = sink.close()
+            writer.finish()
+        except (BrokenPipeError, ConnectionResetError):
+            sink.abort()
+            self.log_message("клиент закрыл соединение: %s", name)
+            self.close_connection = True
+            return
+        except (Exception, SystemExit) as e:
+            # Статус уже отправлен: без завершающего чанка клиент видит оборванный ответ,
+            # а соединение с недописанным телом не переиспользуется
+            sink.abort()
+            self.log_error("ошибка генерации %s: %r", name, e)
+            self.close_connection = True
+            return
+
+        for write_error in errors:
+            self.log_message("ошибка записи %s", write_error)
+        self.log_message("%s: %s, файлов %d, %d байт за %.3f с", name, project_schema.architecture,
+                         sink.files_written, writer.bytes_sent, time.perf_counter() - started)
+
+    def _project_name(self, params: Dict[str, str]) -> str:
+        name = params.get('name', 'fastapi_project')
+        # Имя становится корнем путей в архиве - только один безопасный сегмент
+        if not PROJECT_NAME_PATTERN.fullmatch(name):
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Недопустимое имя проекта: {name!r}")
+        return name
+
+    def _zip_settings(self, params: Dict[str, str]) -> ZipSettings:
+        # Запросы и так обрабатываются параллельно: сжатие идет в потоке запроса,
+        # записи уходят клиенту в порядке генерации, не дожидаясь конца
+        level = params.get('level')
+        if level is not None and not level.isdigit():
+            raise RequestError(HTTPStatus.BAD_REQUEST, "level: ожидается целое число")
+        try:
+            settings = ZipSettings(params.get('compression', 'deflate').lower(),
+                                   int(level) if level is not None else None, jobs=1, sort=False)
+            settings.validate()
+        except ValueError as e:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Параметры сжатия: {e}")
+        return settings
+
+    def _schema_suffix(self, params: Dict[str, str]) -> str:
+        schema_format = params.get('format')
+        if schema_format:
+            suffix = FORMAT_SUFFIXES.get(schema_format.lower())
+            if suffix is None:
+                raise RequestError(HTTPStatus.BAD_REQUEST, "format: поддерживаются yaml, json, txt")
+            return suffix
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        return CONTENT_TYPE_SUFFIXES.get(content_type, '.yaml')
+
+    def _read_body(self) -> str:
+        length = self.headers.get('Content-Length')
+        if length is None:
+            raise RequestError(HTTPStatus.LENGTH_REQUIRED, "Требуется Content-Length")
+        try:
+            size = int(length)
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Некорректный Content-Length")
+        if size < 0 or size > MAX_BODY_SIZE:
+            raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                               f"Схема больше {MAX_BODY_SIZE // (1024 * 1024)} МБ")
+        try:
+            return self.rfile.read(size).decode('utf-8')
+        except UnicodeDecodeError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Схема должна быть в UTF-8")
+
+    def _send_text(self, status: HTTPStatus, message: str) -> None:
+        body = f"{message}\n".encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(host: str = '127.0.0.1', port: int = 8000, cache: RenderCache | None = None) -> None:
+    """Запускает сервер генерации до прерывания (Ctrl+C)."""
+    templates_count = precompile_all()
+    stdout = ThreadLocalStdout(sys.stdout)
+    sys.stdout = stdout
+    server = GeneratorServer((host, port), stdout, cache)
+    print(f"🌐 Сервер генерации: http://{host}:{server.server_port}/generate "
+          f"(шаблонов в кэше: {templates_count})")
+    if cache is not None:
+        print(f"🗃️  Кэш рендеринга: {cache.directory}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Сервер остановлен")
+    finally:
+        server.server_close()
+        sys.stdout = stdout._default
+        if cache is not None:
+            cache.close()
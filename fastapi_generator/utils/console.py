@@ -0,0 +1,39 @@
+"""
+Сообщения CLI с уровнями подробности (-q / -v).
+
+Сообщения печатаются в текущий sys.stdout: пакетный режим и сервер
+перехватывают его, а с --events json и --tar-stdout он уходит в stderr.
+Предупреждения и ошибки печатаются на любом уровне.
+"""
+
+QUIET = 0
+NORMAL = 1
+VERBOSE = 2
+
+_level = NORMAL
+
+
+def set_level(level: int) -> None:
+    global _level
+    _level = level
+
+
+def get_level() -> int:
+    return _level
+
+
+def info(message: str = '') -> None:
+    """Обычное сообщение о ходе генерации (скрывается с -q)."""
+    if _level >= NORMAL:
+        print(message)
+
+
+def detail(message: str = '') -> None:
+    """Подробности, нужные только с -v."""
+    if _level >= VERBOSE:
+        print(message)
+
+
+def warn(message: str) -> None:
+    """Предупреждение или ошибка - печатается всегда."""
+    print(message)
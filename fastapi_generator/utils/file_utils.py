@@ -2,9 +2,16 @@
 Утилиты для работы с файлами.
 """
 
-import zipfile
+from dataclasses import replace
 from pathlib import Path
 
+from .zip_writer import ZipSettings, ZipWriter
+
+
+def project_slug(project_root: Path) -> str:
+    """Имя пакета проекта по директории: My-Blog API -> my_blog_api."""
+    return project_root.name.lower().replace(' ', '_').replace('-', '_')
+
 
 def ensure_output_dir() -> Path:
     """Создает и возвращает путь к директории output."""
@@ -20,16 +27,27 @@ def get_output_path(filename: str, output_dir: Path | None = None) -> Path:
     return output_dir / filename
 
 
-def zip_directory(folder_path: Path, zip_path: Path | None = None) -> Path:
-    """Создает ZIP-архив папки в директории output."""
+def zip_directory(folder_path: Path, zip_path: Path | None = None,
+                  settings: ZipSettings | None = None) -> Path:
+    """
+    Создает ZIP-архив папки в директории output.
+
+    Записи идут в порядке путей, с фиксированными временем и правами,
+    и сжимаются параллельно (см. ZipSettings).
+    """
     if zip_path is None:
         zip_name = f"{folder_path.name}.zip"
         zip_path = get_output_path(zip_name)
-    
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for file in folder_path.rglob('*'):
-            if file.is_file():
-                arcname = file.relative_to(folder_path.parent)
-                zipf.write(file, arcname)
-    
+    if settings is None:
+        settings = ZipSettings()
+
+    files = sorted(
+        (file.relative_to(folder_path.parent).as_posix(), file)
+        for file in folder_path.rglob('*') if file.is_file()
+    )
+    # Файлы уже отсортированы: архив можно писать потоково, не копя сжатые данные
+    with ZipWriter(zip_path, replace(settings, sort=False)) as writer:
+        for arcname, file in files:
+            writer.add(arcname, file.read_bytes())
+
     return zip_path
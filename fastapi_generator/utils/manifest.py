@@ -0,0 +1,75 @@
+"""
+Манифест сгенерированного проекта для инкрементальной перегенерации.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict
+
+MANIFEST_NAME = '.fastapi_generator_manifest.json'
+MANIFEST_VERSION = 1
+
+
+def content_digest(data: bytes) -> str:
+    """Хэш содержимого файла."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+@dataclass
+class ManifestEntry:
+    """Запись манифеста: хэш входных данных (шаблон + переменные) и хэш результата."""
+    digest: str
+    fingerprint: str | None = None
+
+
+class Manifest:
+    """Отображение путь -> ManifestEntry для файлов, созданных генератором."""
+
+    def __init__(self, entries: Dict[str, ManifestEntry] | None = None):
+        self.entries: Dict[str, ManifestEntry] = entries if entries is not None else {}
+
+    def __contains__(self, relative_path: str) -> bool:
+        return relative_path in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, relative_path: str) -> ManifestEntry | None:
+        return self.entries.get(relative_path)
+
+    @classmethod
+    def load(cls, project_root: Path) -> 'Manifest':
+        """Загружает манифест проекта; при отсутствии или порче возвращает пустой."""
+        manifest_path = project_root / MANIFEST_NAME
+        try:
+            data = json.loads(manifest_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return cls()
+        if not isinstance(data, dict) or data.get('version') != MANIFEST_VERSION:
+            return cls()
+
+        entries = {}
+        for relative_path, entry in data.get('files', {}).items():
+            entries[relative_path] = ManifestEntry(
+                digest=entry.get('digest', ''),
+                fingerprint=entry.get('fingerprint'),
+            )
+        return cls(entries)
+
+    def save(self, project_root: Path) -> None:
+        """Сохраняет манифест в корень проекта."""
+        data = {
+            'version': MANIFEST_VERSION,
+            'files': {
+                relative_path: {'digest': entry.digest, 'fingerprint': entry.fingerprint}
+                for relative_path, entry in sorted(self.entries.items())
+            },
+        }
+        manifest_path = project_root / MANIFEST_NAME
+        manifest_path.write_text(json.dumps(data, ensure_ascii=False, indent=1) + '\n', encoding='utf-8')
+
+    @staticmethod
+    def exists(project_root: Path) -> bool:
+        return (project_root / MANIFEST_NAME).is_file()
@@ -0,0 +1,146 @@
+"""
+Профилирование генерации по фазам через хуки (--profile).
+"""
+
+import json
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+from ..core.hooks import GenerationHooks
+from . import console
+
+PROFILE_VERSION = 1
+
+
+@dataclass
+class PhaseStats:
+    """Статистика одной фазы (повторные фазы с тем же именем суммируются)."""
+    name: str
+    wall_time: float = 0.0
+    files_written: int = 0
+    files_skipped: int = 0
+    bytes_written: int = 0
+    tracemalloc_peak: int = 0
+
+
+class _OpenPhase:
+    """Незавершенная фаза на стеке профилировщика."""
+
+    def __init__(self, stats: PhaseStats):
+        self.stats = stats
+        self.started = time.perf_counter()
+        self.peak = 0
+
+
+class PhaseProfiler(GenerationHooks):
+    """
+    Собирает время, число файлов, байты и пик памяти tracemalloc по фазам.
+
+    Фазы могут быть вложенными: файлы относятся к самой внутренней фазе,
+    пик памяти вложенной фазы учитывается и во внешней.
+    """
+
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.phases: Dict[str, PhaseStats] = {}
+        self._stack: List[_OpenPhase] = []
+        self._started: float | None = None
+        self._finished: float | None = None
+        self._owns_tracemalloc = False
+        self.files_written = 0
+        self.files_skipped = 0
+        self.bytes_written = 0
+        self.peak = 0
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+
+    def stop(self) -> None:
+        self._finished = time.perf_counter()
+        if tracemalloc.is_tracing():
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def on_phase_start(self, phase: str) -> None:
+        if tracemalloc.is_tracing():
+            # Пик внешней фазы фиксируем до сброса счетчика
+            if self._stack:
+                self._stack[-1].peak = max(self._stack[-1].peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        stats = self.phases.setdefault(phase, PhaseStats(phase))
+        self._stack.append(_OpenPhase(stats))
+
+    def on_phase_end(self, phase: str) -> None:
+        open_phase = self._stack.pop()
+        stats = open_phase.stats
+        stats.wall_time += time.perf_counter() - open_phase.started
+        if tracemalloc.is_tracing():
+            peak = max(open_phase.peak, tracemalloc.get_traced_memory()[1])
+            stats.tracemalloc_peak = max(stats.tracemalloc_peak, peak)
+            if self._stack:
+                self._stack[-1].peak = max(self._stack[-1].peak, peak)
+            else:
+                self.peak = max(self.peak, peak)
+
+    def on_file_written(self, path: Path, size: int) -> None:
+        self.files_written += 1
+        self.bytes_written += size
+        if self._stack:
+            stats = self._stack[-1].stats
+            stats.files_written += 1
+            stats.bytes_written += size
+
+    def on_file_skipped(self, path: Path) -> None:
+        self.files_skipped += 1
+        if self._stack:
+            self._stack[-1].stats.files_skipped += 1
+
+    def report(self, **meta: Any) -> Dict[str, Any]:
+        """Отчет в виде словаря для JSON."""
+        finished = self._finished if self._finished is not None else time.perf_counter()
+        return {
+            'version': PROFILE_VERSION,
+            **meta,
+            'total': {
+                'wall_time': round(finished - (self._started or finished), 6),
+                'files_written': self.files_written,
+                'files_skipped': self.files_skipped,
+                'bytes_written': self.bytes_written,
+                'tracemalloc_peak': self.peak,
+            },
+            'phases': [
+                {**asdict(stats), 'wall_time': round(stats.wall_time, 6)}
+                for stats in self.phases.values()
+            ],
+        }
+
+    def write_json(self, path: Path, **meta: Any) -> Dict[str, Any]:
+        report = self.report(**meta)
+        path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+        return report
+
+
+def print_profile_summary(report: Dict[str, Any]) -> None:
+    """Выводит таблицу фаз из отчета профилировщика."""
+    console.info(f"⏱️  Профиль по фазам:")
+    for phase in report['phases']:
+        console.info(f"   {phase['name']:<12} {phase['wall_time']:8.3f} с  файлов {phase['files_written']:>7}  "
+              f"{phase['bytes_written'] / 1e6:8.2f} МБ  пик памяти {phase['tracemalloc_peak'] / 1e6:8.2f} МБ")
+    total = report['total']
+    console.info(f"   {'всего':<12} {total['wall_time']:8.3f} с  файлов {total['files_written']:>7}  "
+          f"{total['bytes_written'] / 1e6:8.2f} МБ  пик памяти {total['tracemalloc_peak'] / 1e6:8.2f} МБ")
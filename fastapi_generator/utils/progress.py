@@ -0,0 +1,74 @@
+"""
+Строка прогресса генерации в терминале.
+
+Подписчик хуков: считает записанные и пропущенные файлы и перерисовывает
+одну строку не чаще max_rate раз в секунду, поэтому вывод в терминал не
+растет с числом файлов. Строка рисуется только во время записи файлов и
+стирается в конце каждой фазы: между фазами печатаются обычные сообщения.
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import TextIO
+
+from ..core.hooks import GenerationHooks
+
+DEFAULT_MAX_RATE = 4.0
+
+
+class ProgressDisplay(GenerationHooks):
+    """Перерисовываемая строка «фаза: файлов готово/всего, объем»."""
+
+    def __init__(self, stream: TextIO | None = None, max_rate: float = DEFAULT_MAX_RATE):
+        self.stream = stream if stream is not None else sys.stderr
+        self.interval = 1.0 / max_rate
+        self.current_phase = ''
+        self.total = 0
+        self.done = 0
+        self.bytes_written = 0
+        self._last_draw = 0.0
+        self._width = 0
+
+    def on_plan_ready(self, files: int) -> None:
+        self.total += files
+
+    def on_phase_start(self, phase: str) -> None:
+        self.current_phase = phase
+
+    def on_phase_end(self, phase: str) -> None:
+        self.close()
+
+    def on_file_written(self, path: Path, size: int) -> None:
+        self.done += 1
+        self.bytes_written += size
+        self._tick()
+
+    def on_file_skipped(self, path: Path) -> None:
+        self.done += 1
+        self._tick()
+
+    def _tick(self) -> None:
+        now = time.monotonic()
+        if now - self._last_draw >= self.interval:
+            self._last_draw = now
+            self._draw()
+
+    def _draw(self) -> None:
+        line = f"⏳ {self.current_phase}: {self.done}"
+        if self.total:
+            line += f"/{self.total} файлов ({self.done * 100 // self.total}%)"
+        else:
+            line += " файлов"
+        line += f", {self.bytes_written / 1e6:.1f} МБ"
+        # Хвост предыдущей, более длинной строки затирается пробелами
+        self.stream.write('\r' + line.ljust(self._width))
+        self.stream.flush()
+        self._width = len(line)
+
+    def close(self) -> None:
+        """Стирает строку прогресса, чтобы следующие сообщения начинались с чистой строки."""
+        if self._width:
+            self.stream.write('\r' + ' ' * self._width + '\r')
+            self.stream.flush()
+            self._width = 0
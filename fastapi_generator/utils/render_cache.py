@@ -0,0 +1,217 @@
+"""
+Постоянный кэш отрендеренных файлов между запусками и проектами.
+
+Ключ - хэш входных данных рендеринга (исходник шаблона, архитектура,
+class_name, module_name, table_name, путь файла), значение - готовое
+содержимое. Одни и те же сущности (User, Tenant, AuditLog, ...) в разных
+проектах рендерятся один раз.
+
+Директорию кэша могут одновременно использовать несколько процессов:
+записи пишутся во временный файл и атомарно переименовываются, а
+исчезнувшая запись (вытеснена соседним процессом) - просто промах.
+Размер ограничен: при превышении удаляются давно не использованные
+записи (LRU по времени изменения, которое обновляется при попадании).
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: вытеснение без межпроцессной блокировки
+    fcntl = None
+
+CACHE_VERSION = 'v1'
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+# После вытеснения кэш занимает не больше этой доли лимита - чтобы не вытеснять на каждом запуске
+LOW_WATER_MARK = 0.9
+# Временные файлы упавших процессов удаляются, если они старше часа
+STALE_TEMP_SECONDS = 3600
+TEMP_PREFIX = '.tmp-'
+
+_SIZE_PATTERN = re.compile(r'(\d+)\s*([KMG]?)B?', re.IGNORECASE)
+_SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+
+def parse_size(value: int | str) -> int:
+    """Разбирает размер: число байт или строка вида 512M, 2G, 100K."""
+    if isinstance(value, int):
+        size = value
+    else:
+        match = _SIZE_PATTERN.fullmatch(str(value).strip())
+        if match is None:
+            raise ValueError(f"некорректный размер кэша: {value!r} (ожидается, например, 512M)")
+        size = int(match.group(1)) * _SIZE_UNITS[match.group(2).upper()]
+    if size <= 0:
+        raise ValueError("размер кэша должен быть положительным")
+    return size
+
+
+class RenderCache:
+    """Кэш содержимого файлов по хэшу входных данных рендеринга."""
+
+    def __init__(self, directory: Path, max_size: int = DEFAULT_MAX_SIZE):
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.objects = self.directory / CACHE_VERSION
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        # Сколько байт записано с последнего вытеснения
+        self._stored_bytes = 0
+        self._evict_lock = threading.Lock()
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        """Ключ записи по частям входных данных."""
+        return hashlib.blake2b('\0'.join(parts).encode('utf-8'), digest_size=20).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.objects / key[:2] / key[2:]
+
+    def get(self, key: str) -> str | None:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            # Время изменения - метка LRU (atime часто отключен)
+            os.utime(path)
+        except OSError:
+            return None
+        return data.decode('utf-8')
+
+    def put(self, key: str, content: str) -> None:
+        """Сохраняет запись; ошибки записи не мешают генерации."""
+        path = self._path(key)
+        data = content.encode('utf-8')
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(prefix=TEMP_PREFIX, dir=path.parent)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                # Атомарно: читатели видят либо старую запись, либо новую целиком
+                os.replace(temp_name, path)
+            except OSError:
+                os.unlink(temp_name)
+                raise
+        except OSError:
+            return
+        self._stored_bytes += len(data)
+        # Долгоживущий процесс (сервер) вытесняет по ходу работы, не дожидаясь close()
+        if self._stored_bytes > self.max_size * (1 - LOW_WATER_MARK):
+            self.evict()
+
+    def get_or_render(self, key: str, render: Callable[[], str]) -> str:
+        content = self.get(key)
+        if content is not None:
+            self.hits += 1
+            return content
+        self.misses += 1
+        content = render()
+        self.put(key, content)
+        return content
+
+    def close(self) -> None:
+        """Вытесняет лишнее, если в этом запуске кэш пополнялся."""
+        if self._stored_bytes:
+            self.evict()
+
+    def evict(self) -> int:
+        """Удаляет давно не использованные записи сверх лимита; возвращает их число."""
+        if not self._evict_lock.acquire(blocking=False):
+            return 0
+        try:
+            self._stored_bytes = 0
+            with self._process_lock() as locked:
+                # Вытесняет уже другой процесс - его результат нас устроит
+                if not locked:
+                    return 0
+                entries, total = self._scan()
+                limit = self.max_size * LOW_WATER_MARK if total > self.max_size else None
+                evicted = 0
+                if limit is not None:
+                    for _, size, path in sorted(entries):
+                        if total <= limit:
+                            break
+                        try:
+                            os.unlink(path)
+                        except FileNotFoundError:
+                            pass
+                        total -= size
+                        evicted += 1
+                self.evicted += evicted
+                return evicted
+        finally:
+            self._evict_lock.release()
+
+    def _scan(self) -> Tuple[List[Tuple[float, int, str]], int]:
+        """Записи кэша (mtime, размер, путь) и их общий размер; чистит брошенные временные файлы."""
+        entries = []
+        total = 0
+        now = time.time()
+        try:
+            buckets = list(os.scandir(self.objects))
+        except FileNotFoundError:
+            return entries, total
+        for bucket in buckets:
+            if not bucket.is_dir():
+                continue
+            try:
+                files = list(os.scandir(bucket.path))
+            except FileNotFoundError:
+                continue
+            for entry in files:
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if entry.name.startswith(TEMP_PREFIX):
+                    if now - stat.st_mtime > STALE_TEMP_SECONDS:
+                        try:
+                            os.unlink(entry.path)
+                        except FileNotFoundError:
+                            pass
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        return entries, total
+
+    def _process_lock(self):
+        return _FileLock(self.directory / '.lock')
+
+    def summary(self) -> str:
+        return f"попаданий {self.hits}, промахов {self.misses}, вытеснено {self.evicted}"
+
+
+class _FileLock:
+    """Неблокирующая межпроцессная блокировка вытеснения (flock); без fcntl всегда успешна."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._fd = None
+
+    def __enter__(self) -> bool:
+        if fcntl is None:
+            return True
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+            return False
+        return True
+
+    def __exit__(self, *exc_info) -> None:
+        if self._fd is not None:
+            # Закрытие дескриптора снимает flock
+            os.close(self._fd)
+            self._fd = None
@@ -0,0 +1,349 @@
+"""
+Приемники (sinks) сгенерированных файлов.
+
+Генераторы рендерят содержимое и передают пары (путь, байты) приемнику,
+а приемник решает, как и когда их записать.
+"""
+
+import io
+import queue
+import tarfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, List, Set
+
+from .manifest import Manifest, ManifestEntry, content_digest
+from .zip_writer import ZipSettings, ZipWriter
+
+
+@dataclass
+class WriteError:
+    """Ошибка записи одного файла."""
+    path: Path
+    error: Exception
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.error}"
+
+
+class OutputSink(ABC):
+    """Абстрактный приемник сгенерированных файлов."""
+
+    def __init__(self):
+        self.errors: List[WriteError] = []
+        self.files_written = 0
+        self.bytes_written = 0
+        # Пути, уже переданные приемнику (в т.ч. еще не записанные на диск)
+        self._written: Set[Path] = set()
+
+    def write(self, path: Path, data: bytes, fingerprint: str | None = None) -> None:
+        """
+        Принимает файл на запись.
+
+        fingerprint - хэш входных данных рендеринга (шаблон + переменные),
+        используется приемниками, которые умеют пропускать неизменные файлы.
+        """
+        self._written.add(path)
+        self.files_written += 1
+        self.bytes_written += len(data)
+        self._write(path, data)
+
+    def write_text(self, path: Path, content: str, fingerprint: str | None = None) -> None:
+        """Принимает текстовый файл на запись в UTF-8."""
+        self.write(path, content.encode('utf-8'), fingerprint)
+
+    def is_fresh(self, path: Path, fingerprint: str) -> bool:
+        """
+        Проверяет, что файл с такими входными данными уже сгенерирован.
+
+        True означает, что рендеринг и запись можно пропустить: приемник
+        считает файл записанным.
+        """
+        return False
+
+    def ensure_directory(self, path: Path) -> None:
+        """Создает директорию, если приемнику это нужно."""
+
+    def exists(self, path: Path) -> bool:
+        """Проверяет, был ли файл уже передан приемнику."""
+        return path in self._written
+
+    def close(self) -> List[WriteError]:
+        """Завершает запись и возвращает ошибки по файлам."""
+        return self.errors
+
+    @abstractmethod
+    def _write(self, path: Path, data: bytes) -> None:
+        """Записывает файл."""
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class FileSystemSink(OutputSink):
+    """Записывает файлы на диск последовательно в текущем потоке."""
+
+    def __init__(self):
+        super().__init__()
+        self._directories: Set[Path] = set()
+        # Директории, созданные этим приемником: файлов в них на диске еще нет
+        self._new_directories: Set[Path] = set()
+
+    def ensure_directory(self, path: Path) -> None:
+        if path in self._directories:
+            return
+        try:
+            path.mkdir(parents=True)
+            self._new_directories.add(path)
+        except FileExistsError:
+            if not path.is_dir():
+                raise
+        self._directories.add(path)
+
+    def exists(self, path: Path) -> bool:
+        if super().exists(path):
+            return True
+        # В только что созданной директории проверять диск не нужно
+        return path.parent not in self._new_directories and path.exists()
+
+    def _write(self, path: Path, data: bytes) -> None:
+        try:
+            path.write_bytes(data)
+        except OSError as e:
+            self.errors.append(WriteError(path, e))
+
+
+class ThreadedFileSystemSink(FileSystemSink):
+    """
+    Записывает файлы на диск пулом потоков.
+
+    Рендеринг остается в вызывающем потоке, запись выполняют jobs потоков,
+    каждый из которых разбирает свою ограниченную очередь заданий (путь, байты).
+    Задания распределяются по хэшу пути, поэтому повторные записи одного файла
+    выполняются в порядке поступления и результат совпадает с FileSystemSink.
+    """
+
+    def __init__(self, jobs: int, queue_size: int = 256):
+        super().__init__()
+        if jobs < 1:
+            raise ValueError(f"Количество потоков должно быть положительным: {jobs}")
+        self.jobs = jobs
+        self._errors_lock = threading.Lock()
+        self._queues = [queue.Queue(maxsize=queue_size) for _ in range(jobs)]
+        self._threads = [
+            threading.Thread(target=self._drain, args=(job_queue,), name=f"sink-writer-{i}", daemon=True)
+            for i, job_queue in enumerate(self._queues)
+        ]
+        for thread in self._threads:
+            thread.start()
+        self._closed = False
+
+    def _write(self, path: Path, data: bytes) -> None:
+        if self._closed:
+            raise RuntimeError("Приемник уже закрыт")
+        self._queues[hash(path) % self.jobs].put((path, data))
+
+    def _drain(self, job_queue: queue.Queue) -> None:
+        """Цикл потока-писателя."""
+        while True:
+            job = job_queue.get()
+            if job is None:
+                return
+            path, data = job
+            try:
+                path.write_bytes(data)
+            except OSError as e:
+                with self._errors_lock:
+                    self.errors.append(WriteError(path, e))
+
+    def close(self) -> List[WriteError]:
+        if not self._closed:
+            self._closed = True
+            for job_queue in self._queues:
+                job_queue.put(None)
+            for thread in self._threads:
+                thread.join()
+            # Порядок ошибок не должен зависеть от планирования потоков
+            self.errors.sort(key=lambda write_error: str(write_error.path))
+        return self.errors
+
+
+class ArchiveSink(OutputSink):
+    """
+    Базовый приемник, пишущий файлы сразу в архив.
+
+    Имена записей строятся относительно родителя project_root, как и в
+    zip_directory, поэтому архив содержит корневую папку проекта.
+    Директории на диске не создаются, exists() учитывает только уже
+    переданные файлы.
+    """
+
+    def __init__(self, project_root: Path):
+        super().__init__()
+        self.project_root = project_root
+        self._timestamp = time.time()
+
+    def _arcname(self, path: Path) -> str:
+        return path.relative_to(self.project_root.parent).as_posix()
+
+    def write(self, path: Path, data: bytes, fingerprint: str | None = None) -> None:
+        # Архив нельзя переписать: повторная запись пути - ошибка генерации
+        if path in self._written:
+            self.errors.append(WriteError(path, ValueError("повторная запись файла в архив")))
+            return
+        super().write(path, data, fingerprint)
+
+
+class ZipSink(ArchiveSink):
+    """
+    Пишет файлы сразу в ZIP-архив за один проход.
+
+    Записи сжимаются параллельно ZipWriter; при settings.sort они пишутся
+    в порядке путей при закрытии, иначе - в порядке генерации по мере сжатия.
+    """
+
+    def __init__(self, project_root: Path, target: Path | BinaryIO, settings: ZipSettings | None = None):
+        super().__init__(project_root)
+        self._writer = ZipWriter(target, settings)
+
+    def _write(self, path: Path, data: bytes) -> None:
+        try:
+            self._writer.add(self._arcname(path), data)
+        except (OSError, ValueError) as e:
+            self.errors.append(WriteError(path, e))
+
+    def close(self) -> List[WriteError]:
+        try:
+            self._writer.close()
+        except (OSError, ValueError) as e:
+            self.errors.append(WriteError(self.project_root, e))
+        return self.errors
+
+    def abort(self) -> None:
+        """Бросает архив после ошибки генерации: без центрального каталога."""
+        self._writer.abort()
+
+
+class TarSink(ArchiveSink):
+    """Пишет файлы потоковым tar-архивом (например, в stdout)."""
+
+    def __init__(self, project_root: Path, stream: BinaryIO, compression: str = ''):
+        super().__init__(project_root)
+        mode = f"w|{compression}" if compression else 'w|'
+        self._tarfile = tarfile.open(fileobj=stream, mode=mode)
+
+    def _write(self, path: Path, data: bytes) -> None:
+        info = tarfile.TarInfo(self._arcname(path))
+        info.size = len(data)
+        info.mtime = int(self._timestamp)
+        info.mode = 0o644
+        try:
+            self._tarfile.addfile(info, io.BytesIO(data))
+        except (OSError, tarfile.TarError) as e:
+            self.errors.append(WriteError(path, e))
+
+    def close(self) -> List[WriteError]:
+        if not self._tarfile.closed:
+            self._tarfile.close()
+        return self.errors
+
+
+class IncrementalSink(OutputSink):
+    """
+    Инкрементальная запись поверх файлового приемника.
+
+    По манифесту предыдущего запуска пропускает файлы, у которых не изменились
+    входные данные (is_fresh) или итоговое содержимое, и записывает только
+    измененные. При закрытии сохраняет новый манифест и, если задан prune,
+    удаляет файлы, которые генератор создал раньше, но которых больше нет в схеме.
+    """
+
+    def __init__(self, inner: FileSystemSink, project_root: Path, prune: bool = False):
+        super().__init__()
+        self.inner = inner
+        self.project_root = project_root
+        self.prune = prune
+        self.previous = Manifest.load(project_root)
+        self.manifest = Manifest()
+        self.files_skipped = 0
+        self.files_pruned = 0
+
+    def _relative(self, path: Path) -> str:
+        return path.relative_to(self.project_root).as_posix()
+
+    def ensure_directory(self, path: Path) -> None:
+        self.inner.ensure_directory(path)
+
+    def exists(self, path: Path) -> bool:
+        # Файлы прошлого запуска не считаются существующими: их снова производит генератор
+        if path in self._written:
+            return True
+        return self._relative(path) not in self.previous and self.inner.exists(path)
+
+    def is_fresh(self, path: Path, fingerprint: str) -> bool:
+        relative_path = self._relative(path)
+        entry = self.previous.get(relative_path)
+        if entry is None or entry.fingerprint != fingerprint or not path.exists():
+            return False
+        self._written.add(path)
+        self.manifest.entries[relative_path] = entry
+        self.files_skipped += 1
+        return True
+
+    def write(self, path: Path, data: bytes, fingerprint: str | None = None) -> None:
+        relative_path = self._relative(path)
+        digest = content_digest(data)
+        self._written.add(path)
+        self.manifest.entries[relative_path] = ManifestEntry(digest=digest, fingerprint=fingerprint)
+
+        entry = self.previous.get(relative_path)
+        if entry is not None and entry.digest == digest and path.exists():
+            self.files_skipped += 1
+            return
+        self.files_written += 1
+        self.bytes_written += len(data)
+        self.inner.write(path, data, fingerprint)
+
+    def _write(self, path: Path, data: bytes) -> None:
+        self.inner.write(path, data)
+
+    def close(self) -> List[WriteError]:
+        self.errors = self.inner.close()
+        # Файлы с ошибкой записи не должны попасть в манифест как актуальные
+        for write_error in self.errors:
+            self.manifest.entries.pop(self._relative(write_error.path), None)
+
+        for relative_path, entry in self.previous.entries.items():
+            if relative_path in self.manifest:
+                continue
+            if self.prune:
+                self._prune_file(self.project_root / relative_path)
+            else:
+                self.manifest.entries[relative_path] = entry
+
+        self.project_root.mkdir(parents=True, exist_ok=True)
+        self.manifest.save(self.project_root)
+        return self.errors
+
+    def _prune_file(self, path: Path) -> None:
+        """Удаляет файл и опустевшие родительские директории внутри проекта."""
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            self.errors.append(WriteError(path, e))
+            return
+        self.files_pruned += 1
+
+        directory = path.parent
+        while directory != self.project_root and not any(directory.iterdir()):
+            directory.rmdir()
+            directory = directory.parent
@@ -0,0 +1,294 @@
+"""
+Детерминированная запись ZIP-архивов с параллельным сжатием.
+
+zipfile сжимает записи последовательно внутри write()/writestr(), поэтому
+сжатие вынесено сюда: записи сжимаются в пуле потоков (zlib, bz2 и lzma
+отпускают GIL), а ZipWriter дописывает в архив уже сжатые данные. Время
+изменения и права доступа у всех записей фиксированы, поэтому одинаковые
+проекты дают побайтно одинаковые архивы.
+
+Архив пишется строго последовательно, без seek, поэтому целью может быть
+и сокет (сервер генерации). Записи больше 4 ГБ не поддерживаются, число
+записей и размер архива - не ограничены (ZIP64).
+"""
+
+import bz2
+import lzma
+import os
+import struct
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Deque, List, Tuple
+
+COMPRESSION_METHODS = ('stored', 'deflate', 'bzip2', 'lzma')
+
+# Номер метода в заголовках ZIP, допустимые уровни и уровень по умолчанию
+_METHOD_IDS = {'stored': 0, 'deflate': 8, 'bzip2': 12, 'lzma': 14}
+_LEVELS = {'deflate': (0, 9), 'bzip2': (1, 9), 'lzma': (0, 9)}
+_DEFAULT_LEVELS = {'deflate': zlib.Z_DEFAULT_COMPRESSION, 'bzip2': 9, 'lzma': lzma.PRESET_DEFAULT}
+# Версия формата, нужная для распаковки (APPNOTE 4.4.3)
+_VERSIONS = {'stored': 20, 'deflate': 20, 'bzip2': 46, 'lzma': 63}
+_ZIP64_VERSION = 45
+
+# Размер словаря LZMA1 для пресетов 0-9 (как в liblzma)
+_LZMA_DICT_SIZES = (1 << 18, 1 << 20, 1 << 21, 1 << 22, 1 << 22, 1 << 23, 1 << 23, 1 << 24, 1 << 25, 1 << 26)
+
+_FLAG_LZMA_EOS = 0x0002
+_FLAG_UTF8 = 0x0800
+# Обычный файл с правами 0644, система-создатель - Unix
+_EXTERNAL_ATTR = 0o100644 << 16
+_CREATE_SYSTEM = 3
+
+_LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+_CENTRAL_HEADER = struct.Struct('<IHHHHHHIIIHHHHHII')
+_END_RECORD = struct.Struct('<IHHHHIIH')
+_ZIP64_END_RECORD = struct.Struct('<IQHHIIQQQQ')
+_ZIP64_LOCATOR = struct.Struct('<IIQI')
+_ZIP64_LIMIT = 0xFFFFFFFF
+_ZIP64_COUNT_LIMIT = 0xFFFF
+
+# Время записей по умолчанию - минимальная дата формата ZIP
+_DEFAULT_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+@dataclass(frozen=True)
+class ZipSettings:
+    """
+    Параметры упаковки.
+
+    level=None - уровень метода по умолчанию, jobs=None - по числу
+    процессоров (1 - сжатие в вызывающем потоке). sort=True пишет записи
+    в порядке имен, буферизуя сжатые данные до close(); sort=False пишет
+    их в порядке добавления по мере сжатия.
+    """
+    compression: str = 'deflate'
+    level: int | None = None
+    jobs: int | None = None
+    sort: bool = True
+
+    def validate(self) -> None:
+        """Проверяет сочетание метода и уровня, бросает ValueError."""
+        if self.compression not in COMPRESSION_METHODS:
+            raise ValueError(f"метод сжатия: поддерживаются {', '.join(COMPRESSION_METHODS)}")
+        if self.level is not None:
+            if self.compression == 'stored':
+                raise ValueError("уровень сжатия не применяется к методу stored")
+            low, high = _LEVELS[self.compression]
+            if not low <= self.level <= high:
+                raise ValueError(f"уровень сжатия {self.compression}: от {low} до {high}")
+        if self.jobs is not None and self.jobs < 1:
+            raise ValueError("число потоков сжатия должно быть положительным")
+
+    @property
+    def workers(self) -> int:
+        return self.jobs if self.jobs is not None else os.cpu_count() or 1
+
+
+def archive_date_time() -> Tuple[int, int, int, int, int, int]:
+    """
+    Время записей архива: SOURCE_DATE_EPOCH, если задан, иначе 1980-01-01.
+
+    Текущее время не используется, чтобы архив зависел только от содержимого.
+    """
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if not epoch:
+        return _DEFAULT_DATE_TIME
+    try:
+        date_time = time.gmtime(int(epoch))[:6]
+    except (ValueError, OverflowError):
+        return _DEFAULT_DATE_TIME
+    # ZIP хранит время с точностью до 2 секунд и не раньше 1980 года
+    return max(date_time, _DEFAULT_DATE_TIME)
+
+
+@dataclass(slots=True)
+class CompressedEntry:
+    """Запись, сжатая и готовая к записи в архив."""
+    arcname: str
+    data: bytes
+    crc: int
+    size: int
+    compressed_size: int
+    method: str
+
+
+def _lzma_compress(data: bytes, preset: int) -> bytes:
+    # Формат LZMA в ZIP: версия 9.4, размер свойств и свойства LZMA1 перед сырым потоком
+    lc, lp, pb, dict_size = 3, 0, 2, _LZMA_DICT_SIZES[preset]
+    compressor = lzma.LZMACompressor(format=lzma.FORMAT_RAW, filters=[{
+        'id': lzma.FILTER_LZMA1, 'preset': preset, 'dict_size': dict_size, 'lc': lc, 'lp': lp, 'pb': pb,
+    }])
+    properties = struct.pack('<BI', (pb * 5 + lp) * 9 + lc, dict_size)
+    header = struct.pack('<BBH', 9, 4, len(properties)) + properties
+    return header + compressor.compress(data) + compressor.flush()
+
+
+def compress_entry(arcname: str, data: bytes, settings: ZipSettings) -> CompressedEntry:
+    """Сжимает одну запись выбранным методом."""
+    if len(data) >= _ZIP64_LIMIT:
+        raise ValueError(f"{arcname}: записи больше 4 ГБ не поддерживаются")
+    method = settings.compression
+    level = settings.level if settings.level is not None else _DEFAULT_LEVELS.get(method)
+    if method == 'deflate':
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        compressed = compressor.compress(data) + compressor.flush()
+    elif method == 'bzip2':
+        compressed = bz2.compress(data, level)
+    elif method == 'lzma':
+        compressed = _lzma_compress(data, level)
+    else:
+        compressed = data
+    return CompressedEntry(arcname, compressed, zlib.crc32(data), len(data), len(compressed), method)
+
+
+def _dos_date_time(date_time: Tuple[int, ...]) -> Tuple[int, int]:
+    year, month, day, hour, minute, second = date_time
+    return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+
+
+class ZipWriter:
+    """
+    Пишет ZIP-архив из записей, сжимаемых параллельно.
+
+    add() ставит запись в пул сжатия, close() дописывает оставшиеся записи
+    и центральный каталог. Цель - путь (файл открывается и закрывается
+    здесь) или поток с методом write.
+    """
+
+    def __init__(self, target: Path | BinaryIO, settings: ZipSettings | None = None):
+        self.settings = settings if settings is not None else ZipSettings()
+        self.settings.validate()
+        self._owns_stream = isinstance(target, (str, Path))
+        self._stream: BinaryIO = open(target, 'wb') if self._owns_stream else target
+        self._time, self._date = _dos_date_time(archive_date_time())
+        self._offset = 0
+        # Центральный каталог: (запись, смещение локального заголовка)
+        self._central: List[Tuple[CompressedEntry, int]] = []
+        workers = self.settings.workers
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix='zip') if workers > 1 else None
+        self._pending: Deque[Future] = deque()
+        # Сколько сжатых записей держать в памяти в потоковом режиме
+        self._window = workers * 4
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def add(self, arcname: str, data: bytes) -> None:
+        """Добавляет запись; в потоковом режиме попутно пишет уже сжатые."""
+        if self._closed:
+            raise RuntimeError("Архив уже закрыт")
+        if self._executor is None:
+            entry = compress_entry(arcname, data, self.settings)
+            if self.settings.sort:
+                self._pending.append(_completed(entry))
+            else:
+                self._write_entry(entry)
+            return
+
+        self._pending.append(self._executor.submit(compress_entry, arcname, data, self.settings))
+        if not self.settings.sort:
+            # Порядок записей - порядок добавления: пишем готовые записи из головы очереди
+            while self._pending and (self._pending[0].done() or len(self._pending) > self._window):
+                self._write_entry(self._pending.popleft().result())
+
+    def close(self) -> None:
+        """Дописывает записи и центральный каталог."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            entries = [future.result() for future in self._pending]
+            self._pending.clear()
+            if self.settings.sort:
+                entries.sort(key=lambda entry: entry.arcname)
+            for entry in entries:
+                self._write_entry(entry)
+            self._write_central_directory()
+            self._stream.flush()
+        finally:
+            self._shutdown()
+
+    def abort(self) -> None:
+        """Закрывает архив без центрального каталога (после ошибки)."""
+        if not self._closed:
+            self._closed = True
+            for future in self._pending:
+                future.cancel()
+            self._pending.clear()
+            self._shutdown()
+
+    def _shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+        if self._owns_stream:
+            self._stream.close()
+
+    @staticmethod
+    def _flags(entry: CompressedEntry) -> int:
+        flags = _FLAG_LZMA_EOS if entry.method == 'lzma' else 0
+        if not entry.arcname.isascii():
+            flags |= _FLAG_UTF8
+        return flags
+
+    def _write_entry(self, entry: CompressedEntry) -> None:
+        name = entry.arcname.encode('utf-8')
+        header = _LOCAL_HEADER.pack(
+            0x04034B50, _VERSIONS[entry.method], self._flags(entry), _METHOD_IDS[entry.method],
+            self._time, self._date, entry.crc, entry.compressed_size, entry.size, len(name), 0,
+        )
+        self._central.append((entry, self._offset))
+        self._stream.write(header)
+        self._stream.write(name)
+        self._stream.write(entry.data)
+        self._offset += len(header) + len(name) + entry.compressed_size
+        # Для центрального каталога сжатые данные больше не нужны
+        entry.data = b''
+
+    def _write_central_directory(self) -> None:
+        start = self._offset
+        for entry, offset in self._central:
+            name = entry.arcname.encode('utf-8')
+            version = _VERSIONS[entry.method]
+            extra = b''
+            if offset >= _ZIP64_LIMIT:
+                extra = struct.pack('<HHQ', 0x0001, 8, offset)
+                offset = _ZIP64_LIMIT
+                version = max(version, _ZIP64_VERSION)
+            header = _CENTRAL_HEADER.pack(
+                0x02014B50, (_CREATE_SYSTEM << 8) | version, version, self._flags(entry),
+                _METHOD_IDS[entry.method], self._time, self._date, entry.crc, entry.compressed_size,
+                entry.size, len(name), len(extra), 0, 0, 0, _EXTERNAL_ATTR, offset,
+            )
+            self._stream.write(header)
+            self._stream.write(name)
+            self._stream.write(extra)
+            self._offset += len(header) + len(name) + len(extra)
+
+        count, size = len(self._central), self._offset - start
+        if count >= _ZIP64_COUNT_LIMIT or start >= _ZIP64_LIMIT or size >= _ZIP64_LIMIT:
+            zip64_offset = self._offset
+            self._stream.write(_ZIP64_END_RECORD.pack(
+                0x06064B50, _ZIP64_END_RECORD.size - 12, (_CREATE_SYSTEM << 8) | _ZIP64_VERSION,
+                _ZIP64_VERSION, 0, 0, count, count, size, start,
+            ))
+            self._stream.write(_ZIP64_LOCATOR.pack(0x07064B50, 0, zip64_offset, 1))
+            count = min(count, _ZIP64_COUNT_LIMIT)
+            size, start = min(size, _ZIP64_LIMIT), min(start, _ZIP64_LIMIT)
+        self._stream.write(_END_RECORD.pack(0x06054B50, 0, 0, count, count, size, start, 0))
+
+
+def _completed(entry: CompressedEntry) -> Future:
+    future: Future = Future()
+    future.set_result(entry)
+    return future
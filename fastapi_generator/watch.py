@@ -0,0 +1,149 @@
+"""
+Режим наблюдения (--watch): перегенерация проекта при изменении схемы или шаблонов.
+
+Файлы опрашиваются по (mtime, размер) без сторонних зависимостей. Серия
+изменений (редактор сохраняет файл в несколько приемов) дает одну
+перегенерацию: она начинается, когда файлы не меняются DEBOUNCE секунд.
+
+Изменение схемы обрабатывается в том же процессе: шаблоны уже
+скомпилированы, а проект обновляется инкрементально (по манифесту),
+поэтому рендерятся и пишутся только файлы, чьи входные данные изменились.
+Шаблоны - модули Python, поэтому при их изменении процесс перезапускается
+с теми же аргументами; первый запуск после перезапуска тоже инкрементальный.
+"""
+
+import hashlib
+import os
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Set, Tuple
+
+from .core.hooks import GenerationHooks
+from .pipeline import GenerationOptions, GenerationResult, generate_project
+from .utils import console
+
+# Период опроса и время тишины перед перегенерацией, секунды
+POLL_INTERVAL = 0.1
+DEBOUNCE = 0.2
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+# Где лежат шаблоны: наборы архитектур, шаблоны конфигов и тестов, контракт app_templates
+TEMPLATE_PATHS = (
+    PACKAGE_DIR / 'core' / 'config.py',
+    PACKAGE_DIR / 'generators',
+    PACKAGE_DIR.parent / 'app_templates',
+)
+
+Snapshot = Dict[Path, Tuple[int, int] | None]
+
+
+class PollingWatcher:
+    """Опрашивает файлы и директории (рекурсивно, только *.py) и сообщает об изменениях."""
+
+    def __init__(self, paths: Iterable[Path], interval: float = POLL_INTERVAL, debounce: float = DEBOUNCE):
+        self.paths = [Path(path) for path in paths]
+        self.interval = interval
+        self.debounce = debounce
+        self._snapshot = self.scan()
+
+    def _files(self) -> Iterator[Path]:
+        for path in self.paths:
+            if path.is_dir():
+                yield from path.rglob('*.py')
+            else:
+                yield path
+
+    def scan(self) -> Snapshot:
+        """(mtime, размер) каждого файла; None - файла нет (например, редактор его заменяет)."""
+        snapshot: Snapshot = {}
+        for path in self._files():
+            try:
+                stat = path.stat()
+            except OSError:
+                snapshot[path] = None
+            else:
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self) -> Set[Path]:
+        """Ждет изменений и тишины после них; возвращает изменившиеся файлы."""
+        current = self._snapshot
+        while current == self._snapshot:
+            time.sleep(self.interval)
+            current = self.scan()
+        quiet_since = time.monotonic()
+        while time.monotonic() - quiet_since < self.debounce:
+            time.sleep(self.interval)
+            latest = self.scan()
+            if latest != current:
+                current, quiet_since = latest, time.monotonic()
+        changed = {path for path in current.keys() | self._snapshot.keys()
+                   if current.get(path) != self._snapshot.get(path)}
+        self._snapshot = current
+        return changed
+
+
+def _digest(path: Path) -> str | None:
+    try:
+        return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+    except OSError:
+        return None
+
+
+def _restart() -> None:
+    """Перезапускает процесс с теми же аргументами, но без --full: проект не удаляется."""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    argv = [arg for arg in sys.argv if arg != '--full']
+    os.execv(sys.executable, [sys.executable, *argv])
+
+
+def _generate(options: GenerationOptions, hooks: GenerationHooks | None,
+              on_result: Callable[[GenerationResult], None] | None,
+              on_error: Callable[[str], None] | None) -> None:
+    """Одна генерация; ошибка схемы не прерывает наблюдение."""
+    started = time.perf_counter()
+    try:
+        result = generate_project(options, hooks=hooks)
+    except SystemExit as e:
+        message = str(e.code)
+        console.warn(message)
+        if on_error is not None:
+            on_error(message.removeprefix('❌ '))
+        return
+    console.info(f"🔄 Проект обновлен за {time.perf_counter() - started:.2f} с, "
+                 f"записано файлов: {result.files_written}")
+    if on_result is not None:
+        on_result(result)
+
+
+def watch_project(options: GenerationOptions, hooks: GenerationHooks | None = None,
+                  on_result: Callable[[GenerationResult], None] | None = None,
+                  on_error: Callable[[str], None] | None = None) -> None:
+    """Генерирует проект и перегенерирует его при изменениях до прерывания (Ctrl+C)."""
+    schema_path = Path(options.input).resolve()
+    watcher = PollingWatcher([schema_path, *(path for path in TEMPLATE_PATHS if path.exists())])
+    _generate(options, hooks, on_result, on_error)
+    # Дальше только инкрементальные обновления: --full относится к первому запуску
+    options = replace(options, full=False)
+    schema_digest = _digest(schema_path)
+
+    console.info(f"👀 Наблюдение за {schema_path} и шаблонами (Ctrl+C - выход)")
+    try:
+        while True:
+            changed = watcher.wait()
+            if changed - {schema_path}:
+                names = ', '.join(sorted(path.name for path in changed - {schema_path}))
+                console.info(f"🔁 Изменились шаблоны ({names}): перезапуск генератора")
+                _restart()
+            digest = _digest(schema_path)
+            # Сохранение без изменений (touch, повторное сохранение в редакторе) не перегенерирует проект
+            if digest is None or digest == schema_digest:
+                continue
+            schema_digest = digest
+            console.info(f"✏️  Схема изменилась: {schema_path.name}")
+            _generate(options, hooks, on_result, on_error)
+    except KeyboardInterrupt:
+        console.info("\n👋 Наблюдение остановлено")
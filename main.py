@@ -4,14 +4,11 @@
 """
 
 import argparse
-import shutil
+import os
+import sys
+from contextlib import nullcontext, redirect_stdout
 from pathlib import Path
 
-from fastapi_generator.core.config import TEMPLATES
-from fastapi_generator.parsers import SchemaParser
-from fastapi_generator.generators import ProjectGenerator, ConfigGenerator, TestGenerator
-from fastapi_generator.utils.file_utils import zip_directory, ensure_output_dir, get_output_path
-
 
 def main():
     parser = argparse.ArgumentParser(
@@ -19,136 +16,146 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
     
-    parser.add_argument('-i', '--input', type=str, required=True,
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('-i', '--input', type=str,
                         help='Файл со схемой: .txt, .json, .yaml, .yml')
+    source.add_argument('--batch', type=str, metavar='MANIFEST',
+                        help='YAML-манифест с заданиями для пакетной генерации')
+    source.add_argument('--serve', action='store_true',
+                        help='Запустить HTTP-сервер генерации (POST /generate отдает ZIP)')
     parser.add_argument('-o', '--output', type=str, default='fastapi_project',
                         help='Имя выходного проекта')
     parser.add_argument('--no-init', action='store_true', help='Не создавать __init__.py')
     parser.add_argument('--zip', action='store_true', help='Создать ZIP-архив проекта в output/')
     parser.add_argument('--zip-only', action='store_true',
-                        help='Создать только ZIP-архив в output/ (удалить временную папку)')
+                        help='Создать только ZIP-архив в output/ (файлы пишутся сразу в архив)')
+    parser.add_argument('--zip-compression', choices=['stored', 'deflate', 'bzip2', 'lzma'], default='deflate',
+                        help='Метод сжатия ZIP-архива (по умолчанию deflate)')
+    parser.add_argument('--zip-level', type=int, metavar='N',
+                        help='Уровень сжатия: deflate и lzma 0-9, bzip2 1-9 (по умолчанию - уровень метода)')
+    parser.add_argument('--zip-jobs', type=int, metavar='N',
+                        help='Количество потоков сжатия ZIP (по умолчанию - число CPU)')
+    parser.add_argument('--tar-stdout', action='store_true',
+                        help='Вывести проект tar-потоком в stdout, не создавая файлов')
     parser.add_argument('--with-tests', action='store_true',
                         help='Генерировать тесты для файлов проекта')
+    parser.add_argument('--async-db', action='store_true',
+                        help='Асинхронный режим БД: AsyncSession и aiosqlite (как metadata.async: true)')
+    parser.add_argument('-j', '--jobs', type=int, default=1, metavar='N',
+                        help='Количество потоков записи файлов (по умолчанию 1 - последовательно)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Потоковый разбор YAML/JSON-схемы без загрузки документа целиком')
+    parser.add_argument('--full', action='store_true',
+                        help='Полная перегенерация: удалить папку проекта вместо инкрементального обновления')
+    parser.add_argument('--prune', action='store_true',
+                        help='При инкрементальном обновлении удалять файлы, исчезнувшие из схемы')
+    parser.add_argument('--cache-dir', default=os.environ.get('FASTAPI_GENERATOR_CACHE_DIR'), metavar='DIR',
+                        help='Постоянный кэш отрендеренных файлов, общий для запусков и проектов '
+                             '(по умолчанию $FASTAPI_GENERATOR_CACHE_DIR; без него кэш отключен)')
+    parser.add_argument('--cache-max-size', default='256M', metavar='SIZE',
+                        help='Лимит размера кэша рендеринга, например 512M или 2G (по умолчанию 256M)')
+    parser.add_argument('--plan', '--dry-run', dest='plan', action='store_true',
+                        help='Показать план проекта (директории, файлы, конфликты) без создания файлов')
+    parser.add_argument('--profile', nargs='?', const='json', choices=['json', 'cprofile'],
+                        help='Отчет по фазам в output/<имя>.profile.json; '
+                             '--profile=cprofile дополнительно сохраняет output/<имя>.pstats')
+    parser.add_argument('--workers', type=int, metavar='N',
+                        help='Количество процессов для --batch (по умолчанию - число CPU)')
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument('-q', '--quiet', action='store_true',
+                           help='Печатать только предупреждения и ошибки')
+    verbosity.add_argument('-v', '--verbose', action='store_true',
+                           help='Подробный вывод (в том числе распознанные файлы схемы)')
+    parser.add_argument('--events', choices=['json'],
+                        help='Поток событий фаз и файлов в stdout (JSON Lines); сообщения уходят в stderr')
+    parser.add_argument('--watch', action='store_true',
+                        help='Следить за схемой и шаблонами и обновлять проект при изменениях (Ctrl+C - выход)')
+    parser.add_argument('--host', default='127.0.0.1', help='Адрес сервера для --serve')
+    parser.add_argument('--port', type=int, default=8000, help='Порт сервера для --serve')
     
     args = parser.parse_args()
-    
-    input_path = Path(args.input)
-    output_name = args.output
-    
-    # Создаем output директорию
-    output_dir = ensure_output_dir()
-    print(f"📁 Выходная директория: {output_dir.resolve()}")
-    
-    # Парсим схему
-    parser = SchemaParser()
-    project_schema = parser.parse_file(input_path)
-    
-    architecture = project_schema.architecture
-    file_data = project_schema.files
-    
-    print(f"🔍 Результат парсинга:")
-    print(f"   Архитектура: {architecture}")
-    print(f"   Файлов: {len(file_data)}")
-    print(f"   Проект: {project_schema.project_name}")
-    if project_schema.description:
-        print(f"   Описание: {project_schema.description}")
-    
-    for i, project_file in enumerate(file_data[:10]):
-        print(f"   {i}: {project_file.normalized_path} -> {project_file.class_name}")
-    if len(file_data) > 10:
-        print(f"   ... и еще {len(file_data) - 10} файлов")
-    
-    if not file_data:
-        raise SystemExit("❌ Не распознано ни одного .py-файла.")
-    
-    print(f"🏗️  Создание FastAPI проекта: {project_schema.project_name}")
-    print(f"📋 Архитектура: {architecture}")
-    
-    # Создаем временную папку проекта в текущей директории
-    temp_project_root = Path(output_name).resolve()
-    
-    # Удаляем существующую временную папку
-    if temp_project_root.exists():
-        shutil.rmtree(temp_project_root)
-    
-    # Генерируем проект во временной папке
-    project_gen = ProjectGenerator(architecture, TEMPLATES)
-    project_gen.create_structure(file_data, temp_project_root, with_init=not args.no_init)
-    
-    config_gen = ConfigGenerator(architecture)
-    config_gen.generate(temp_project_root, file_data)
-    
-    # Генерируем тесты только если указан флаг 
-    if args.with_tests:
-        test_gen = TestGenerator(architecture)
-        test_gen.generate(temp_project_root, file_data)
-    
-    # Обработка выходных результатов
-    final_project_path = None
-    zip_file_path = None
-    
-    if args.zip or args.zip_only:
-        # Создаем ZIP в output директории
-        zip_filename = f"{output_name}.zip"
-        zip_file_path = get_output_path(zip_filename)
-        print(f"📦 Упаковка в архив: {zip_file_path}")
-        zip_directory(temp_project_root, zip_file_path)
-    
-    if args.zip_only:
-        # Удаляем временную папку, оставляем только ZIP
-        print(f"🗑️  Удаление временной папки: {temp_project_root}")
-        shutil.rmtree(temp_project_root)
-        final_project_path = zip_file_path
-    else:
-        if args.zip:
-            # Переносим папку проекта в output
-            final_project_dir = get_output_path(output_name)
-            if final_project_dir.exists():
-                shutil.rmtree(final_project_dir)
-            shutil.move(str(temp_project_root), str(final_project_dir))
-            final_project_path = final_project_dir
-            print(f"📁 Проект перемещен в: {final_project_path}")
-        else:
-            # Без ZIP - оставляем папку в текущей директории
-            final_project_path = temp_project_root
-    
-    # Статистика - ТОЛЬКО ОДИН РАЗ
-    _print_statistics(file_data, architecture, final_project_path, args, zip_file_path)
-    
-    print(f"\n🚀 Для начала работы:")
-    if not args.zip_only:
-        print(f"   cd {final_project_path}")
-        print(f"   uv sync")
-        print(f"   uv run dev")
-    else:
-        print(f"   📦 Архив готов: {final_project_path}")
-
-
-def _print_statistics(file_data, architecture, project_path, args, zip_path=None):
-    """Выводит статистику проекта."""
-    entities = sum(1 for project_file in file_data 
-                  if 'entities' in project_file.normalized_path or 'models' in project_file.normalized_path)
-    services = sum(1 for project_file in file_data 
-                  if 'services' in project_file.normalized_path or 'use_cases' in project_file.normalized_path)
-    routers = sum(1 for project_file in file_data 
-                 if 'routers' in project_file.normalized_path or 'endpoints' in project_file.normalized_path)
-    total_files = len(file_data)
-    
-    print(f"📊 Статистика:")
-    print(f"   🏗️  Архитектура: {architecture}")
-    print(f"   📦 Модели/Сущности: {entities}")
-    print(f"   ⚙️  Сервисы/Use Cases: {services}")
-    print(f"   🌐 Роутеры: {routers}")
-    print(f"   📁 Всего файлов: {total_files}")
-    
-    if project_path:
-        if args.zip_only:
-            print(f"✅ Создан архив: {project_path}")
-        else:
-            print(f"✅ Создан проект: {project_path}")
-    
-    if zip_path and not args.zip_only:
-        print(f"📦 Дополнительный архив: {zip_path}")
+    if args.jobs < 1:
+        parser.error("--jobs должен быть положительным числом")
+    if args.tar_stdout and (args.zip or args.zip_only):
+        parser.error("--tar-stdout нельзя совмещать с --zip и --zip-only")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers должен быть положительным числом")
+    if args.events and args.tar_stdout:
+        parser.error("--events нельзя совмещать с --tar-stdout: оба пишут в stdout")
+    if args.watch and not args.input:
+        parser.error("--watch работает только с -i")
+    if args.watch and (args.zip or args.zip_only or args.tar_stdout or args.plan):
+        parser.error("--watch обновляет папку проекта: нельзя совмещать с --zip, --zip-only, --tar-stdout и --plan")
+    
+    if args.serve:
+        from fastapi_generator.server import serve
+        from fastapi_generator.utils.render_cache import RenderCache, parse_size
+        try:
+            cache = RenderCache(Path(args.cache_dir), parse_size(args.cache_max_size)) if args.cache_dir else None
+        except ValueError as e:
+            parser.error(str(e))
+        serve(args.host, args.port, cache)
+        return
+    
+    if args.batch:
+        # Параметры заданий берутся только из манифеста
+        from fastapi_generator.batch import run_batch
+        results = run_batch(Path(args.batch), args.workers)
+        if not all(result.ok for result in results):
+            sys.exit(1)
+        return
+    
+    # Генератор импортируется после разбора аргументов: --help и ошибки CLI не платят за него
+    from fastapi_generator.pipeline import GenerationOptions, generate_project
+    from fastapi_generator.utils import console
+    
+    cli_only = {'batch', 'workers', 'serve', 'host', 'port', 'quiet', 'verbose', 'events', 'watch'}
+    options = GenerationOptions.from_mapping(
+        {key: value for key, value in vars(args).items() if key not in cli_only}
+    )
+    try:
+        options.validate()
+    except ValueError as e:
+        parser.error(str(e))
+    console.set_level(console.QUIET if args.quiet else console.VERBOSE if args.verbose else console.NORMAL)
+    
+    events = progress = None
+    if args.events == 'json':
+        from fastapi_generator.utils.events import JsonEventWriter
+        events = JsonEventWriter(sys.stdout)
+    elif console.get_level() >= console.NORMAL and sys.stderr.isatty():
+        from fastapi_generator.utils.progress import ProgressDisplay
+        progress = ProgressDisplay(sys.stderr)
+    
+    def emit_result(result) -> None:
+        from dataclasses import asdict
+        events.emit('result', **{key: str(value) if isinstance(value, Path) else value
+                                 for key, value in asdict(result).items()})
+        events.flush()
+    
+    def emit_error(message: str) -> None:
+        events.emit('error', message=message)
+        events.flush()
+    
+    # stdout занят архивом или потоком событий - весь служебный вывод уходит в stderr
+    archive_stream = sys.stdout.buffer if args.tar_stdout else None
+    try:
+        with redirect_stdout(sys.stderr) if archive_stream or events else nullcontext():
+            if args.watch:
+                from fastapi_generator.watch import watch_project
+                watch_project(options, events or progress,
+                              on_result=emit_result if events else None, on_error=emit_error if events else None)
+                return
+            result = generate_project(options, archive_stream, events or progress)
+    except SystemExit as e:
+        if events is not None:
+            emit_error(str(e.code).removeprefix('❌ '))
+        raise
+    finally:
+        if progress is not None:
+            progress.close()
+    if events is not None:
+        emit_result(result)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,18 @@
+"""Плейсхолдеры шаблонов app_templates: каждый заполняется генераторами."""
+
+from app_templates import ASYNC_ENTITY_BLOCKS, ASYNC_TEMPLATES, TEMPLATES
+from fastapi_generator.core.template_engine import find_unknown_placeholders
+
+
+def test_templates_have_no_unknown_placeholders():
+    assert find_unknown_placeholders(TEMPLATES) == {}
+
+
+def test_async_templates_have_no_unknown_placeholders():
+    assert find_unknown_placeholders(ASYNC_TEMPLATES, ASYNC_ENTITY_BLOCKS) == {}
+
+
+def test_module_of_other_architecture_is_unknown():
+    # use_case - шаблон clean, в layered путь его модуля не заполняется
+    registry = {'layered': {'model': 'from {{ use_case_module }} import {{ class_name }}'}}
+    assert find_unknown_placeholders(registry) == {'layered.model': frozenset({'use_case_module'})}